@@ -8,6 +8,9 @@ import {Application, Request, Response} from 'express';
 import getSteam64 from '../utils/steam.util';
 import logger from '../utils/logger.util';
 
+// Most steamid64s accepted by a single /steam/get/levels/batch request
+const LEVELS_BATCH_MAX = 100;
+
 export default function (serverInstance: Application) {
   serverInstance.get(
     '/steam/get/steamid',
@@ -84,4 +87,49 @@ export default function (serverInstance: Application) {
         .json({success: true, steam64Id: idToResolve, data: levelData});
     }
   );
+
+  serverInstance.get(
+    '/steam/get/levels/batch',
+    authUA,
+    async (req: Request, res: Response) => {
+      const idsToResolve = (req.query.ids?.toString() ?? '')
+        .split(',')
+        .map(id => id.trim())
+        .filter(id => id.length > 0);
+
+      if (idsToResolve.length === 0) {
+        return res.status(400).json({
+          success: false,
+          message: 'Missing parameters (ids)',
+        });
+      }
+
+      if (idsToResolve.length > LEVELS_BATCH_MAX) {
+        return res.status(400).json({
+          success: false,
+          message: `Too many ids (max ${LEVELS_BATCH_MAX})`,
+        });
+      }
+
+      logger.info(`LEVEL BATCH REQUEST: Requested ${idsToResolve.length} ids`);
+
+      // One GC request at a time, the batch only saves the HTTP round trips
+      const data: {[steam64Id: string]: any} = {};
+      for (const id of idsToResolve) {
+        data[id] = await requestPlayerLevel(id);
+      }
+
+      return res.status(200).json({success: true, data});
+    }
+  );
+
+  serverInstance.get(
+    '/steam/capabilities',
+    async (_: Request, res: Response) => {
+      return res.status(200).json({
+        success: true,
+        data: {levels_batch: true, levels_batch_max: LEVELS_BATCH_MAX},
+      });
+    }
+  );
 }
@@ -0,0 +1,44 @@
+# Command line entry point to back up, export and import the tracker database
+# Usage (from the bot folder):
+#   python backup.py backup [destination]
+#   python backup.py export <directory> [--format jsonl|csv]
+#   python backup.py import <directory> [--format jsonl|csv] [--replace]
+import asyncio, argparse
+from src.manager.xp_manager import XpManager
+from src.manager.guild_manager import GuildManager
+from src.manager.database_manager import DatabaseManager
+from src.manager.admin_mode_manager import AdminModeManager
+from src.manager.backup_manager import BackupManager, export_formats
+
+async def main(args) -> None:
+    backup_manager = BackupManager()
+    try:
+        if args.action == "backup":
+            print(f"Database backed up to {await backup_manager.backup(args.path)}.")
+            return
+
+        if args.action == "export":
+            written = await backup_manager.export_files(args.path, args.format)
+            print(f"Database exported to {args.path}: {written}.")
+            return
+
+        # Make sure the tables exist on a fresh host before loading into them
+        await XpManager().create_table()
+        await GuildManager().create_table()
+        await AdminModeManager().create_table()
+        imported = await backup_manager.import_files(args.path, args.format, args.replace)
+        print(f"Database imported from {args.path}: {imported}.")
+    finally:
+        await DatabaseManager.close_all()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Back up, export or import the tracker database.")
+    parser.add_argument("action", choices=("backup", "export", "import"))
+    parser.add_argument("path", nargs="?", help="Backup file for backup, directory for export and import.")
+    parser.add_argument("--format", choices=export_formats, default="jsonl")
+    parser.add_argument("--replace", action="store_true", help="Empty each table before importing it.")
+    args = parser.parse_args()
+
+    if args.action != "backup" and args.path is None:
+        parser.error(f"{args.action} needs a directory")
+    asyncio.run(main(args))
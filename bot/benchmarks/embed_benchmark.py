@@ -0,0 +1,78 @@
+# Micro-benchmark of the tracker card, building it field by field (XpHandler.create_update_card) against rendering it from a
+# template whose static parts are built once and filled with Embed.from_dict (the approach that was tried and dropped).
+# Needs the config.yaml of the bot (the card takes its emojis from it), nothing is sent.
+# Usage (from the bot folder):
+#   python -m benchmarks.embed_benchmark [--renders 10000]
+import time, argparse, discord
+from datetime import datetime, timezone
+from src.helper.config import Config
+from src.helper.datetime import DateTime
+from src.handler.xp_handler import XpHandler
+
+values = {
+    "name": "kWS", "steam_id": 76561198000000000, "avatar": "https://avatars.steamstatic.com/avatar_full.jpg",
+    "new_level": 27, "percentage": "43%", "earned_xp": 2150, "remaining_xp": 2850, "total_monthly": 31240,
+    "games_needed": 24, "expected_time": "7 Day(s), 0 Hour(s)", "xp_bar": "█████░░░░░░░",
+    "max_level_xp_bar": "████████░░░░", "max_percentage": "66%",
+}
+
+def build_inline(config, v):
+    return XpHandler.create_update_card(
+        config, v["name"], v["steam_id"], v["avatar"], v["new_level"], v["percentage"], v["earned_xp"], v["remaining_xp"],
+        v["total_monthly"], v["games_needed"], v["expected_time"], v["xp_bar"], v["max_level_xp_bar"], v["max_percentage"]
+    )
+
+# The template candidate: the card as a dict built once, each render only formats the fields with placeholders
+def create_template(config):
+    data = build_inline(config, {key: f"{{{key}}}" for key in values}).to_dict()
+    data.pop("timestamp")
+    return data
+
+def render_template(template, v):
+    data = template.copy()
+    data["title"] = template["title"].format_map(v)
+    data["url"] = template["url"].format_map(v)
+    data["thumbnail"] = {"url": template["thumbnail"]["url"].format_map(v)}
+    data["fields"] = [{**field, "value": field["value"].format_map(v)} for field in template["fields"]]
+    embed = discord.Embed.from_dict(data)
+    embed.timestamp = datetime.now(timezone.utc)
+    return embed
+
+# Function to time a build, returns the microseconds per embed (the best of 5 runs)
+def measure(build, renders):
+    best = float("inf")
+    for _ in range(5):
+        started = time.perf_counter()
+        for _ in range(renders):
+            build()
+        best = min(best, time.perf_counter() - started)
+    return best / renders * 1e6
+
+def main(args) -> None:
+    config = Config()
+    datetime_helper = DateTime()
+    template = create_template(config)
+
+    # Both ways have to build the same card, the timestamps aside
+    inline, rendered = build_inline(config, values).to_dict(), render_template(template, values).to_dict()
+    inline.pop("timestamp"), rendered.pop("timestamp")
+    assert inline == rendered, "The template doesn't build the same card"
+
+    results = {
+        "inline": measure(lambda: build_inline(config, values), args.renders),
+        "template": measure(lambda: render_template(template, values), args.renders),
+        "inline + to_dict": measure(lambda: build_inline(config, values).to_dict(), args.renders),
+        "template + to_dict": measure(lambda: render_template(template, values).to_dict(), args.renders),
+        "timestamp (madrid)": measure(datetime_helper.get_current_timestamp, args.renders),
+        "timestamp (utc)": measure(lambda: datetime.now(timezone.utc), args.renders),
+    }
+
+    print(f"Tracker card, {args.renders} renders (best of 5):")
+    for name, per_embed in results.items():
+        print(f"  {name:<20} {per_embed:8.2f} µs")
+    print(f"  template speedup     {results['inline'] / results['template']:8.2f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the tracker card rendering.")
+    parser.add_argument("--renders", type=int, default=10000, help="Cards built on each run.")
+    main(parser.parse_args())
@@ -4,9 +4,19 @@ from colorama import Fore
 from discord.ext import commands
 from src.util.logger import Logger
 from src.helper.config import Config
+from src.steam.http_client import HttpClient
+from src.handler.shard_handler import ShardHandler
+from src.handler.delivery_handler import DeliveryHandler
 from src.manager.xp_manager import XpManager
 from src.manager.file_manager import FileManager
-from src.manager.timeout_manager import TimeoutManager
+from src.manager.guild_manager import GuildManager
+from src.manager.database_manager import DatabaseManager
+from src.manager.xp_buffer_manager import XpBufferManager
+from src.manager.rate_limit_manager import RateLimitManager
+from src.manager.admin_mode_manager import AdminModeManager
+from src.manager.legacy_import_manager import LegacyImportManager
+from src.manager.user_registry_manager import UserRegistryManager
+from src.manager.guild_settings_manager import GuildSettingsManager
 
 # Define the bot & load the commands, events and loops
 class Bot(commands.Bot):
@@ -14,7 +24,8 @@ class Bot(commands.Bot):
         self.logger = Logger()
         self.file_manager = FileManager()
         self.xp_manager = XpManager()
-        self.timeout_manager = TimeoutManager()
+        self.guild_manager = GuildManager()
+        self.admin_mode_manager = AdminModeManager()
         super().__init__(command_prefix=Config().bot_prefix, help_command=None, intents=discord.Intents.all())
 
     # Function to load the extensions
@@ -26,6 +37,30 @@ class Bot(commands.Bot):
         self.file_manager.check_input()
         self.logger.clear()
 
+        # Create the database tables
+        self.logger.log("INFO", "Preparing database...")
+        await self.xp_manager.create_table()
+        await self.guild_manager.create_table()
+        await self.admin_mode_manager.create_table()
+
+        # Move the data of the old per-manager database files into the shared one
+        await LegacyImportManager().import_legacy_databases()
+
+        # Load the tracked users and the guild settings into memory
+        await UserRegistryManager().load()
+        await GuildSettingsManager().load()
+
+        # Every message the bot sends on its own goes through the delivery queues
+        DeliveryHandler(self)
+
+        # The bot is the tracker process "bot" when the tracked users are split with workers
+        ShardHandler("bot")
+
+        # Restore the command cooldowns of the last run
+        if Config().rate_limit_snapshot:
+            RateLimitManager().load()
+        self.logger.clear()
+
         # Load the cogs
         self.logger.log("INFO", "Loading cogs...")
         for filename in os.listdir("./src/cogs/commands"):
@@ -50,6 +85,17 @@ class Bot(commands.Bot):
         # Done!
         self.logger.log("INFO", f"Setup completed!")
 
+    # Function to send the queued messages, write the pending xp updates, the cooldowns snapshot, leave the tracker processes and close the shared database and http connections on shutdown
+    async def close(self) -> None:
+        await DeliveryHandler().drain()
+        await super().close()
+        await XpBufferManager().flush()
+        await ShardHandler().leave()
+        if Config().rate_limit_snapshot:
+            RateLimitManager().save()
+        await DatabaseManager.close_all()
+        await HttpClient().close()
+
 # Define the client
 bot = Bot()
 
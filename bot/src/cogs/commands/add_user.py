@@ -7,6 +7,7 @@ from src.helper.config import Config
 from src.steam.checker import Checker
 from src.helper.datetime import DateTime
 from src.handler.xp_handler import XpHandler
+from src.handler.schedule_handler import ScheduleHandler
 from src.manager.xp_manager import XpManager
 from src.manager.guild_manager import GuildManager
 from src.helper.trackeduser_class import TrackedUser
@@ -23,6 +24,7 @@ class AddUser(commands.Cog):
         self.datetime_helper = DateTime()
         self.guild_manager = GuildManager()
         self.admin_mode_manager = AdminModeManager()
+        self.schedule_handler = ScheduleHandler()
 
     # Add user command  
     @app_commands.command(name="add_user", description="Add a user to the xp tracker database.")
@@ -39,7 +41,7 @@ class AddUser(commands.Cog):
         # Send the loading message
         added_message = await interaction.followup.send(f"{self.config.loading_green_emoji_id} Trying to add id `{id}` to the tracker database.", ephemeral=hidden)
 
-        admin_mode = self.admin_mode_manager.get_admin_mode(interaction.guild_id)
+        admin_mode = await self.admin_mode_manager.get_admin_mode(interaction.guild_id)
 
         # Check if the admin mode is set
         if admin_mode is None:
@@ -54,7 +56,7 @@ class AddUser(commands.Cog):
             return
 
         # Check if the id is valid and get the data
-        success, steamid64, nickname, avatar = self.checker.get_persona(id)
+        success, steamid64, nickname, avatar = await self.checker.get_persona(id)
 
         # If the id is not valid
         if not success:
@@ -63,13 +65,13 @@ class AddUser(commands.Cog):
             return
 
         # Check if the user is already being tracked
-        if self.database.get_user_by_steam_id(steamid64) is not None:
+        if await self.database.get_user_by_steam_id(steamid64) is not None:
             await added_message.edit(content=f"The id `{id}` is already being tracked. If you want to update the user's guild, whoever added it needs to use the `/change_user_guild` command.")
             await self.logger.discord_log(f"✅ {username} tried to add an already tracked id to the tracker database.")
             return
         
         # Check if the guild has a tracker channel set
-        if not self.guild_manager.guild_exists(interaction.guild_id):
+        if not await self.guild_manager.guild_exists(interaction.guild_id):
             await added_message.edit(content=f"{self.config.red_cross_emoji_id} This server doesn't have a tracker channel set. Tell an admin to set it.")
             await self.logger.discord_log(f"✅ {username} tried to add an id to the tracker database, but the guild doesn't have a tracker channel set.")
             return
@@ -82,10 +84,16 @@ class AddUser(commands.Cog):
             await self.logger.discord_log(f"✅ {username} tried to add an id to the tracker database, but couldn't get the level and XP.")
             return
 
+        if level is False:
+            await added_message.edit(content=f"{self.config.red_cross_emoji_id} Couldn't get level and XP for `{id}`, couldn't add him to the tracker database. Error: {xp}")
+            await self.logger.discord_log(f"✅ {username} tried to add an id to the tracker database, but couldn't get the level and XP.")
+            return
+
         # Add the user to the database
-        added_user = TrackedUser(steamid64, interaction.user.id, interaction.guild.id, level, xp, 0, 0)
+        added_user = TrackedUser(steamid64, interaction.user.id, interaction.guild.id, level, xp, 0, 0, self.database.get_current_epoch())
         try:
-            self.database.add_user(added_user)
+            await self.database.add_user(added_user)
+            self.schedule_handler.promote(int(steamid64))
         except Exception as e:
             await added_message.edit(content=f"Couldn't add id {id} to the tracker database. Error: {e}")
             await self.logger.discord_log(f"✅ {username} tried to add an id to the tracker database, but couldn't add him to the database.")
@@ -35,13 +35,13 @@ class AdminModeCommand(commands.Cog):
         await self.logger.discord_log(f"✅ {username} requested to set the admin mode to `{switch}` on the guild {interaction.guild_id} ({interaction.guild.name}).")
         
         # Check if the admin mode is already added, if not, add it.
-        if self.admin_mode_manager.get_admin_mode(interaction.guild_id) is None:
-            self.admin_mode_manager.add_admin_mode(interaction.guild_id, switch)
+        if await self.admin_mode_manager.get_admin_mode(interaction.guild_id) is None:
+            await self.admin_mode_manager.add_admin_mode(interaction.guild_id, switch)
             return await request_message.edit(content=f"{self.config.green_tick_emoji_id} Admin mode has been set to `{switch}`.")
 
         # Change the admin mode in case it's already added
         try:
-            self.admin_mode_manager.set_admin_mode(interaction.guild_id, switch)
+            await self.admin_mode_manager.set_admin_mode(interaction.guild_id, switch)
         except Exception as e:
             return await request_message.edit(content=f"{self.config.red_cross_emoji_id} Failed to set admin mode. Error: {e}")
         
@@ -0,0 +1,53 @@
+import time
+from discord.ext import commands
+from src.util.logger import Logger
+from src.helper.config import Config
+from src.manager.backup_manager import BackupManager, export_formats
+
+class BackupCommand(commands.Cog):
+    def __init__(self, bot: commands.Bot) -> None:
+        self.bot = bot
+        self.config = Config()
+        self.logger = Logger(self.bot)
+        self.backup_manager = BackupManager()
+        return
+
+    # Copy the live database to src/database/backups without stopping the bot
+    @commands.command()
+    @commands.is_owner()
+    async def backup(self, ctx: commands.Context) -> None:
+        msg = await ctx.send(f"{self.config.loading_green_emoji_id} Backing up the database...")
+        try:
+            destination = await self.backup_manager.backup()
+        except Exception as e:
+            await msg.edit(content=f"{self.config.red_cross_emoji_id} Couldn't back up the database. Error: {e}")
+            return self.logger.log("ERROR", f"Couldn't back up the database: {e}")
+
+        await msg.edit(content=f"{self.config.green_tick_emoji_id} Database backed up to `{destination}`.")
+        await self.logger.discord_log(f"✅ Database backed up to `{destination}`.")
+        self.logger.log("INFO", f"✅ Database backed up to {destination}.")
+
+    # Export the tracking, guilds and admin mode tables to src/database/exports as jsonl or csv
+    @commands.command()
+    @commands.is_owner()
+    async def export(self, ctx: commands.Context, format: str = "jsonl") -> None:
+        if format not in export_formats:
+            await ctx.send(f"{self.config.red_cross_emoji_id} The format must be one of: {', '.join(export_formats)}.")
+            return
+
+        directory = f"src/database/exports/{time.strftime('%Y%m%d-%H%M%S')}"
+        msg = await ctx.send(f"{self.config.loading_green_emoji_id} Exporting the database as {format}...")
+        try:
+            written = await self.backup_manager.export_files(directory, format)
+        except Exception as e:
+            await msg.edit(content=f"{self.config.red_cross_emoji_id} Couldn't export the database. Error: {e}")
+            return self.logger.log("ERROR", f"Couldn't export the database: {e}")
+
+        summary = ", ".join(f"{table}: {count}" for table, count in written.items())
+        await msg.edit(content=f"{self.config.green_tick_emoji_id} Database exported to `{directory}` ({summary}).")
+        await self.logger.discord_log(f"✅ Database exported to `{directory}` ({summary}).")
+        self.logger.log("INFO", f"✅ Database exported to {directory} ({summary}).")
+
+async def setup(bot: commands.Bot) -> None:
+    await bot.add_cog(BackupCommand(bot))
+    return Logger().log("INFO", "Backup command loaded!")
@@ -42,20 +42,20 @@ class ChangeUserGuild(commands.Cog):
             await changing_message.edit(content=f"Couldn't fetch the guild with id `{id}`. Error: {e}")
             return
 
-        success, steamid64, nickname, avatar = self.checker.get_persona(id)
+        success, steamid64, nickname, avatar = await self.checker.get_persona(id)
 
         if not success:
             await changing_message.edit(content=f"The id `{id}` is not a valid ID.")
             await self.logger.discord_log(f"✅ {username} tried to change the guild of the id `{id}` but it's not a valid ID.")
             return
 
-        if not self.database.check_adding_ownership(steamid64, interaction.user.id):
+        if not await self.database.check_adding_ownership(steamid64, interaction.user.id):
             await changing_message.edit(content=f"You don't have permission to change the guild of the id `{id}`. Ask whoever added it.")
             await self.logger.discord_log(f"✅ {username} tried to change the guild of the id `{id}` but they don't have permission.")
             return
 
         try:
-            self.database.change_guild(steamid64, guild.id)
+            await self.database.change_guild(steamid64, guild.id)
         except Exception as e:
             await changing_message.edit(content=f"Couldn't change the guild of the id `{id}`. Error: {e}")
             return
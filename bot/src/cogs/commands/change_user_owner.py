@@ -34,7 +34,7 @@ class ChangeUserOwner(commands.Cog):
         changing_message = await interaction.followup.send(f"{self.config.loading_green_emoji_id} Trying to change {id}'s associated owner id.", ephemeral=hidden)
 
         # Get user steamid4 to search for him in database later
-        success, steamid64, nickname, avatar = self.checker.get_persona(id)
+        success, steamid64, nickname, avatar = await self.checker.get_persona(id)
 
         # If the user is not on the database, send an error message
         if not success:
@@ -43,13 +43,13 @@ class ChangeUserOwner(commands.Cog):
             return
         
         # Check if the user that's running the command is the owner of the id
-        if not self.database.check_adding_ownership(steamid64, interaction.user.id):
+        if not await self.database.check_adding_ownership(steamid64, interaction.user.id):
             await changing_message.edit(content=f"You don't have permissions to change the ownership of the id `{id}`.")
             return
 
         # Actually change the ownership
         try:
-            self.database.change_discord_id(steamid64, new_owner.id)
+            await self.database.change_discord_id(steamid64, new_owner.id)
         except Exception as e:
             await changing_message.edit(content=f"Couldn't change the ownership of the id `{id}`. Error: {e}")
             return
@@ -1,4 +1,4 @@
-import discord, secrets
+import asyncio, discord, secrets
 from discord import File
 from discord.ext import commands
 from discord import app_commands
@@ -10,7 +10,9 @@ from src.steam.checker import Checker
 from src.helper.datetime import DateTime
 from src.handler.medal_handler import MedalHandler
 from src.handler.queue_handler import QueueHandler
-from src.manager.timeout_manager import TimeoutManager
+from src.manager.xp_manager import XpManager
+from src.handler.schedule_handler import ScheduleHandler
+from src.manager.rate_limit_manager import RateLimited, rate_limit, record_hit, undo_hit
 
 class Check(commands.Cog):
     def __init__(self, bot: commands.Bot):
@@ -22,7 +24,8 @@ class Check(commands.Cog):
         self.datetime_helper = DateTime()
         self.queue_handler = QueueHandler()
         self.medal_handler = MedalHandler()
-        self.timeout_manager = TimeoutManager()
+        self.xp_manager = XpManager()
+        self.schedule_handler = ScheduleHandler()
 
     # Check bot command  
     @app_commands.command(name="check", description=f"Add some steam profile to the queue to be checked.")
@@ -30,26 +33,30 @@ class Check(commands.Cog):
         id="The steam id (profile link, custom id, steamid64) to be checked.",
         hidden="If the command should be hidden from other users or not."
     )
+    @rate_limit(1, Config().user_timeout, record=False)
     async def check_command(self, interaction: discord.Interaction, id: str, hidden: bool = True):
         await interaction.response.defer(ephemeral=hidden)
 
         # Clean the username
         username = Utils.clean_discord_username(f"{interaction.user.name}#{interaction.user.discriminator}")
 
-        # Check if the user is in timeout
-        is_in_timeout, time_remaining = self.timeout_manager.is_user_in_timeout(interaction.user.id)
-        if is_in_timeout:
-            minutes, seconds = divmod(time_remaining, 60)
-            await self.logger.discord_log(f"⏳ {username} tried to use the check command but is in timeout for {int(minutes)} minutes and {int(seconds)} seconds.")
-            self.logger.log("INFO", f"⏳ {username} tried to use the check command but is in timeout for {int(minutes)} minutes and {int(seconds)} seconds.")
-            return await interaction.followup.send(f"{self.config.loading_red_emoji_id} You can only use this command every {self.config.user_timeout} seconds! Please wait {int(minutes)} minutes and {int(seconds)} seconds.", ephemeral=hidden)
-
-        # Check if the api it's online
+        # Check if the api it's online, the circuit breaker knows without a request
         if not self.checker.is_api_online():
+            # Another call is probing the api after it was offline, this one would be rejected until it's back
+            if self.checker.breaker.is_probing():
+                self.logger.log("INFO", f"⚠️ {username} tried to use the check command while the API was being probed.")
+                return await interaction.followup.send(f"{self.config.loading_red_emoji_id} The API was offline and it's being checked again, please try again in a few seconds.", ephemeral=hidden)
             await self.logger.discord_log(f"⚠️ {username} tried to use the check command but the API is offline.")
             self.logger.log("INFO", f"⚠️ {username} tried to use the check command but the API is offline.")
-            return await interaction.followup.send(f"{self.config.loading_red_emoji_id} The API is offline, please try again later.", ephemeral=hidden)
-        
+            return await interaction.followup.send(f"{self.config.loading_red_emoji_id} The API is offline, please try again in `{max(1, round(self.checker.breaker.get_retry_in()))}` seconds.", ephemeral=hidden)
+
+        # The use only counts once the check is queued, another /check of the same user may have got in since the rate limit check
+        retry_after = record_hit(interaction, 1, self.config.user_timeout)
+        if retry_after:
+            minutes, seconds = divmod(retry_after, 60)
+            self.logger.log("INFO", f"⏳ {username} tried to use the check command but is in timeout for {int(minutes)} minutes and {int(seconds)} seconds.")
+            return await interaction.followup.send(f"{self.config.loading_red_emoji_id} You can only use this command every {self.config.user_timeout} seconds! Please wait {int(minutes)} minutes and {int(seconds)} seconds.", ephemeral=hidden)
+
         # Tell the user that the bot is working on their order and log it to console and logs channel
         requested_message = await interaction.followup.send(f"{self.config.loading_green_emoji_id} Requested `{id}` to be checked.", ephemeral=hidden)
         await self.logger.discord_log(f"⌛ Requested `{id}` to be checked. Requested by `{username}`.")
@@ -71,13 +78,23 @@ class Check(commands.Cog):
         queue_id = f"KWS{secrets.token_hex(6)}"
 
         # Get user info
-        success, steamid64, name, avatar = self.checker.get_persona(id)
-
-        self.queue_handler.push_order({'steamid64': steamid64, 'queue_id': queue_id,'requested_by': int(interaction.user.id)})
-        await self.queue_handler.force_check_start()
-
-        # Get the results of the check
-        success, result = await self.queue_handler.get_check_results(steamid64)
+        success, steamid64, name, avatar = await self.checker.get_persona(id)
+
+        order = self.queue_handler.push_order({'steamid64': steamid64, 'queue_id': queue_id,'requested_by': int(interaction.user.id)})
+
+        # If the user is tracked, poll their xp on the next cycle too
+        if success and await self.xp_manager.get_user_by_steam_id(steamid64) is not None:
+            self.schedule_handler.promote(int(steamid64))
+
+        # Wait for the results of the check, the order is dropped if it takes too long
+        try:
+            success, result = await asyncio.wait_for(order, timeout=self.config.check_timeout)
+        except asyncio.TimeoutError:
+            self.logger.log("WARNING", f"⚠️ The check of `{id}` timed out. Requested by `{username}`.")
+            # The check may have made its medals image before it was cancelled
+            await self.medal_handler.delete_image(f"{queue_id}")
+            undo_hit(interaction)
+            return await requested_message.edit(content=f"{self.config.loading_red_emoji_id} The check took too long and was cancelled, please try again later.", embed=None)
         image_path = None
 
         # Check if the check was successful
@@ -144,6 +161,8 @@ class Check(commands.Cog):
             embed.set_footer(text=f"CSGO Tracker • Requested by {username}", icon_url=self.config.csgo_tracker_logo)
             embed.timestamp = self.datetime_helper.get_current_timestamp()
         else:
+            # A failed check doesn't count as a use
+            undo_hit(interaction)
             # If there was an error, send a message with the error
             await interaction.followup.send(f"{self.config.loading_red_emoji_id} There was an error checking the steam ID. Contact the developer if the id format is profile link or steamid64 (correct).", ephemeral=hidden)
 
@@ -158,27 +177,15 @@ class Check(commands.Cog):
         # Delete the image
         await self.medal_handler.delete_image(f"{queue_id}")
 
-        # Check if the user has admin permission
-        if interaction.guild is not None and not interaction.member.guild_permissions.administrator:
-            await self.logger.discord_log(f"⚠️  {username} has bypassed the timeout because they have admin permissions.")
-            self.logger.log("INFO", f"⚠️  {username} has bypassed the timeout because they have admin permissions.")
-        else:
-            # Add user to timeout list after they have successfully used the command
-            adding = self.timeout_manager.add_user(interaction.user.id)
-
-            # Check if the user is already in the timeout list
-            if not adding:
-                await self.logger.discord_log(f"❌ The user {username} is `already` in the timeout list.")
-                self.logger.log("INFO", f"{self.config.red_cross_emoji_id} The user {username} is already in the timeout list.")
-                return await interaction.followup.send(f"{self.config.loading_red_emoji_id} The user {username} `already` in the timeout list.", ephemeral=hidden)
-
-            # Log that the user has been added to the timeout list
-            await self.logger.discord_log(f"⏳ {username} has been added to the timeout list for {self.config.user_timeout} seconds.")
-            self.logger.log("INFO", f"⏳ {username} has been added to the timeout list for {self.config.user_timeout} seconds.")
-
     @check_command.error
     async def check_command_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError):
-        if isinstance(error, app_commands.errors.MissingPermissions):
+        if isinstance(error, RateLimited):
+            username = Utils.clean_discord_username(f"{interaction.user.name}#{interaction.user.discriminator}")
+            minutes, seconds = divmod(error.retry_after, 60)
+            await self.logger.discord_log(f"⏳ {username} tried to use the check command but is in timeout for {int(minutes)} minutes and {int(seconds)} seconds.")
+            self.logger.log("INFO", f"⏳ {username} tried to use the check command but is in timeout for {int(minutes)} minutes and {int(seconds)} seconds.")
+            return await interaction.response.send_message(f"{self.config.loading_red_emoji_id} You can only use this command every {self.config.user_timeout} seconds! Please wait {int(minutes)} minutes and {int(seconds)} seconds.", ephemeral=True)
+        elif isinstance(error, app_commands.errors.MissingPermissions):
             return await interaction.response.send_message(f"{self.config.red_cross_emoji_id} You don't have permissions to use this command.", ephemeral=True)
         else:
             return await interaction.response.send_message(f"{self.config.red_cross_emoji_id} Error: {error}", ephemeral=True)
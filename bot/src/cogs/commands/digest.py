@@ -0,0 +1,54 @@
+import discord
+from discord.ext import commands
+from discord import app_commands
+from src.util.utils import Utils
+from src.util.logger import Logger
+from src.helper.config import Config
+from src.manager.guild_manager import GuildManager
+
+class DigestCommand(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self.config = Config()
+        self.logger = Logger(bot)
+        self.guild_manager = GuildManager()
+
+    # Digest bot command
+    @app_commands.command(name="digest", description="Get one summary per tracking cycle instead of one message per xp change.")
+    @app_commands.describe(
+        switch="If the digest mode should be enabled or disabled.",
+        hidden="If the command should be hidden from other users or not."
+    )
+    @app_commands.checks.has_permissions(administrator=True)
+    @app_commands.guild_only()
+    async def digest_command(self, interaction: discord.Interaction, switch: bool, hidden: bool = True):
+        await interaction.response.defer(ephemeral=hidden)
+
+        # Clean the username
+        username = Utils.clean_discord_username(f"{interaction.user.name}#{interaction.user.discriminator}")
+
+        request_message = await interaction.followup.send(f"{self.config.loading_green_emoji_id} Trying to set digest mode to `{switch}`.", ephemeral=hidden)
+
+        # The digest mode is a setting of the tracker channel
+        if not await self.guild_manager.guild_exists(interaction.guild_id):
+            return await request_message.edit(content=f"{self.config.red_cross_emoji_id} This server doesn't have a tracker channel set. Set it first with `/set_tracker_channel`.")
+
+        if not await self.guild_manager.set_digest(interaction.guild_id, switch):
+            return await request_message.edit(content=f"{self.config.red_cross_emoji_id} Failed to set digest mode.")
+
+        # Send a message to the user
+        await request_message.edit(content=f"{self.config.green_tick_emoji_id} Digest mode has been set to `{switch}`.")
+
+        self.logger.log("INFO", f"Digest mode has been set to `{switch}` on the guild {interaction.guild_id} ({interaction.guild.name}) by {username}.")
+        return await self.logger.discord_log(f"Digest mode has been set to `{switch}` on the guild {interaction.guild_id} ({interaction.guild.name}) by {username}.")
+
+    @digest_command.error
+    async def digest_command_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError):
+        if isinstance(error, app_commands.errors.MissingPermissions):
+            return await interaction.response.send_message(f"{self.config.red_cross_emoji_id} You don't have permissions to use this command.", ephemeral=True)
+        else:
+            return await interaction.response.send_message(f"Error: {error}", ephemeral=True)
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(DigestCommand(bot))
+    return Logger().log("INFO", "Digest command loaded!")
@@ -1,4 +1,4 @@
-import discord
+import discord, time
 from discord.ext import commands
 from discord import app_commands
 from src.util.utils import Utils
@@ -7,6 +7,7 @@ from src.helper.config import Config
 from src.steam.checker import Checker
 from src.helper.datetime import DateTime
 from src.manager.xp_manager import XpManager
+from src.manager.xp_history_manager import XpHistoryManager
 
 class Earned(commands.Cog):
     def __init__(self, bot: commands.Bot):
@@ -14,6 +15,7 @@ class Earned(commands.Cog):
         self.config = Config()
         self.checker = Checker()
         self.xp_manager = XpManager()
+        self.xp_history_manager = XpHistoryManager()
         self.logger = Logger(self.bot)
         self.datetime_helper = DateTime()
 
@@ -35,15 +37,15 @@ class Earned(commands.Cog):
         self.logger.log("INFO", f"⌛ Requesting database for {id}'s xp.")
 
         # Get user steamid4 to search for him in database later
-        success, steamid64, name, avatar = self.checker.get_persona(id)
+        success, steamid64, name, avatar = await self.checker.get_persona(id)
 
         # Check if the user's the owner of the id   
-        if not self.xp_manager.check_adding_ownership(steamid64, interaction.user.id):
+        if not await self.xp_manager.check_adding_ownership(steamid64, interaction.user.id):
             await requested_message.edit(content=f"{self.config.red_cross_emoji_id} You don't have permissions to use this command on another people.")
             return await self.logger.discord_log(f"❌ {username} Tried to set `{id}`'s xp but he is not the owner of the id.")
 
         # Get their earned xp   
-        earned_xp = self.xp_manager.get_earned_by_steamid64(steamid64)
+        earned_xp = await self.xp_manager.get_earned_by_steamid64(steamid64)
 
         # If the user is not on the database, send an error message
         if earned_xp is None:
@@ -52,6 +54,9 @@ class Earned(commands.Cog):
             self.logger.log("ERROR", f"❌ The user is not on the database!")
             return
 
+        # Get the xp earned in the last 7 days from the history rollups
+        weekly_xp = await self.xp_history_manager.get_earned_since(steamid64, int(time.time()) - 7 * 86400)
+
         # Create embed
         embed = discord.Embed(title="📄 Earned XP", description="Here you will have displayed your monthly and global xp earnings.", color=0x000000)
         embed.set_author(name=f"Tracker", icon_url=self.config.csgo_tracker_logo, url="https://kwayservices.top")
@@ -59,6 +64,7 @@ class Earned(commands.Cog):
         # Add fields to embed
         embed.add_field(name="Monthly XP", value=f"`{earned_xp[0]}`", inline=True)
         embed.add_field(name="Global XP", value=f"`{earned_xp[1]}`", inline=True)
+        embed.add_field(name="Last 7 days", value=f"`{weekly_xp}`", inline=True)
 
         # Add footer and thumbnail to embed
         embed.set_footer(text="CSGO Tracker • kwayservices.top", icon_url=self.config.csgo_tracker_logo)
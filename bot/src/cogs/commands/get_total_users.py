@@ -17,8 +17,8 @@ class GetTotalUsers(commands.Cog):
     @app_commands.command(name="get_total_users", description="Command to get the total users the bot's tracking.")
     async def get_user_count_command(self, interaction: discord.Interaction, hidden: bool = True):
         await interaction.response.defer(ephemeral=hidden)
-        total_users = self.xp_manager.get_users_count()
-        total_guild_users = self.xp_manager.get_users_count_by_guild_id(interaction.guild.id)
+        total_users = await self.xp_manager.get_users_count()
+        total_guild_users = await self.xp_manager.get_users_count_by_guild_id(interaction.guild.id)
         embed = discord.Embed(title="🧮 Total users being tracked", description="Below you have the total users count:", color=0xb34760)
         embed.add_field(name="Total", value=f"**{total_users}** users.", inline=True)
         embed.add_field(name="This server", value=f"**{total_guild_users} users.**", inline=True)
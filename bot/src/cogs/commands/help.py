@@ -20,6 +20,8 @@ commands_text = f"""
   > - */remove_user* - Remove some user from the xp-tracke database, being you who added the user.
   > - */reset_xp* - Let's you reset monthly or total xp, being you who added the user.
   > - */earned* - Show how much xp you've earned in the last month or in total.
+  > - */history* - Show the level and xp earned on each of the last days, being you who added the user.
+  > - */top_earned* - Show who earned the most xp in the last day, week or month.
 
 *(Please don't add other people's accounts without their permission, they will be removed.)*
 
@@ -28,6 +30,7 @@ commands_text = f"""
   > - */setup* - Shows the steps to setup the bot on your server.
   > - */admin_mode* - Set the admin mode for the server.
   > - */set_tracker_channel* - Set the channel where the bot will send the xp-tracker messages on this server.
+  > - */digest* - Get one summary per tracking cycle instead of one message per xp change.
   > - */change_user_guild* - Change the user's guild, being you who added the user.
   > - */change_user_owner* - Change the id's ownership, being you who added the user.
 """
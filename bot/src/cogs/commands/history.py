@@ -0,0 +1,79 @@
+import discord
+from typing import Literal
+from datetime import datetime, timezone
+from discord.ext import commands
+from discord import app_commands
+from src.util.utils import Utils
+from src.util.logger import Logger
+from src.helper.config import Config
+from src.steam.checker import Checker
+from src.helper.datetime import DateTime
+from src.manager.xp_manager import XpManager
+from src.manager.xp_history_manager import XpHistoryManager
+
+periods = {"Week": 7, "Month": 30}
+
+class History(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self.config = Config()
+        self.checker = Checker()
+        self.xp_manager = XpManager()
+        self.xp_history_manager = XpHistoryManager()
+        self.logger = Logger(self.bot)
+        self.datetime_helper = DateTime()
+
+    # History bot command
+    @app_commands.command(name="history", description="Shows the level and xp earned on each of the last days.")
+    @app_commands.describe(
+        id="The steamid64/vanity/profile url of the user you want to see the history of.",
+        period="How many days to show, the current day isn't complete yet and is left out.",
+        hidden="If the command should be hidden from other users or not."
+    )
+    async def history_command(self, interaction: discord.Interaction, id: str, period: Literal["Week", "Month"] = "Week", hidden: bool = True):
+        await interaction.response.defer(ephemeral=hidden)
+
+        # Clean the username
+        username = Utils.clean_discord_username(f"{interaction.user.name}#{interaction.user.discriminator}")
+
+        requested_message = await interaction.followup.send(f"{self.config.loading_green_emoji_id} Requesting database for {id}'s history.")
+        self.logger.log("INFO", f"⌛ Requesting database for {id}'s history. Requested by {username}")
+
+        # Get user steamid64 to search for him in database later
+        success, steamid64, name, avatar = await self.checker.get_persona(id)
+
+        if await self.xp_manager.get_user_by_steam_id(steamid64) is None:
+            return await requested_message.edit(content=f"{self.config.red_cross_emoji_id} The user is not on the database!")
+
+        # Check if the user's the owner of the id
+        if not await self.xp_manager.check_adding_ownership(steamid64, interaction.user.id):
+            await requested_message.edit(content=f"{self.config.red_cross_emoji_id} You don't have permissions to use this command on another people.")
+            return await self.logger.discord_log(f"❌ {username} Tried to see `{id}`'s history but he is not the owner of the id.")
+
+        # One row per day from the daily rollups, the days without xp changes have none
+        data = await self.xp_history_manager.get_user_history(steamid64, periods[period])
+
+        if data:
+            description = "`Day`/`Level`/`XP earned`\n\n"
+            for day, level, xp, earned in data:
+                description = description + f" > **{datetime.fromtimestamp(day, timezone.utc).strftime('%d/%m')}** • Level `{level}` • `+{earned} XP`\n"
+            description = description + f"\nTotal: `{sum(row[3] for row in data)} XP`"
+        else:
+            description = f"{self.config.discord_emoji_id} No xp changes in the last {periods[period]} days."
+
+        embed = discord.Embed(title=f"📈 `{name}`'s last {periods[period]} days", url=f"https://steamcommunity.com/profiles/{steamid64}", description=description, color=0x000000)
+        embed.set_author(name=f"Tracker", icon_url=self.config.csgo_tracker_logo, url="https://kwayservices.top")
+        embed.set_footer(text="CSGO Tracker • Days in UTC", icon_url=self.config.csgo_tracker_logo)
+        embed.set_thumbnail(url=avatar or self.config.csgo_tracker_logo)
+        embed.set_image(url=self.config.rainbow_line_gif)
+        embed.timestamp = self.datetime_helper.get_current_timestamp()
+
+        await requested_message.edit(content=f"{self.config.green_tick_emoji_id} Database query completed!", embed=embed)
+
+    @history_command.error
+    async def history_command_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError):
+        await interaction.response.send_message(f"Error: {error}", ephemeral=True)
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(History(bot))
+    return Logger().log("INFO", "History command loaded!")
@@ -34,7 +34,7 @@ class RemoveUser(commands.Cog):
 
         added_message = await interaction.followup.send(f"{self.config.loading_green_emoji_id} Trying to remove id `{id}` from the tracker database.", ephemeral=hidden)
 
-        admin_mode = self.admin_mode_manager.get_admin_mode(interaction.guild_id)
+        admin_mode = await self.admin_mode_manager.get_admin_mode(interaction.guild_id)
 
         # Check if the admin mode is set
         if admin_mode is None:
@@ -48,19 +48,19 @@ class RemoveUser(commands.Cog):
             await self.logger.discord_log(f"✅ {username} tried to add an id to the tracker database, but the admin mode is enabled.")
             return
 
-        success, steamid64, nickname, avatar = self.checker.get_persona(id)
+        success, steamid64, nickname, avatar = await self.checker.get_persona(id)
 
         if not success:
             await added_message.edit(content=f"The id `{id}` is not a valid ID.")
             await self.logger.discord_log(f"✅ {username} tried to remove the id `{id}` from the tracker database but it's not a valid ID.")
             return
 
-        if self.database.get_user_by_steam_id(steamid64) is None:
+        if await self.database.get_user_by_steam_id(steamid64) is None:
             await added_message.edit(content=f"The id `{id}` is not being tracked.")
             await self.logger.discord_log(f"✅ {username} tried to remove the id `{id}` from the tracker database but it's not being tracked.")
             return
 
-        if not self.database.check_adding_ownership(steamid64, interaction.user.id):
+        if not await self.database.check_adding_ownership(steamid64, interaction.user.id):
             await added_message.edit(content=f"You don't have permission to remove the id `{id}` from the tracker database.")
             await self.logger.discord_log(f"✅ {username} tried to remove the id `{id}` from the tracker database but it doesn't have permission.")
             return
@@ -68,7 +68,7 @@ class RemoveUser(commands.Cog):
         removed_user = TrackedUser(steamid64, interaction.user.id, None, None, None, None, None)
 
         try:
-            self.database.remove_user(removed_user)
+            await self.database.remove_user(removed_user)
         except Exception as e:
             await added_message.edit(content=f"Couldn't remove id {id} from the tracker database. Error: {e}")
             return
@@ -8,6 +8,7 @@ from src.helper.config import Config
 from src.steam.checker import Checker
 from src.helper.datetime import DateTime
 from src.manager.xp_manager import XpManager
+from src.manager.xp_buffer_manager import XpBufferManager
 
 class ResetXP(commands.Cog):
     def __init__(self, bot: commands.Bot):
@@ -15,6 +16,7 @@ class ResetXP(commands.Cog):
         self.config = Config()
         self.checker = Checker()
         self.xp_manager = XpManager()
+        self.xp_buffer = XpBufferManager()
         self.logger = Logger(self.bot)
         self.datetime_helper = DateTime()
 
@@ -36,32 +38,35 @@ class ResetXP(commands.Cog):
         self.logger.log("INFO", f"⌛ Requesting database for {id}'s xp.")
 
         # Get user steamid4 to search for him in database later
-        success, steamid64, name, avatar = self.checker.get_persona(id)
+        success, steamid64, name, avatar = await self.checker.get_persona(id)
 
         # Fetch the user from the database
-        fetched_user = self.xp_manager.get_user_by_steam_id(steamid64)
+        fetched_user = await self.xp_manager.get_user_by_steam_id(steamid64)
 
         if fetched_user is None:
             await requested_message.edit(content=f"{self.config.red_cross_emoji_id} The user `{id}` is not in the database.")
             return await self.logger.discord_log(f"❌ The user `{id}` is not in the database.")
         
         # Check if the user's the owner of the id   
-        if not self.xp_manager.check_adding_ownership(steamid64, interaction.user.id):
+        if not await self.xp_manager.check_adding_ownership(steamid64, interaction.user.id):
             await requested_message.edit(content=f"{self.config.red_cross_emoji_id} You don't have permissions to use this command on another people.")
             return await self.logger.discord_log(f"❌ {username} Tried to set `{id}`'s xp but he is not the owner of the id.")
 
         try:
+            # A tracked change still waiting to be written carries the totals from before the reset
+            self.xp_buffer.reset_earned(steamid64, monthly=mode in ("Monthly", "Both"), global_=mode in ("Global", "Both"))
+
             if mode == "Monthly":
-                self.xp_manager.reset_monthly_xp(steamid64)
+                await self.xp_manager.reset_monthly_xp(steamid64)
                 return await requested_message.edit(content=f"{self.config.green_tick_emoji_id} Successfully reset `{id}`'s monthly xp.")
             
             if mode == "Global":
-                self.xp_manager.reset_global_xp(steamid64)
+                await self.xp_manager.reset_global_xp(steamid64)
                 return await requested_message.edit(content=f"{self.config.green_tick_emoji_id} Successfully reset `{id}`'s global xp.")
             
             if mode == "Both":
-                self.xp_manager.reset_monthly_xp(steamid64)
-                self.xp_manager.reset_global_xp(steamid64)
+                await self.xp_manager.reset_monthly_xp(steamid64)
+                await self.xp_manager.reset_global_xp(steamid64)
                 return await requested_message.edit(content=f"{self.config.green_tick_emoji_id} Successfully reset `{id}`'s monthly and global xp.")
         except Exception as e:
             await requested_message.edit(content=f"{self.config.red_cross_emoji_id} Couldn't reset `{id}`'s xp. Error: {e}")
@@ -5,7 +5,7 @@ from src.util.utils import Utils
 from src.util.logger import Logger
 from src.helper.config import Config
 from src.helper.datetime import DateTime
-from src.manager.timeout_manager import TimeoutManager
+from src.manager.rate_limit_manager import RateLimitManager
 
 class Revoke(commands.Cog):
     def __init__(self, bot: commands.Bot):
@@ -13,7 +13,7 @@ class Revoke(commands.Cog):
         self.config = Config()
         self.logger = Logger(self.bot)
         self.datetime_helper = DateTime()
-        self.timeout_manager = TimeoutManager()
+        self.rate_limit_manager = RateLimitManager()
 
     # Revoke bot command  
     @app_commands.command(name="revoke", description="Revoke someone's timeout")
@@ -32,8 +32,8 @@ class Revoke(commands.Cog):
         # Send a loading message
         requested_message = await interaction.followup.send(f"{self.config.loading_green_emoji_id} Revoking timeout...")
         
-        # Remove the user's timeout
-        revoke = self.timeout_manager.remove_user(user.id)
+        # Remove the user's timeout on every command
+        revoke = self.rate_limit_manager.reset(user.id)
 
         # If revoke is False, the user doesn't have a timeout
         if not revoke:
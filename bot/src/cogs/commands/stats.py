@@ -0,0 +1,79 @@
+import time, discord
+from discord.ext import commands
+from discord import app_commands
+from src.util.logger import Logger
+from src.helper.config import Config
+from src.helper.datetime import DateTime
+from src.handler.delivery_handler import DeliveryHandler
+from src.steam.checker import Checker
+from src.util.single_flight import SingleFlight
+from src.handler.queue_handler import QueueHandler
+from src.manager.checkpoint_manager import CheckpointManager
+from src.manager.xp_buffer_manager import XpBufferManager
+
+class Stats(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self.config = Config()
+        self.logger = Logger(self.bot)
+        self.datetime_helper = DateTime()
+        self.delivery = DeliveryHandler(self.bot)
+        self.checkpoints = CheckpointManager()
+        self.breaker = Checker().breaker
+        self.flights = SingleFlight()
+        self.queue_handler = QueueHandler(self.bot)
+        self.xp_buffer = XpBufferManager()
+
+    # Stats bot command
+    @app_commands.command(name="stats", description="Show the bot internal stats.")
+    @app_commands.checks.has_permissions(administrator=True)
+    @app_commands.guilds(Config().dev_guild_id)
+    async def stats_command(self, interaction: discord.Interaction):
+        await interaction.response.defer(ephemeral=True)
+
+        embed = discord.Embed(title="📊 Bot stats.", color=0xb34760)
+
+        # Outbound messages
+        delivery = self.delivery.get_stats()
+        embed.add_field(name=f"{self.config.arrow_blue_emoji_id} Delivery queue", value=f"`{delivery['depth']}` waiting on `{delivery['destinations']}` destinations (busiest `{delivery['busiest']}`)", inline=False)
+        embed.add_field(name=f"{self.config.arrow_green_emoji_id} Delivered", value=f"`{delivery['delivered']}` messages in `{delivery['sent']}` sends, `{delivery['failed']}` failed", inline=False)
+        embed.add_field(name=f"{self.config.arrow_yellow_emoji_id} Rate limits", value=f"`{delivery['rate_limited']}` 429s, `{delivery['throttled']}` waits on the buckets, `{delivery['retried']}` retries", inline=False)
+        embed.add_field(name=f"{self.config.arrow_purple_emoji_id} Delivery latency", value=f"`{delivery['latency_avg'] * 1000:.0f} ms` average, `{delivery['latency_p95'] * 1000:.0f} ms` p95", inline=False)
+
+        # Check orders
+        embed.add_field(name=f"{self.config.arrow_blue_emoji_id} Check queue", value=f"`{self.queue_handler.get_queue_length()}` waiting, `{self.queue_handler.get_in_flight_count()}` being checked by `{len(self.queue_handler.workers)}` workers", inline=False)
+
+        # Checker api circuit breaker
+        state = "closed" if not self.breaker.is_open() else f"{self.breaker.state.replace('_', ' ')}, next retry in {self.breaker.get_retry_in():.0f}s"
+        embed.add_field(name=f"{self.config.arrow_pink_emoji_id} Checker API", value=f"`{state}`, opened `{self.breaker.stats['opened']}` times, `{self.breaker.stats['rejected']}` calls rejected, `{self.breaker.stats['probes']}` probes", inline=False)
+
+        # Upstream calls saved by sharing the ones already running
+        flights = self.flights.get_stats()
+        shared = ", ".join(f"{endpoint} `{stats['hits']}`/`{stats['hits'] + stats['misses']}`" for endpoint, stats in sorted(flights.items()))
+        embed.add_field(name=f"{self.config.arrow_green_emoji_id} Shared requests", value=f"`{sum(stats['hits'] for stats in flights.values())}` upstream calls saved ({shared or 'no calls yet'})", inline=False)
+
+        # Xp changes waiting on the write buffer
+        embed.add_field(name=f"{self.config.arrow_purple_emoji_id} Write buffer", value=f"`{self.xp_buffer.get_pending_count()}` xp changes waiting to be written, flushed every `{self.xp_buffer.batch_size}` changes or `{self.xp_buffer.max_delay}s`", inline=False)
+
+        # Tracking cycles and the users that haven't been polled for longer than the slowest poll tier allows
+        cycles = [f"`{worker_id}` cycle `{cycle_id}` " + ("complete" if steam_id is None else f"at `{steam_id}`") + f" <t:{updated_at}:R>" for worker_id, cycle_id, steam_id, updated_at in await self.checkpoints.get_checkpoints()]
+        embed.add_field(name=f"{self.config.arrow_white_emoji_id} Tracking cycles", value="\n".join(cycles) or "`No cycle saved yet`", inline=False)
+        limit = (self.config.tracker_max_interval + self.config.checker_interval) * 60
+        users, never, stale, oldest = await self.checkpoints.get_starvation(int(time.time()) - limit)
+        oldest = f"<t:{oldest}:R>" if oldest is not None else "`never`"
+        embed.add_field(name=f"{self.config.arrow_red_emoji_id} Starving users", value=f"`{stale}` of `{users}` not polled in `{limit // 60} minutes`, `{never}` never polled, oldest poll {oldest}", inline=False)
+
+        embed.set_footer(text=f"CSGO Tracker", icon_url=self.config.csgo_tracker_logo)
+        embed.timestamp = self.datetime_helper.get_current_timestamp()
+        await interaction.followup.send(embed=embed, ephemeral=True)
+
+    @stats_command.error
+    async def stats_command_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError):
+        if isinstance(error, app_commands.errors.MissingPermissions):
+            await interaction.response.send_message(f"{self.config.red_cross_emoji_id} You don't have permissions to use this command.", ephemeral=True)
+        else:
+            await interaction.response.send_message(f"Error: {error}", ephemeral=True)
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Stats(bot))
+    return Logger().log("INFO", "Stats command loaded!")
@@ -0,0 +1,64 @@
+import discord, time
+from typing import Literal
+from discord.ext import commands
+from discord import app_commands
+from src.util.utils import Utils
+from src.util.logger import Logger
+from src.helper.config import Config
+from src.steam.checker import Checker
+from src.helper.datetime import DateTime
+from src.manager.xp_history_manager import XpHistoryManager
+
+periods = {"Day": 1, "Week": 7, "Month": 30}
+
+class TopEarned(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self.config = Config()
+        self.checker = Checker()
+        self.xp_history_manager = XpHistoryManager()
+        self.logger = Logger(self.bot)
+        self.datetime_helper = DateTime()
+
+    # Top earned bot command
+    @app_commands.command(name="top_earned", description="Shows the users that earned the most xp in the last day, week or month.")
+    @app_commands.describe(
+        period="The rolling window to count the xp of, ending now.",
+        hidden="If the command should be hidden from other users or not."
+    )
+    async def top_earned_command(self, interaction: discord.Interaction, period: Literal["Day", "Week", "Month"] = "Week", hidden: bool = True):
+        await interaction.response.defer(ephemeral=hidden)
+
+        # Clean the username
+        username = Utils.clean_discord_username(f"{interaction.user.name}#{interaction.user.discriminator}")
+
+        requested_message = await interaction.followup.send(f"{self.config.loading_green_emoji_id} Requesting database for the top earners of the last {period.lower()}.")
+        self.logger.log("INFO", f"⌛ {username} requested the top earners of the last {period.lower()}.")
+
+        # Served from the history rollups, the window ends now and isn't rounded to whole days
+        data = await self.xp_history_manager.get_top_earned_since(int(time.time()) - periods[period] * 86400, 10)
+
+        if data:
+            description = "`User`/`XP earned`\n\n"
+            for index, (steamid64, earned) in enumerate(data, start=1):
+                success, steam64id, name, avatar = await self.checker.get_persona(steamid64)
+                description = description + f" > **{index}**. [`{name}`](https://steamcommunity.com/profiles/{steamid64}) • `{earned} XP`\n"
+        else:
+            description = f"{self.config.discord_emoji_id} Nobody earned xp in the last {period.lower()}."
+
+        embed = discord.Embed(title=f"🏆 Top earners of the last {period.lower()}.", description=description, color=0xb34760)
+        embed.set_author(name=f"Tracker", icon_url=self.config.csgo_tracker_logo, url="https://kwayservices.top")
+        embed.set_footer(text="CSGO Tracker • kwayservices.top", icon_url=self.config.csgo_tracker_logo)
+        embed.set_thumbnail(url=self.config.csgo_tracker_logo)
+        embed.set_image(url=self.config.rainbow_line_gif)
+        embed.timestamp = self.datetime_helper.get_current_timestamp()
+
+        await requested_message.edit(content=f"{self.config.green_tick_emoji_id} Database query completed!", embed=embed)
+
+    @top_earned_command.error
+    async def top_earned_command_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError):
+        await interaction.response.send_message(f"Error: {error}", ephemeral=True)
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(TopEarned(bot))
+    return Logger().log("INFO", "Top earned command loaded!")
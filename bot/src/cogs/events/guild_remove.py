@@ -13,9 +13,9 @@ class GuildRemove(commands.Cog):
     async def on_guild_remove(self, guild):
         
         # Check if the guild exists in the database and remove it if it does
-        if self.guild_manager.guild_exists(guild.id):
+        if await self.guild_manager.guild_exists(guild.id):
             try:
-                self.guild_manager.remove_guild(guild.id)
+                await self.guild_manager.remove_guild(guild.id)
                 self.logger.log("INFO", f"The guild {guild.name} ({guild.id}) has been removed from the bot.")
                 await self.logger.discord_log(f"The guild {guild.name} ({guild.id}) has been removed from the bot.")
             except Exception as e:
@@ -24,7 +24,7 @@ class GuildRemove(commands.Cog):
                 return
 
         # Clean possible remaining trash guilds
-        self.guild_manager.clean_guilds(self.bot)
+        await self.guild_manager.clean_guilds(self.bot)
 
 async def setup(bot: commands.Bot) -> None:
     await bot.add_cog(GuildRemove(bot))
@@ -12,10 +12,10 @@ class ProcessQueueLoop(commands.Cog):
         self.proccess_queue.start()
         self.queue_handler = QueueHandler()
 
-    # Proccess the queue
+    # Keep the queue workers running, they start with the first order and take the orders as they come
     @tasks.loop(seconds=45)
     async def proccess_queue(self):
-        await self.queue_handler.force_check_start()
+        self.queue_handler.start()
 
     @proccess_queue.before_loop
     async def before_proccess_queue(self) -> None:
@@ -0,0 +1,27 @@
+from src.util.logger import Logger
+from src.helper.config import Config
+from discord.ext import commands, tasks
+from src.manager.rate_limit_manager import RateLimitManager
+
+class RateLimitLoop(commands.Cog):
+
+    def __init__(self, bot: commands.Bot) -> None:
+        self.bot = bot
+        self.config = Config()
+        self.rate_limit_manager = RateLimitManager()
+        self.sweep_rate_limits.start()
+
+    # Drop the expired cooldowns and snapshot the live ones every minute
+    @tasks.loop(minutes=1)
+    async def sweep_rate_limits(self):
+        self.rate_limit_manager.sweep()
+        if self.config.rate_limit_snapshot:
+            self.rate_limit_manager.save()
+
+    @sweep_rate_limits.before_loop
+    async def before_sweep_rate_limits(self) -> None:
+        return await self.bot.wait_until_ready()
+
+async def setup(bot: commands.Bot) -> None:
+    await bot.add_cog(RateLimitLoop(bot))
+    return Logger().log("INFO", "Rate limit loop loaded!")
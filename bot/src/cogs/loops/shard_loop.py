@@ -0,0 +1,54 @@
+from src.util.logger import Logger
+from src.helper.config import Config
+from discord.ext import commands, tasks
+from src.handler.shard_handler import ShardHandler
+from src.handler.pipeline_handler import PipelineHandler
+from src.manager.outbox_manager import OutboxManager
+from src.manager.user_registry_manager import UserRegistryManager
+
+class ShardLoop(commands.Cog):
+
+    def __init__(self, bot: commands.Bot) -> None:
+        self.bot = bot
+        self.config = Config()
+        self.logger = Logger()
+        self.shard = ShardHandler()
+        self.outbox = OutboxManager()
+        self.registry = UserRegistryManager()
+        self.pipeline_handler = PipelineHandler(self.bot)
+        if self.shard.enabled:
+            self.heartbeat.start()
+            self.deliver_outbox.start()
+
+    # Keep the bot on the live tracker processes
+    @tasks.loop(seconds=30)
+    async def heartbeat(self):
+        await self.shard.heartbeat()
+
+    # Deliver the updates the tracker workers left on the outbox
+    @tasks.loop(seconds=5)
+    async def deliver_outbox(self):
+        while rows := await self.outbox.fetch():
+            digests = {}
+            for id, payload in rows:
+                try:
+                    update = self.pipeline_handler.deserialize_update(payload)
+                    # The worker already wrote the change, only the in-memory users are behind
+                    self.registry.update_levels([(update['new_level'], update['new_xp'], update['total_monthly'], update['total_global'], update['total_epoch'], update['user'].steam_id)])
+                    await self.pipeline_handler.deliver(update, digests)
+                except Exception as e:
+                    self.logger.log("ERROR", f"Error delivering outbox update {id}: {e}")
+            await self.pipeline_handler.send_digests(digests)
+            await self.outbox.delete([id for id, _ in rows])
+
+    @heartbeat.before_loop
+    async def before_heartbeat(self) -> None:
+        return await self.bot.wait_until_ready()
+
+    @deliver_outbox.before_loop
+    async def before_deliver_outbox(self) -> None:
+        return await self.bot.wait_until_ready()
+
+async def setup(bot: commands.Bot) -> None:
+    await bot.add_cog(ShardLoop(bot))
+    return Logger().log("INFO", "Shard loop loaded!")
@@ -0,0 +1,26 @@
+from src.util.logger import Logger
+from discord.ext import commands, tasks
+from src.manager.user_registry_manager import UserRegistryManager
+
+class UserRegistryLoop(commands.Cog):
+
+    def __init__(self, bot: commands.Bot) -> None:
+        self.bot = bot
+        self.logger = Logger()
+        self.registry = UserRegistryManager()
+        self.reconcile_registry.start()
+
+    # Compare the in-memory users against the database every 30 minutes
+    @tasks.loop(minutes=30)
+    async def reconcile_registry(self):
+        drift = await self.registry.reconcile()
+        if drift:
+            self.logger.log("WARNING", f"User registry was out of sync with the database, reloaded {drift} users.")
+
+    @reconcile_registry.before_loop
+    async def before_reconcile_registry(self) -> None:
+        return await self.bot.wait_until_ready()
+
+async def setup(bot: commands.Bot) -> None:
+    await bot.add_cog(UserRegistryLoop(bot))
+    return Logger().log("INFO", "User registry loop loaded!")
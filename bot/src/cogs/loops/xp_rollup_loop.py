@@ -0,0 +1,26 @@
+from src.util.logger import Logger
+from discord.ext import commands, tasks
+from src.manager.xp_history_manager import XpHistoryManager
+
+class XpRollupLoop(commands.Cog):
+
+    def __init__(self, bot: commands.Bot) -> None:
+        self.bot = bot
+        self.logger = Logger()
+        self.xp_history_manager = XpHistoryManager()
+        self.xp_rollup.start()
+
+    # Roll the xp history into the hourly and daily tables every 15 minutes
+    @tasks.loop(minutes=15)
+    async def xp_rollup(self):
+        result = await self.xp_history_manager.rollup()
+        if result is not None and result[2] > 0:
+            self.logger.log("INFO", f"XP history rolled up, pruned {result[2]} expired rows.")
+
+    @xp_rollup.before_loop
+    async def before_xp_rollup(self) -> None:
+        return await self.bot.wait_until_ready()
+
+async def setup(bot: commands.Bot) -> None:
+    await bot.add_cog(XpRollupLoop(bot))
+    return Logger().log("INFO", "XP rollup loop loaded!")
@@ -1,8 +1,7 @@
-import asyncio
 from src.util.logger import Logger
 from src.helper.config import Config
 from discord.ext import commands, tasks
-from src.handler.xp_handler import XpHandler
+from src.handler.pipeline_handler import PipelineHandler
 
 class XpTrackLoop(commands.Cog):
 
@@ -10,12 +9,12 @@ class XpTrackLoop(commands.Cog):
         self.bot = bot
         self.xp_track.start()
         self.config = Config()
-        self.xp_handler = XpHandler(self.bot)
+        self.pipeline_handler = PipelineHandler(self.bot)
 
     # Check xp
     @tasks.loop(minutes=Config().checker_interval)
     async def xp_track(self):
-        await self.xp_handler.check_tracking()
+        await self.pipeline_handler.run()
 
     @xp_track.before_loop
     async def before_xp_track(self) -> None:
@@ -0,0 +1,188 @@
+import time, random, asyncio, discord
+from functools import partial
+from collections import deque
+from discord.ext import commands
+from src.util.logger import Logger
+
+class DeliveryHandler:
+    # Shared instance, every message the bot sends on its own (tracker updates, logs, DMs) goes through it.
+    # Producers enqueue and return right away, each destination has its own queue and worker so a rate limited
+    # channel only holds back its own messages. Waiting embed-only messages for the same destination are packed
+    # into one send (up to 10 embeds / 6000 characters), failed sends are retried with a jittered backoff
+    instance = None
+
+    embeds_per_message = 10
+    message_limit = 6000
+
+    def __new__(cls, bot: commands.Bot = None, rate: int = 5, per: float = 5, max_attempts: int = 5):
+        if cls.instance is None:
+            instance = super().__new__(cls)
+            instance.bot = None
+            instance.logger = Logger()
+            instance.rate = rate
+            instance.per = per
+            instance.max_attempts = max_attempts
+            instance.queues = {}  # (kind, id) -> deque of waiting messages
+            instance.workers = {}  # (kind, id) -> task sending that queue
+            instance.buckets = {}  # (kind, id) -> deque of the last send times
+            instance.latencies = deque(maxlen=1000)
+            instance.stats = {"sent": 0, "delivered": 0, "retried": 0, "rate_limited": 0, "throttled": 0, "failed": 0}
+            cls.instance = instance
+
+        # The bot is the first one given, from then on the logger sends its discord logs and DMs through the queue too
+        if bot is not None and cls.instance.bot is None:
+            cls.instance.bot = bot
+            cls.instance.logger = Logger(bot)
+            Logger.delivery = cls.instance
+        return cls.instance
+
+    # Functions to queue a message for a channel or a user, on_failure(error) is awaited if it can never be delivered
+    def send(self, channel_id, content: str = None, embeds: list = None, on_failure=None):
+        self.enqueue(("channel", int(channel_id)), content, embeds, on_failure)
+
+    def send_dm(self, user_id, content: str = None, embeds: list = None, on_failure=None):
+        self.enqueue(("user", int(user_id)), content, embeds, on_failure)
+
+    def enqueue(self, target, content, embeds, on_failure):
+        self.queues.setdefault(target, deque()).append({
+            "content": content,
+            "embeds": list(embeds or []),
+            "enqueued": time.monotonic(),
+            "on_failure": on_failure,
+        })
+        worker = self.workers.get(target)
+        if worker is None or worker.done():
+            self.workers[target] = asyncio.create_task(self.run(target))
+
+    # Function to get how many messages are waiting, in total and for the busiest destination
+    def get_depth(self):
+        depths = [len(queue) for queue in self.queues.values()]
+        return sum(depths), max(depths, default=0)
+
+    # Function to get the delivery stats, the latency is from the enqueue to the send (seconds)
+    def get_stats(self):
+        latencies = sorted(self.latencies)
+        depth, busiest = self.get_depth()
+        return {
+            **self.stats,
+            "depth": depth,
+            "busiest": busiest,
+            "destinations": len(self.queues),
+            "latency_avg": sum(latencies) / len(latencies) if latencies else 0,
+            "latency_p95": latencies[int(len(latencies) * 0.95)] if latencies else 0,
+        }
+
+    @staticmethod
+    def get_size(embeds):
+        return sum(len(embed) for embed in embeds)
+
+    # Function to take the next message of a queue and pack the embed-only messages waiting behind it into it
+    def pack(self, queue):
+        batch = [queue.popleft()]
+        embeds = list(batch[0]["embeds"])
+        while queue and queue[0]["content"] is None:
+            following = queue[0]["embeds"]
+            if len(embeds) + len(following) > self.embeds_per_message or self.get_size(embeds) + self.get_size(following) > self.message_limit:
+                break
+            embeds.extend(following)
+            batch.append(queue.popleft())
+        return batch, embeds
+
+    # Function to wait until the destination has room on its bucket (rate sends every per seconds)
+    async def wait_bucket(self, target):
+        bucket = self.buckets.setdefault(target, deque())
+        while True:
+            now = time.monotonic()
+            while bucket and bucket[0] <= now - self.per:
+                bucket.popleft()
+            if len(bucket) < self.rate:
+                bucket.append(now)
+                return
+            self.stats["throttled"] += 1
+            await asyncio.sleep(bucket[0] + self.per - now)
+
+    async def get_destination(self, target):
+        kind, id = target
+        if kind == "channel":
+            destination = self.bot.get_channel(id) or await self.bot.fetch_channel(id)
+        else:
+            destination = self.bot.get_user(id) or await self.bot.fetch_user(id)
+        if destination is None:
+            raise LookupError(f"Couldn't find {kind} {id}")
+        return destination
+
+    # Worker of a destination, sends until its queue is empty
+    async def run(self, target):
+        queue = self.queues[target]
+        try:
+            while queue:
+                batch, embeds = self.pack(queue)
+                await self.deliver(target, batch, embeds)
+        finally:
+            if not queue:
+                self.queues.pop(target, None)
+            self.workers.pop(target, None)
+
+    # Function to send a packed message, retrying the errors that may go away
+    async def deliver(self, target, batch, embeds):
+        content = batch[0]["content"]
+        error = None
+        for attempt in range(self.max_attempts):
+            await self.wait_bucket(target)
+            try:
+                destination = await self.get_destination(target)
+                if embeds:
+                    await destination.send(content=content, embeds=embeds)
+                else:
+                    await destination.send(content=content)
+
+                now = time.monotonic()
+                self.latencies.extend(now - message["enqueued"] for message in batch)
+                self.stats["sent"] += 1
+                self.stats["delivered"] += len(batch)
+                return
+            except (discord.Forbidden, discord.NotFound, LookupError) as e:
+                # Missing access or the destination is gone, retrying won't help and the rest of its queue would fail the same way
+                error = e
+                queue = self.queues.get(target)
+                while queue:
+                    batch.append(queue.popleft())
+                break
+            except discord.HTTPException as e:
+                error = e
+                if e.status == 429:
+                    self.stats["rate_limited"] += 1
+            except Exception as e:
+                error = e
+
+            if attempt + 1 < self.max_attempts:
+                self.stats["retried"] += 1
+                await asyncio.sleep(min(60, 2 ** attempt) * random.uniform(0.5, 1.5))
+
+        self.stats["failed"] += len(batch)
+        self.logger.log("ERROR", f"Couldn't deliver {len(batch)} message(s) to {target[0]} {target[1]}: {error}")
+
+        # Every message gets its failure handled, the same callback (e.g. removing the channel) only runs once for the batch
+        handled = set()
+        for message in batch:
+            on_failure = message["on_failure"]
+            if on_failure is None or self.get_callback_key(on_failure) in handled:
+                continue
+            handled.add(self.get_callback_key(on_failure))
+            try:
+                await on_failure(error)
+            except Exception as e:
+                self.logger.log("ERROR", f"Error handling a failed delivery to {target[0]} {target[1]}: {e}")
+
+    # Function to tell the callbacks apart, two partials of the same function and arguments are the same callback
+    @staticmethod
+    def get_callback_key(callback):
+        if isinstance(callback, partial):
+            return (callback.func, callback.args, tuple(sorted(callback.keywords.items())))
+        return callback
+
+    # Function to wait for the queued messages to be sent on shutdown, at most timeout seconds
+    async def drain(self, timeout: float = 10):
+        workers = [worker for worker in self.workers.values() if not worker.done()]
+        if workers:
+            await asyncio.wait(workers, timeout=timeout)
@@ -27,7 +27,7 @@ class LeaderboardHandler:
             return
 
         # Get the leaderboard data and length
-        data = self.xp_manager.get_users_sorted_by_total_earned()
+        data = await self.xp_manager.get_users_sorted_by_total_earned(10)
         length = len(data)
 
         # Set the embed description
@@ -36,7 +36,7 @@ class LeaderboardHandler:
             for index, user in enumerate(data[:10], start=1): # Only show the top 10, start index at 1
                 steamid64, total_earned, global_earned = user[0], user[1], user[2]
                 # Get user info
-                success, steam64id, name, avatar = self.checker.get_persona(steamid64)
+                success, steam64id, name, avatar = await self.checker.get_persona(steamid64)
                 description = description + f" > **{index}**. `{name}` • `{total_earned} XP` • `{global_earned} XP`\n"
         else:
             description = f"{self.config.discord_emoji_id} There's no people in the leaderboard."
@@ -1,4 +1,4 @@
-import os
+import os, shutil
 from src.util.logger import Logger
 from src.helper.config import Config
 
@@ -17,6 +17,18 @@ class MedalHandler:
         self.logger.log("INFO", f"Got image path for {image_name}.png")
         return path
     
+    # Function to copy a medal image to another name, for the checks that shared the request that made it
+    async def copy_image(self, source_name: str, image_name: str):
+        source = os.path.join(self.base_dir, f"{source_name}.png")
+        if not os.path.isfile(source):
+            return False
+        try:
+            shutil.copyfile(source, os.path.join(self.base_dir, f"{image_name}.png"))
+        except Exception as e:
+            self.logger.log("ERROR", f"Error while copying image: {e}")
+            return False
+        return True
+
     # Function to delete a medal image
     async def delete_image(self, image_name: str):
         path = os.path.join(self.base_dir, f"{image_name}.png")
@@ -0,0 +1,304 @@
+import time, asyncio
+from discord.ext import commands
+from src.util.logger import Logger
+from src.helper.config import Config
+from src.handler.xp_handler import XpHandler
+from src.steam.level_client import LevelClient
+from src.util.circuit_breaker import CircuitOpenError
+from src.handler.shard_handler import ShardHandler
+from src.handler.schedule_handler import ScheduleHandler
+from src.helper.trackeduser_class import TrackedUser
+from src.manager.guild_manager import GuildManager
+from src.manager.outbox_manager import OutboxManager
+from src.manager.checkpoint_manager import CheckpointManager
+from src.manager.xp_manager import XpManager
+from src.manager.xp_buffer_manager import XpBufferManager
+
+class PipelineHandler:
+    # Tracking cycle as a pipeline of stages joined by bounded queues:
+    # producer -> fetchers (tracker_concurrency) -> diff -> writer (xp buffer) -> notifier
+    # A full queue blocks the stage before it, so no stage runs ahead of the slowest one.
+    # Without a bot (tracker worker) the notifier leaves the updates on the outbox for the bot to deliver, only once the xp
+    # buffer wrote them so the bot never learns a change the database doesn't have.
+    # The due users go through in steam_id order, every tracker_checkpoint_batch users the position up to which all of
+    # them are done (low watermark) is saved with their poll times, a restart resumes the cycle after it
+    def __init__(self, bot: commands.Bot = None):
+        self.bot = bot
+        self.config = Config()
+        self.logger = Logger(self.bot)
+        self.database = XpManager()
+        self.xp_handler = XpHandler(self.bot)
+        self.xp_buffer = XpBufferManager()
+        self.scheduler = ScheduleHandler()
+        self.breaker = LevelClient().breaker
+        self.shard = ShardHandler()
+        self.outbox = OutboxManager()
+        self.guild_manager = GuildManager()
+        self.checkpoints = CheckpointManager()
+        self.checkpoint_lock = asyncio.Lock()
+        self.digests = {}
+        self.unsent = []  # outbox updates waiting for the xp buffer to write them
+        self.owned = None
+        self.started = None
+        self.cycle_id = None
+        self.cursor = None
+        self.order = []
+        self.positions = {}
+        self.finished = set()
+        self.watermark = 0
+        self.polled = []
+        self.unsaved = 0
+        self.concurrency = max(1, self.config.tracker_concurrency)
+
+    # Stage 1: push the due users in the cycle order, the bot removes users without a channel right away
+    async def produce(self, users, fetch_queue):
+        tracked = {}
+        for user, tracker_channel in users:
+            if tracker_channel is None:
+                if self.bot is not None:
+                    await self.xp_handler.remove_outdated_user(user)
+                continue
+            tracked[user.steam_id] = (user, tracker_channel)
+
+        for steam_id in self.order:
+            await fetch_queue.put(tracked[steam_id])
+
+    # Stage 2: fetch the current level and xp, several fetchers run at the same time.
+    # While the checker api circuit breaker is open they wait for it instead of failing every user
+    async def fetch(self, fetch_queue, diff_queue):
+        while True:
+            user, tracker_channel = await fetch_queue.get()
+            try:
+                result = await self.fetch_level(user)
+                if result[0] is False:
+                    self.scheduler.retry(user.steam_id)
+                    self.logger.log("ERROR", f"Error checking {user.steam_id} ({user.discord_id}) tracking: {result[1]}")
+                    await self.complete(user.steam_id, polled=False)
+                else:
+                    await diff_queue.put((user, tracker_channel, result))
+            except Exception as e:
+                self.scheduler.retry(user.steam_id)
+                self.logger.log("ERROR", f"Error checking {user.steam_id} ({user.discord_id}) tracking: {e}")
+                await self.complete(user.steam_id, polled=False)
+            finally:
+                fetch_queue.task_done()
+
+    # Function to get the level of a user through the circuit breaker. Once the backoff passes every waiting fetcher wakes up
+    # but only one call goes through as the probe, the others are rejected and wait for the probe's result
+    async def fetch_level(self, user):
+        while True:
+            await self.breaker.wait()
+            try:
+                return await self.xp_handler.get_user_level_and_xp(user.steam_id)
+            except CircuitOpenError:
+                continue
+
+    # Stage 3: compare against the stored data, unchanged users stop here
+    async def diff(self, diff_queue, write_queue):
+        while True:
+            user, tracker_channel, (new_level, new_xp, remaining_xp, percentage) = await diff_queue.get()
+            try:
+                earned_xp = self.xp_handler.get_earned_xp(user, new_level, new_xp)
+                self.scheduler.record(user.steam_id, earned_xp is not None, self.started)
+                if earned_xp is not None:
+                    # A total from a past month starts over from 0
+                    total_epoch = self.database.get_current_epoch()
+                    await write_queue.put({
+                        'user': user,
+                        'tracker_channel': tracker_channel,
+                        'new_level': new_level,
+                        'new_xp': new_xp,
+                        'remaining_xp': remaining_xp,
+                        'percentage': percentage,
+                        'earned_xp': earned_xp,
+                        'total_monthly': user.get_total_earned(total_epoch) + earned_xp,
+                        'total_global': user.global_earned + earned_xp,
+                        'total_epoch': total_epoch,
+                        'max_level': new_level > user.current_level and new_level >= 40,
+                    })
+                else:
+                    await self.complete(user.steam_id)
+            except Exception as e:
+                self.logger.log("ERROR", f"Error checking {user.steam_id} ({user.discord_id}) tracking: {e}")
+                await self.complete(user.steam_id, polled=False)
+            finally:
+                diff_queue.task_done()
+
+    # Stage 4: queue the change on the xp buffer, it writes full batches in a single transaction
+    async def write(self, write_queue, notify_queue):
+        while True:
+            update = await write_queue.get()
+            try:
+                await self.xp_buffer.add(update['user'].steam_id, update['new_level'], update['new_xp'], update['total_monthly'], update['total_global'], update['total_epoch'], update['earned_xp'])
+                await notify_queue.put(update)
+            except Exception as e:
+                self.logger.log("ERROR", f"Error writing {update['user'].steam_id} tracking: {e}")
+                await self.complete(update['user'].steam_id, polled=False)
+            finally:
+                write_queue.task_done()
+
+    # Stage 5: send the update to the guild tracker channel, or leave it on the outbox if this process has no bot
+    async def notify(self, notify_queue):
+        while True:
+            update = await notify_queue.get()
+            user = update['user']
+            try:
+                if self.bot is None:
+                    self.unsent.append(self.serialize_update(update))
+                else:
+                    await self.deliver(update, self.digests)
+            except Exception as e:
+                self.logger.log("ERROR", f"Error notifying {user.steam_id} ({user.discord_id}) tracking: {e}")
+            finally:
+                await self.complete(user.steam_id)
+                notify_queue.task_done()
+
+    # Function to order the due users of a cycle by steam_id, starting after the saved position if the last cycle didn't finish
+    def start_cycle(self, due):
+        order = sorted(due)
+        if self.cursor is not None:
+            order = [steam_id for steam_id in order if steam_id > self.cursor] + [steam_id for steam_id in order if steam_id <= self.cursor]
+        self.order = order
+        self.positions = {steam_id: position for position, steam_id in enumerate(order)}
+        self.finished = set()
+        self.watermark = 0
+
+    # Function to mark a user of the cycle as done, polled is False if their check failed (their last poll stays the same)
+    async def complete(self, steam_id, polled=True):
+        if polled:
+            self.polled.append((steam_id, int(time.time())))
+        self.finished.add(self.positions[steam_id])
+        while self.watermark in self.finished:
+            self.finished.remove(self.watermark)
+            self.watermark += 1
+        self.unsaved += 1
+        if self.unsaved >= self.config.tracker_checkpoint_batch:
+            await self.save_checkpoint()
+
+    # Function to save the cycle position (None once it's complete) and the poll times since the last save.
+    # The xp buffer is flushed first, every change up to the saved position is on the database, then the updates written
+    # with it go to the outbox
+    async def save_checkpoint(self, completed=False):
+        async with self.checkpoint_lock:
+            if completed:
+                self.cursor = None
+            elif self.watermark:
+                self.cursor = self.order[self.watermark - 1]
+            polled, self.polled = self.polled, []
+            self.unsaved = 0
+
+            if await self.xp_buffer.flush():
+                await self.push_unsent()
+            try:
+                await self.checkpoints.save(self.shard.worker_id, self.cycle_id, self.cursor, polled)
+            except Exception as e:
+                self.polled = polled + self.polled
+                self.logger.log("ERROR", f"Error saving the tracking cycle checkpoint: {e}")
+
+    # Function to leave the written updates on the outbox, they are kept for the next save if it fails
+    async def push_unsent(self):
+        if not self.unsent:
+            return
+        unsent, self.unsent = self.unsent, []
+        try:
+            await self.outbox.push_many(unsent)
+        except Exception as e:
+            self.unsent = unsent + self.unsent
+            self.logger.log("ERROR", f"Error leaving {len(unsent)} updates on the outbox: {e}")
+
+    # Function to send an update to its guild tracker channel, the ones of guilds in digest mode are added to digests instead
+    async def deliver(self, update, digests=None):
+        user = update['user']
+        if update['max_level']:
+            await self.xp_handler.notify_max_level(user)
+        if digests is not None and await self.guild_manager.get_digest(user.guild_id):
+            digests.setdefault((user.guild_id, update['tracker_channel']), []).append(update)
+        else:
+            await self.xp_handler.send_update(update['tracker_channel'], user, update['new_level'], update['remaining_xp'], update['percentage'], update['earned_xp'], update['total_monthly'])
+        self.logger.log("XP", f"Changed: {user.steam_id} • Level: {update['new_level']} • XP: {update['new_xp']} • Total: {update['total_monthly']} • Global: {update['total_global']} • User: {user.discord_id} • Guild: {user.guild_id}")
+
+    # Function to send one summary per guild in digest mode
+    async def send_digests(self, digests):
+        for (guild_id, tracker_channel), updates in digests.items():
+            await self.xp_handler.send_digest(tracker_channel, guild_id, updates)
+
+    # Functions to turn an update into json for the outbox and back
+    @staticmethod
+    def serialize_update(update):
+        return {**update, 'user': vars(update['user'])}
+
+    @staticmethod
+    def deserialize_update(payload):
+        return {**payload, 'user': TrackedUser(**payload['user'])}
+
+    # Function to get the steam ids of the users with a channel this process polls
+    def get_owned(self, users):
+        return {user.steam_id for user, tracker_channel in users if tracker_channel is not None and self.shard.owns(user.steam_id)}
+
+    # Function to run a full tracking cycle through the pipeline
+    async def run(self):
+        users = await self.database.get_users_with_channels()
+        if not users:
+            return
+
+        # With sharding, only the users this process owns right now are scheduled
+        await self.shard.heartbeat()
+        owned = self.get_owned(users)
+
+        # The users that moved to this process were polled by another one until now, the registry only heard of their
+        # changes through the outbox so they are read again from the database
+        moved = owned - self.owned if self.owned is not None else set()
+        self.owned = owned
+        if moved and self.database.registry.loaded:
+            await self.database.reload_users(moved)
+            users = await self.database.get_users_with_channels()
+            owned = self.get_owned(users)
+
+        # After a restart, pick the cycle up where it was saved and skip the users polled shortly before
+        if self.cycle_id is None:
+            self.cycle_id, self.cursor = await self.checkpoints.load(self.shard.worker_id)
+            self.scheduler.seed(await self.checkpoints.get_polled_at())
+            if self.cursor is not None:
+                self.logger.log("INFO", f"Resuming tracking cycle {self.cycle_id} after {self.cursor}.")
+        if self.cursor is None:
+            self.cycle_id += 1
+
+        self.started = time.time()
+        self.digests = {}
+        due = self.scheduler.pop_due(owned, self.started)
+        self.start_cycle(due)
+        self.logger.log("INFO", f"Checking xp for {len(due)} of {len(owned)} users ({self.concurrency} at a time), cycle {self.cycle_id}.")
+        if self.breaker.is_open():
+            self.logger.log("WARNING", f"The checker API is offline, the cycle is paused until it answers again (next retry in {self.breaker.get_retry_in():.0f} seconds).")
+
+        fetch_queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        diff_queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        write_queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        notify_queue = asyncio.Queue(maxsize=self.concurrency * 2)
+
+        workers = [asyncio.create_task(self.fetch(fetch_queue, diff_queue)) for _ in range(self.concurrency)]
+        workers.append(asyncio.create_task(self.diff(diff_queue, write_queue)))
+        workers.append(asyncio.create_task(self.write(write_queue, notify_queue)))
+        workers.append(asyncio.create_task(self.notify(notify_queue)))
+
+        completed = False
+        try:
+            # Drain the stages in order, once a queue is joined nothing else will reach the next one
+            await self.produce(users, fetch_queue)
+            for queue in (fetch_queue, diff_queue, write_queue, notify_queue):
+                await queue.join()
+            completed = True
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+            # Write the changes of this cycle and where it got to, an interrupted cycle is resumed on the next run
+            await self.save_checkpoint(completed)
+
+            # Send the summaries of the guilds in digest mode
+            digests, self.digests = self.digests, {}
+            await self.send_digests(digests)
+
+        tiers = ", ".join(f"{count} every {minutes}m" for minutes, count in self.scheduler.get_tiers().items())
+        self.logger.log("INFO", f"Checked xp for {len(due)} users in {time.time() - self.started:.1f} seconds. Poll tiers: {tiers}.")
@@ -1,82 +1,133 @@
 import asyncio, discord
-from queue import Queue
+from collections import deque
 from discord.ext import commands
 from src.util.logger import Logger
 from src.helper.config import Config
 from src.steam.checker import Checker
 from src.helper.datetime import DateTime
-from concurrent.futures import ThreadPoolExecutor
+from src.handler.medal_handler import MedalHandler
 
 class QueueHandler:
-    def __init__(self, bot: commands.Bot = None):
-        self.bot = bot
-        self.queue = Queue()
-        self.logger = Logger()
-        self.config = Config()
-        self.checker = Checker()
-        self.datetime_helper = DateTime()
-        self.proccessing = False
-        self.check_results = {}
-
-    # Pushes an order to the queue
+    # Shared instance, /check, the queue embed and the queue loop all see the same orders.
+    # Orders wait on an asyncio queue and check_workers long-lived workers take them in order,
+    # each worker waits a second between its orders so the checks don't flood the api.
+    # push_order returns a future of the (success, result) of the order, cancelling it (or a timeout with asyncio.wait_for)
+    # drops the order if it's still waiting and stops its check if it's running
+    instance = None
+
+    def __new__(cls, bot: commands.Bot = None):
+        if cls.instance is None:
+            instance = super().__new__(cls)
+            instance.bot = None
+            instance.queue = asyncio.Queue()
+            instance.waiting = deque()  # orders not taken by a worker yet, in queue order
+            instance.in_flight = {}  # queue_id -> (order, task) being checked
+            instance.workers = []
+            instance.logger = Logger()
+            instance.config = Config()
+            instance.checker = Checker()
+            instance.medal_handler = MedalHandler()
+            instance.datetime_helper = DateTime()
+            cls.instance = instance
+
+        # The queue embed needs the bot, it's the first one given
+        if bot is not None and cls.instance.bot is None:
+            cls.instance.bot = bot
+        return cls.instance
+
+    # Pushes an order to the queue, returns the future of its (success, result)
     def push_order(self, order):
-        self.queue.put(order)
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(lambda future: self.on_order_done(order, future))
+        order['future'] = future
+        self.waiting.append(order)
+        self.queue.put_nowait(order)
+        self.start()
+        return future
+
+    # Function to drop a cancelled order from the waiting ones, or stop its check if a worker has it
+    def on_order_done(self, order, future):
+        if not future.cancelled():
+            return
+        if order in self.waiting:
+            self.waiting.remove(order)
+        _, task = self.in_flight.get(order['queue_id'], (None, None))
+        if task is not None:
+            task.cancel()
 
-    # Returns the queue length
+    # Returns how many orders are waiting (not being checked)
     def get_queue_length(self):
-        return self.queue.qsize()
+        return len(self.waiting)
+
+    # Returns how many orders are being checked right now
+    def get_in_flight_count(self):
+        return len(self.in_flight)
 
-    # Returns the queue data as a list
+    # Returns the waiting orders, in queue order
     def get_queue_data(self):
-        return self.queue.queue
-    
+        return list(self.waiting)
+
     # Return if the queue is being processed
     def is_queue_processing(self):
-        return self.proccessing
-
-    # Processes the queue
-    async def process_queue(self):
-        try:
-
-            while not self.queue.empty():
-                self.proccessing = True
-                order = self.queue.get()
-                steamid64 = order['steamid64']
-                queue_id = order['queue_id']
-                requested_by = order['requested_by']
-
-                self.logger.log("INFO", f"Processing order {queue_id} from user {requested_by} for Steam ID: {steamid64}.")
+        return bool(self.in_flight)
+
+    # Starts the workers that aren't running (first order, or one stopped on an unexpected error)
+    def start(self):
+        self.workers = [worker for worker in self.workers if not worker.done()]
+        for _ in range(max(1, self.config.check_workers) - len(self.workers)):
+            self.workers.append(asyncio.create_task(self.work()))
+
+    # Worker, checks orders for as long as the bot runs, the cancelled ones are skipped
+    async def work(self):
+        while True:
+            order = await self.queue.get()
+            if order['future'].done():
+                self.queue.task_done()
+                continue
+
+            self.waiting.remove(order)
+            task = asyncio.create_task(self.process_order(order))
+            self.in_flight[order['queue_id']] = (order, task)
+            try:
+                # Not awaited directly, a cancelled order cancels only its check and not the worker
+                await asyncio.wait({task})
+            except asyncio.CancelledError:
+                task.cancel()
+                raise
+            finally:
+                del self.in_flight[order['queue_id']]
+                self.queue.task_done()
 
-                # Use asyncio's run_in_executor to run blocking functions in a thread
-                with ThreadPoolExecutor(max_workers=int(1)) as executor:
-                    for _ in range(int(1)):
-                        success, result = await asyncio.get_event_loop().run_in_executor(executor, self.checker.get_player_info, steamid64, queue_id)
+            if task.cancelled():
+                self.logger.log("INFO", f"Order {order['queue_id']} was cancelled while being checked.")
+            elif not order['future'].done():
+                # An unexpected error reaches the caller instead of stopping the worker
+                if task.exception() is not None:
+                    order['future'].set_exception(task.exception())
+                else:
+                    order['future'].set_result(task.result())
+            await asyncio.sleep(1)
 
-                self.check_results[steamid64] = (success, result)
+    # Processes an order
+    async def process_order(self, order):
+        steamid64 = order['steamid64']
+        queue_id = order['queue_id']
+        requested_by = order['requested_by']
 
-                # Remove the completed order from the queue
-                self.queue.task_done()
-                await asyncio.sleep(1)
+        self.logger.log("INFO", f"Processing order {queue_id} from user {requested_by} for Steam ID: {steamid64}.")
 
-            self.proccessing = False
-            
+        try:
+            success, result = await self.checker.get_player_info(steamid64, queue_id)
         except Exception as e:
-            self.proccessing = False
-            self.logger.log("ERROR", f"Error processing queue: {e}")
+            self.logger.log("ERROR", f"Error processing order {queue_id}: {e}")
+            success, result = False, f"Error processing order: {e}"
 
-    # Function to get the results of a check
-    async def get_check_results(self, steamid64):
-        results = self.check_results.get(steamid64)
-        return results  # If the check was not done yet, return (None, None)
+        # A check that shared the request of another order gets its own copy of the medals image, each /check deletes its own
+        if success and result.get('queue_id', queue_id) != queue_id:
+            await self.medal_handler.copy_image(result['queue_id'], queue_id)
+            result = {**result, 'queue_id': queue_id}
 
-    # Checks if the queue is empty and if it's not empty nor being processed, processes it
-    async def force_check_start(self):
-        try:
-            if not self.queue.empty() and not self.proccessing:
-                await self.process_queue()
-        except Exception as e:
-            self.proccessing = False
-            self.logger.log("ERROR", f"Error force-checking the queue: {e}")
+        return success, result
 
     async def update_queue_embed(self):
         if not self.config.queue_embed_switch: return
@@ -89,16 +140,17 @@ class QueueHandler:
             self.logger.log("ERROR", f"Failed to fetch queue embed message, use the /queue_embed command and wait for the queue to update. Error: {e}")
             return
 
-        # Get the queue data and length
-        data = self.get_queue_data()
-        length = self.get_queue_length()
+        # Get the orders being checked and the waiting ones
+        checking = [order for order, task in self.in_flight.values()]
+        data = checking + self.get_queue_data()
+        length = len(data)
 
         # Set the embed description
         if length > 0:
             description = "`User`/`ID`\n"
-            for index, order in enumerate(data, start=1):
+            for index, order in enumerate(data):
                 steamid64, requested_by = order['steamid64'], order['requested_by']
-                emoji = self.config.loading_green_emoji_id if index == 1 else self.config.loading_red_emoji_id
+                emoji = self.config.loading_green_emoji_id if index < len(checking) else self.config.loading_red_emoji_id
                 description = description + f" > • {emoji} <@{requested_by}> • `{steamid64}`\n"
         else:
             description = f"{self.config.discord_emoji_id} There's no orders in queue."
@@ -0,0 +1,73 @@
+import time, heapq
+from src.helper.config import Config
+
+class ScheduleHandler:
+    # Shared instance, the tracker and the commands that promote users use the same schedule.
+    # Every user has a next due time and a poll interval: users whose xp changed are polled every cycle (hot tier),
+    # idle users double their interval on every unchanged poll up to tracker_max_interval
+    instance = None
+
+    def __new__(cls):
+        if cls.instance is None:
+            instance = super().__new__(cls)
+            config = Config()
+            instance.base_interval = config.checker_interval * 60
+            instance.max_interval = max(instance.base_interval, config.tracker_max_interval * 60)
+            instance.schedule = {}  # steam_id -> (due, interval)
+            instance.heap = []  # (due, steam_id), entries that don't match the schedule are stale and skipped
+            cls.instance = instance
+        return cls.instance
+
+    def set(self, steam_id, due, interval):
+        self.schedule[steam_id] = (due, interval)
+        heapq.heappush(self.heap, (due, steam_id))
+
+    # Function to schedule the users the schedule doesn't know yet from their last poll (steam_id -> timestamp),
+    # after a restart the users polled shortly before aren't polled again right away
+    def seed(self, polled_at):
+        for steam_id, last_poll in polled_at.items():
+            if steam_id not in self.schedule:
+                self.set(steam_id, last_poll + self.base_interval, self.base_interval)
+
+    # Function to get which of the given users are due, users the schedule doesn't know yet are due right away.
+    # Users due within the next minute count too, the loop doesn't wake up at the exact second
+    def pop_due(self, steam_ids, now=None):
+        now = (now or time.time()) + 60
+        for steam_id in steam_ids:
+            if steam_id not in self.schedule:
+                self.set(steam_id, now, self.base_interval)
+
+        due = set()
+        while self.heap and self.heap[0][0] <= now:
+            entry_due, steam_id = heapq.heappop(self.heap)
+            entry = self.schedule.get(steam_id)
+            if entry is None or entry[0] != entry_due:
+                continue
+            if steam_id not in steam_ids:
+                # No longer tracked
+                del self.schedule[steam_id]
+                continue
+            due.add(steam_id)
+        return due
+
+    # Function to schedule the next poll of a user after checking them, counted from the start of the cycle
+    def record(self, steam_id, changed, started=None):
+        _, interval = self.schedule.get(steam_id, (0, self.base_interval))
+        interval = self.base_interval if changed else min(interval * 2, self.max_interval)
+        self.set(steam_id, (started or time.time()) + interval, interval)
+
+    # Function to retry a user on the next cycle without touching their interval, e.g. after a failed fetch
+    def retry(self, steam_id):
+        _, interval = self.schedule.get(steam_id, (0, self.base_interval))
+        self.set(steam_id, time.time(), interval)
+
+    # Function to pull a user back to the hot tier, they are polled on the next cycle
+    def promote(self, steam_id):
+        self.set(steam_id, time.time(), self.base_interval)
+
+    # Function to count the users per poll interval (in minutes), for the logs
+    def get_tiers(self):
+        tiers = {}
+        for _, interval in self.schedule.values():
+            tiers[interval // 60] = tiers.get(interval // 60, 0) + 1
+        return dict(sorted(tiers.items()))
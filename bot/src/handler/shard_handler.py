@@ -0,0 +1,54 @@
+import os, time, socket, hashlib
+from src.util.logger import Logger
+from src.helper.config import Config
+from src.manager.database_manager import DatabaseManager
+
+class ShardHandler:
+    # Shared instance, decides which tracked users this process polls when tracker_sharding is enabled.
+    # Every tracker process (the bot and each worker.py) heartbeats on the tracker_workers table, a user belongs to the
+    # live process with the highest hash of (worker_id, steam_id) (rendezvous hashing). When a process joins or leaves
+    # only the users it wins or held move, everybody else keeps their owner
+    instance = None
+
+    def __new__(cls, worker_id: str = None):
+        if cls.instance is None:
+            instance = super().__new__(cls)
+            instance.config = Config()
+            instance.logger = Logger()
+            instance.database = DatabaseManager()
+            instance.enabled = instance.config.tracker_sharding
+            instance.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+            instance.workers = [instance.worker_id]
+            cls.instance = instance
+        return cls.instance
+
+    # Function to refresh this process heartbeat and the list of live processes, the ones past the timeout are dropped
+    async def heartbeat(self):
+        if not self.enabled:
+            return self.workers
+
+        now = int(time.time())
+        await self.database.execute("INSERT OR REPLACE INTO tracker_workers (worker_id, heartbeat) VALUES (?, ?)", (self.worker_id, now))
+        await self.database.execute("DELETE FROM tracker_workers WHERE heartbeat < ?", (now - self.config.tracker_heartbeat_timeout,))
+        workers = sorted(row[0] for row in await self.database.fetchall("SELECT worker_id FROM tracker_workers"))
+
+        if workers != self.workers:
+            self.logger.log("INFO", f"Tracker workers changed, {len(workers)} live: {', '.join(workers)}.")
+        self.workers = workers or [self.worker_id]
+        return self.workers
+
+    # Function to remove this process from the live ones on shutdown, its users move right away
+    async def leave(self):
+        if self.enabled:
+            await self.database.execute("DELETE FROM tracker_workers WHERE worker_id = ?", (self.worker_id,))
+
+    @staticmethod
+    def score(worker_id, steam_id):
+        return int.from_bytes(hashlib.blake2b(f"{worker_id}:{int(steam_id)}".encode(), digest_size=8).digest(), "big")
+
+    # Function to get the process a user belongs to
+    def get_owner(self, steam_id):
+        return max(self.workers, key=lambda worker_id: self.score(worker_id, steam_id))
+
+    def owns(self, steam_id):
+        return not self.enabled or self.get_owner(steam_id) == self.worker_id
@@ -1,23 +1,27 @@
-import requests, discord, asyncio, time
+import discord
+from functools import partial
+from datetime import datetime, timezone
 from discord.ext import commands
 from src.util.logger import Logger
 from src.helper.config import Config
 from src.steam.checker import Checker
+from src.steam.level_client import LevelClient
 from src.helper.datetime import DateTime
 from src.manager.xp_manager import XpManager
 from src.manager.guild_manager import GuildManager
+from src.handler.delivery_handler import DeliveryHandler
 
 class XpHandler:
     def __init__(self, bot: commands.Bot = None):
         self.bot = bot
         self.config = Config()
         self.checker = Checker()
+        self.level_client = LevelClient()
         self.database = XpManager()
         self.logger = Logger(self.bot)
         self.datetime_helper = DateTime()
-        self.session = requests.Session()
         self.guild_manager = GuildManager()
-        self.session.headers.update({"User-Agent": "kWS-Auth"})
+        self.delivery = DeliveryHandler(self.bot)
 
     # Function to create level progress bar
     @staticmethod
@@ -80,28 +84,38 @@ class XpHandler:
         # Strip any trailing space and return the result
         return result.strip()
 
-    # Function to get the user level and xp
-    async def get_user_level_and_xp(self, id):
+    # Function to get the level and xp of a steamid64, concurrent calls are batched by the level client
+    async def get_user_level_and_xp(self, steamid64):
+        level = await self.level_client.get_level(steamid64)
+        if level is None:
+            return False, f"The id `{steamid64}` is not a valid ID.", None, None
+        return level
 
-        success, steamid64, nickname, avatar = self.checker.get_persona(id)
-
-        if not success:
-            return False, f"The id `{id}` is not a valid ID.", None, None
-
-        url = f"https://checker.kwayservices.top/steam/get/levels?id={steamid64}"
-
-        response = self.session.get(url)
-        json = response.json()
-
-        if not json["success"]:
-            return False, f"The id `{id}` is not a valid ID."
-        
-        current_level = json["data"]["data"]["current_level"]
-        current_xp = json["data"]["data"]["current_xp"]
-        percentage = json["data"]["data"]["level_percentage"]
-        remaining_xp = json["data"]["data"]["remaining_xp"]
-
-        return current_level, current_xp, remaining_xp, percentage
+    # Function to build the card sent for each xp change
+    @staticmethod
+    def create_update_card(config, name, steam_id, avatar, new_level, percentage, earned_xp, remaining_xp, total_monthly, games_needed, expected_time, xp_bar, max_level_xp_bar, max_percentage):
+        embed = discord.Embed(title=f"`{name}`'s XP Change detected!", url=f"https://steamcommunity.com/profiles/{steam_id}", color=0x08dbf8c)
+        embed.set_author(name=f"XP Tracker", icon_url=config.csgo_tracker_logo, url="https://kwayservices.top")
+
+        # Set fields
+        embed.add_field(name=f"{config.arrow_green_emoji_id} Level", value=f"`{new_level}` `({percentage})`", inline=True)
+        embed.add_field(name=f"{config.arrow_blue_emoji_id} XP Earned ", value=f"`{earned_xp}`", inline=True)
+        embed.add_field(name=f"{config.arrow_purple_emoji_id} XP Remaining", value=f"`{remaining_xp}`", inline=True)
+
+        # Add progress bar & time for 40
+        embed.add_field(name=f"{config.arrow_yellow_emoji_id} Monthly XP", value=f"`{total_monthly}`", inline=True)
+        embed.add_field(name=f"{config.arrow_pink_emoji_id} Games needed", value=f"`{games_needed} games`", inline=True)
+        embed.add_field(name=f"{config.arrow_white_emoji_id} Next level in", value=f"`{expected_time}`", inline=True)
+        embed.add_field(name=f"{config.loading_green_emoji_id} Current level progress", value=f"`{xp_bar} ({percentage})`", inline=True)
+        embed.add_field(name=f"{config.loading_green_emoji_id} Max level progress", value=f"`{max_level_xp_bar} ({max_percentage})`", inline=True)
+
+        # Set the last data
+        embed.set_thumbnail(url=avatar)
+        embed.set_image(url=config.rainbow_line_gif)
+        embed.set_footer(text=f"CSGO Tracker • Warning! The weekly xp bonus is not considered.", icon_url=config.csgo_tracker_logo)
+        # Discord shows the timestamp in the reader's timezone, so it's taken in utc without the pytz conversion
+        embed.timestamp = datetime.now(timezone.utc)
+        return embed
 
     # Function to send an update to the tracker channel
     async def send_update(self, tracker_channel, user, new_level, remaining_xp, percentage, earned_xp, total_monthly):
@@ -112,7 +126,7 @@ class XpHandler:
             avatar = None
 
             # Get user info
-            success, steamid64, name, avatar = self.checker.get_persona(user.steam_id)
+            success, steamid64, name, avatar = await self.checker.get_persona(user.steam_id)
 
             # Create the current level progress bar
             xp_bar = self.create_per_level_progress_bar(remaining_xp)
@@ -134,104 +148,114 @@ class XpHandler:
                 avatar = self.config.csgo_tracker_logo
             
             # If the xp changed, send an update
-            embed = discord.Embed(title=f"`{name}`'s XP Change detected!", url=f"https://steamcommunity.com/profiles/{user.steam_id}", color=0x08dbf8c)
-            embed.set_author(name=f"XP Tracker", icon_url=self.config.csgo_tracker_logo, url="https://kwayservices.top")
-
-            # Set fields
-            embed.add_field(name=f"{self.config.arrow_green_emoji_id} Level", value=f"`{new_level}` `({percentage})`", inline=True)
-            embed.add_field(name=f"{self.config.arrow_blue_emoji_id} XP Earned ", value=f"`{earned_xp}`", inline=True)
-            embed.add_field(name=f"{self.config.arrow_purple_emoji_id} XP Remaining", value=f"`{remaining_xp}`", inline=True)
-
-            # Add progress bar & time for 40
-            embed.add_field(name=f"{self.config.arrow_yellow_emoji_id} Monthly XP", value=f"`{total_monthly}`", inline=True)
-            embed.add_field(name=f"{self.config.arrow_pink_emoji_id} Games needed", value=f"`{games_needed_next_level} games`", inline=True)
-            embed.add_field(name=f"{self.config.arrow_white_emoji_id} Next level in", value=f"`{expected_time}`", inline=True)
-            embed.add_field(name=f"{self.config.loading_green_emoji_id} Current level progress", value=f"`{xp_bar} ({percentage})`", inline=True)
-            embed.add_field(name=f"{self.config.loading_green_emoji_id} Max level progress", value=f"`{max_level_xp_bar} ({max_percentage})`", inline=True)
-
-            # Set the last data
-            embed.set_thumbnail(url=avatar)
-            embed.set_image(url=self.config.rainbow_line_gif)
-            embed.set_footer(text=f"CSGO Tracker • Warning! The weekly xp bonus is not considered.", icon_url=self.config.csgo_tracker_logo)
-            embed.timestamp = self.datetime_helper.get_current_timestamp()
-
-            # Send the embed
-            try:
-                send_to = self.bot.get_channel(int(tracker_channel))
-                await send_to.send(embed=embed)
-            except Exception as e:
-                self.logger.log("ERROR", f"Couldn't send update to guild {user.guild_id} channel {tracker_channel}: {e}. Removing it from database!")
-                await self.logger.discord_log(f"Couldn't send update to guild {user.guild_id} channel {tracker_channel}: {e}. Removing it from database!")
-                await self.logger.dm_guild_owner(user.guild_id, f"Couldn't send update to guild {user.guild_id} channel {tracker_channel}: {e}. Removing it from database! Please, re-set your server's tracking channel.")
-                self.guild_manager.remove_guild(user.guild_id)
-                return
+            embed = self.create_update_card(
+                self.config, name, user.steam_id, avatar, new_level, percentage, earned_xp, remaining_xp, total_monthly,
+                games_needed_next_level, expected_time, xp_bar, max_level_xp_bar, max_percentage
+            )
+
+            # Queue the embed, the channel is removed if it can't be delivered
+            self.delivery.send(tracker_channel, embeds=[embed], on_failure=partial(self.remove_tracker_channel, user.guild_id, tracker_channel))
 
         except Exception as e:
             self.logger.log("ERROR", f"While sending update: {e}")
             await self.logger.discord_log(f"Error while sending update: {e}")
 
-    # Function to track the given user
-    async def track_user(self, user):
+    # Function to split the lines of a digest into embed descriptions of at most description_limit characters, grouped in
+    # messages of at most embeds_per_message embeds and message_limit characters (overhead is the title and footer of each embed).
+    # Every embed is filled with what's left of its message, so a digest takes as few messages as possible
+    @staticmethod
+    def split_digest(lines, overhead=0, description_limit=4096, message_limit=6000, embeds_per_message=10):
+        messages, size, current = [[]], 0, ""
+        for line in lines:
+            line = line[:description_limit]
+            budget = min(description_limit, message_limit - size - overhead)
+            candidate = f"{current}\n{line}" if current else line
+            if len(candidate) <= budget:
+                current = candidate
+                continue
+
+            # The embed is full, close it and start the next one (on a new message if this one is full too)
+            if current:
+                messages[-1].append(current)
+                size += len(current) + overhead
+            if len(messages[-1]) >= embeds_per_message or len(line) > min(description_limit, message_limit - size - overhead):
+                messages.append([])
+                size = 0
+            current = line
+
+        if current:
+            messages[-1].append(current)
+        return [embeds for embeds in messages if embeds]
+
+    # Function to send one summary of every xp change a guild had in this cycle (digest mode)
+    async def send_digest(self, tracker_channel, guild_id, updates):
+
         try:
-        
-            # Check if guild exists
-            if not self.guild_manager.guild_exists(user.guild_id):
-                try:
-                    self.database.remove_user(user)
-                    await self.logger.dm_user(user.discord_id, f"Removed {user.steam_id} ({user.discord_id}) from database because outdated guild id or channel id.")
-                    self.logger.log("WARNING", f"Removed {user.steam_id} ({user.discord_id}) from database because outdated guild id or channel id.")
-                    return await self.logger.discord_log(f"Removed {user.steam_id} ({user.discord_id}) from database because outdated guild id or channel id.")
-                except Exception as e:
-                    self.logger.log("ERROR", f"Error while removing user {user.steam_id} ({user.discord_id}) from database (outdated guild): {e}")
-                    return await self.logger.discord_log(f"Error while removing user {user.steam_id} ({user.discord_id}) from database (outdated guild): {e}")
-
-            # Get the tracker channel and the user xp data
-            tracker_channel = await self.guild_manager.get_channel_by_guild(user.guild_id)
-            new_level, new_xp, remaining_xp, percentage = await self.get_user_level_and_xp(user.steam_id)
-
-            # Level up checks
-            if new_level > user.current_level:  # Level up case
-                earned_xp = new_xp
-                # If user has reached the maximum level, notify him
-                if new_level >= 40:
-                    try:
-                        await self.logger.dm_user(user.discord_id, "You have reached the maximum level (40). Claim your medal!")
-                        self.logger.log("INFO", f"User {user.steam_id} ({user.discord_id}) has reached the maximum level (40).")
-                        await self.logger.discord_log(f"User {user.steam_id} ({user.discord_id}) has reached the maximum level (40).")
-                    except:
-                        self.logger.log("INFO", f"User {user.steam_id} ({user.discord_id}) has reached the maximum level (40) but couldn't be notified.")
-                        await self.logger.discord_log(f"User {user.steam_id} ({user.discord_id}) has reached the maximum level (40) but couldn't be notified.")
-            else:
-                earned_xp = new_xp - user.current_xp
-
-            # Update the user data
-            total_monthly, total_global = user.total_earned + earned_xp, user.global_earned + earned_xp
-            self.database.update_user_level_and_xp(user.steam_id, new_level, new_xp, total_monthly, total_global)
-
-            # Send an update if the user has updated
-            if user.has_updated(new_level, new_xp):
-                await self.send_update(tracker_channel, user, new_level, remaining_xp, percentage, earned_xp, total_monthly)
-                self.logger.log("XP", f"Changed: {user.steam_id} • Level: {new_level} • XP: {new_xp} • Total: {total_monthly} • Global: {total_global} • User: {user.discord_id} • Guild: {user.guild_id}")
 
+            lines = []
+            for update in sorted(updates, key=lambda update: update['earned_xp'], reverse=True):
+                user = update['user']
+                success, steamid64, name, avatar = await self.checker.get_persona(user.steam_id)
+                name = name if success and name else user.steam_id
+                lines.append(f"{self.config.arrow_green_emoji_id} [`{name}`](https://steamcommunity.com/profiles/{user.steam_id}) • Level `{update['new_level']}` `({update['percentage']})` • `+{update['earned_xp']}` XP • Monthly `{update['total_monthly']}`")
+
+            title = f"{len(updates)} XP changes detected!"
+            footer = "CSGO Tracker • Warning! The weekly xp bonus is not considered."
+            # The page counter added to the title of each embed fits in the extra 16 characters
+            messages = self.split_digest(lines, len(title) + len(footer) + 16)
+            pages = sum(len(embeds) for embeds in messages)
+
+            page = 0
+            for descriptions in messages:
+                embeds = []
+                for description in descriptions:
+                    page += 1
+                    embed = discord.Embed(title=title if pages == 1 else f"{title} ({page}/{pages})", description=description, color=0x08dbf8c)
+                    embed.set_footer(text=footer, icon_url=self.config.csgo_tracker_logo)
+                    embed.timestamp = datetime.now(timezone.utc)
+                    embeds.append(embed)
+
+                # Queue the embeds, the channel is removed if they can't be delivered
+                self.delivery.send(tracker_channel, embeds=embeds, on_failure=partial(self.remove_tracker_channel, guild_id, tracker_channel))
+
+        except Exception as e:
+            self.logger.log("ERROR", f"While sending digest: {e}")
+            await self.logger.discord_log(f"Error while sending digest: {e}")
+
+    # Function to remove the tracker channel of a guild the updates can't be delivered to
+    async def remove_tracker_channel(self, guild_id, tracker_channel, error):
+        self.logger.log("ERROR", f"Couldn't send update to guild {guild_id} channel {tracker_channel}: {error}. Removing it from database!")
+        await self.logger.discord_log(f"Couldn't send update to guild {guild_id} channel {tracker_channel}: {error}. Removing it from database!")
+        await self.logger.dm_guild_owner(guild_id, f"Couldn't send update to guild {guild_id} channel {tracker_channel}: {error}. Removing it from database! Please, re-set your server's tracking channel.")
+        await self.guild_manager.remove_guild(guild_id)
+
+    # Function to remove a user whose guild has no tracker channel anymore
+    async def remove_outdated_user(self, user):
+        try:
+            await self.database.remove_user(user)
+            self.logger.log("WARNING", f"Removed {user.steam_id} ({user.discord_id}) from database because outdated guild id or channel id.")
+            await self.logger.discord_log(f"Removed {user.steam_id} ({user.discord_id}) from database because outdated guild id or channel id.")
+            await self.logger.dm_user(user.discord_id, f"Removed {user.steam_id} ({user.discord_id}) from database because outdated guild id or channel id.", on_failure=partial(self.log_undelivered_dm, user, "the removal notice"))
         except Exception as e:
-            self.logger.log("ERROR", f"Error checking {user.steam_id} ({user.discord_id}) tracking: {e}")
-
-    # Loop to track users xp and level from database
-    async def check_tracking(self):
-
-        # Check if it's day 1 and the month earnings should be reset
-        if self.database.should_reset():
-            self.database.reset_total_earned()
-            self.logger.log("INFO", "Resetting total earned xp for all users.")
-
-        # Get all users and check them
-        users = self.database.get_users()
-        if not len(users) >= 1:
-            return await asyncio.sleep(3)
-
-        self.logger.log("INFO", f"Checking xp for {len(users)} users.")
-        
-        # Check the users
-        for user in users:
-            await self.track_user(user)
-            await asyncio.sleep(3)
\ No newline at end of file
+            self.logger.log("ERROR", f"Error while removing user {user.steam_id} ({user.discord_id}) from database (outdated guild): {e}")
+            return await self.logger.discord_log(f"Error while removing user {user.steam_id} ({user.discord_id}) from database (outdated guild): {e}")
+
+    # Function to notify a user that reached the maximum level, the dm is only queued so a failed delivery is logged later
+    async def notify_max_level(self, user):
+        self.logger.log("INFO", f"User {user.steam_id} ({user.discord_id}) has reached the maximum level (40), notifying them.")
+        await self.logger.discord_log(f"User {user.steam_id} ({user.discord_id}) has reached the maximum level (40), notifying them.")
+        await self.logger.dm_user(user.discord_id, "You have reached the maximum level (40). Claim your medal!", on_failure=partial(self.log_undelivered_dm, user, "the maximum level notice"))
+
+    # Function to log a dm that couldn't be delivered to a tracked user
+    async def log_undelivered_dm(self, user, notice, error):
+        self.logger.log("WARNING", f"Couldn't deliver {notice} to user {user.steam_id} ({user.discord_id}): {error}")
+        await self.logger.discord_log(f"Couldn't deliver {notice} to user {user.steam_id} ({user.discord_id}): {error}")
+
+    # Function to get the xp a user earned since the last check, None if nothing changed
+    @staticmethod
+    def get_earned_xp(user, new_level, new_xp):
+        if not user.has_updated(new_level, new_xp):
+            return None
+        if new_level > user.current_level:  # Level up case
+            return new_xp
+        return new_xp - user.current_xp
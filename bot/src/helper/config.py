@@ -23,6 +23,7 @@ class Config:
         self.logs_channel = int(self.config["logs_channel"])
         self.dev_guild_id = discord.Object(int(self.config["dev_guild_id"]))
         self.user_timeout = int(self.config["user_timeout"])
+        self.rate_limit_snapshot = bool(self.config.get("rate_limit_snapshot", True))
         self.queue_embed_switch = self.config["queue_embed_switch"]
         self.queue_embed_channel_id = int(self.config["queue_embed_channel_id"])
         self.queue_embed_message_id = int(self.config["queue_embed_message_id"])
@@ -53,8 +54,32 @@ class Config:
         # Faceit
         self.faceit_api_key = self.config["faceit_api_key"]
 
+        # Checker API, point it to a local stand-in server (standin_api.py) to test offline
+        self.checker_api_url = str(self.config.get("checker_api_url", "https://checker.kwayservices.top")).rstrip("/")
+        self.checker_breaker_threshold = int(self.config.get("checker_breaker_threshold", 5))
+        self.checker_breaker_max_delay = int(self.config.get("checker_breaker_max_delay", 300))
+        self.check_workers = int(self.config.get("check_workers", 2))
+        self.check_timeout = int(self.config.get("check_timeout", 300))
+
+        # HTTP client, shared by every upstream request
+        self.http_pool_limit = int(self.config.get("http_pool_limit", 100))
+        self.http_pool_limit_per_host = int(self.config.get("http_pool_limit_per_host", 20))
+        self.http_timeout = float(self.config.get("http_timeout", 30))
+
+        # Persona cache, minutes before a cached nickname and avatar are refreshed in the background
+        self.persona_ttl = int(self.config.get("persona_ttl", 1440))
+
+        # Id resolution cache, minutes an id typed on a command is trusted to resolve to the same steamid64
+        self.resolve_steamid64_ttl = int(self.config.get("resolve_steamid64_ttl", 43200))
+        self.resolve_vanity_ttl = int(self.config.get("resolve_vanity_ttl", 1440))
+
         # XP Tracker
         self.checker_interval = int(self.config["checker_interval"])
+        self.tracker_concurrency = int(self.config.get("tracker_concurrency", 8))
+        self.tracker_max_interval = int(self.config.get("tracker_max_interval", 720))
+        self.tracker_sharding = bool(self.config.get("tracker_sharding", False))
+        self.tracker_heartbeat_timeout = int(self.config.get("tracker_heartbeat_timeout", 90))
+        self.tracker_checkpoint_batch = int(self.config.get("tracker_checkpoint_batch", 50))
         self.discord_tracker_channel_id = int(self.config["discord_tracker_channel_id"])
         self.steam_username = self.config["steam_username"]
         self.steam_password = self.config["steam_password"]
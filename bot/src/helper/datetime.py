@@ -2,11 +2,10 @@ import pytz
 from datetime import datetime, timedelta
 
 class DateTime:
-    def __init__(self):
-        self.timezone = pytz.timezone('Europe/Madrid')
+    # Central European Time (Spain), looked up once for every instance
+    timezone = pytz.timezone('Europe/Madrid')
 
     def get_current_timestamp(self):
-        # Set the timezone to Central European Time (Spain)
         # Get the current time in the specified timezone
         current_time = datetime.now(self.timezone)
         return current_time
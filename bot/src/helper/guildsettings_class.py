@@ -0,0 +1,9 @@
+class GuildSettings:
+    def __init__(self, guild_id, channel_id=None, admin_mode=None, digest=False):
+        self.guild_id = guild_id
+        self.channel_id = channel_id
+        self.admin_mode = admin_mode
+        self.digest = digest
+
+    def is_empty(self):
+        return self.channel_id is None and self.admin_mode is None
@@ -10,13 +10,22 @@ class BotStatus:
         self.datetime_helper = DateTime()
 
         self.sentences = [
-            lambda self: f"Holding {len(self.bot.guilds)} guilds & {sum(guild.member_count for guild in self.bot.guilds)} users.",
-            lambda self: f"Tracking {self.database.get_users_count()} users.",
-            lambda self: f"XP Reset: {self.datetime_helper.time_until_next_wednesday()} remaining. (GMT+2, Madrid, Spain)",
+            self.guilds_sentence,
+            self.tracking_sentence,
+            self.reset_sentence,
         ]
 
         self.status_generator = cycle(self.sentences)
 
+    async def guilds_sentence(self) -> str:
+        return f"Holding {len(self.bot.guilds)} guilds & {sum(guild.member_count for guild in self.bot.guilds)} users."
+
+    async def tracking_sentence(self) -> str:
+        return f"Tracking {await self.database.get_users_count()} users."
+
+    async def reset_sentence(self) -> str:
+        return f"XP Reset: {self.datetime_helper.time_until_next_wednesday()} remaining. (GMT+2, Madrid, Spain)"
+
     async def get_status_message(self) -> str:
         sentence_func = next(self.status_generator)
-        return sentence_func(self)
\ No newline at end of file
+        return await sentence_func()
\ No newline at end of file
@@ -1,5 +1,5 @@
 class TrackedUser:
-    def __init__(self, steam_id, discord_id, guild_id, current_level, current_xp, total_earned, global_earned):
+    def __init__(self, steam_id, discord_id, guild_id, current_level, current_xp, total_earned, global_earned, total_epoch=0):
         self.steam_id = steam_id
         self.discord_id = discord_id
         self.guild_id = guild_id
@@ -7,6 +7,11 @@ class TrackedUser:
         self.current_xp = current_xp
         self.total_earned = total_earned
         self.global_earned = global_earned
+        self.total_epoch = total_epoch
 
     def has_updated(self, new_level, new_xp):
-        return self.current_level != new_level or self.current_xp != new_xp
\ No newline at end of file
+        return self.current_level != new_level or self.current_xp != new_xp
+
+    # The monthly xp only counts if it belongs to the given month epoch, otherwise the month rolled over
+    def get_total_earned(self, epoch):
+        return self.total_earned if self.total_epoch == epoch else 0
\ No newline at end of file
@@ -0,0 +1,138 @@
+import os, csv, io, json, time, sqlite3, asyncio
+from itertools import islice
+from src.util.logger import Logger
+from src.manager.database_manager import DatabaseManager
+
+# Tables moved by the export and import, the rest (history, rollups) can be rebuilt or is disposable
+EXPORT_TABLES = ("tracking", "guilds", "admin_mode")
+export_formats = ("jsonl", "csv")
+
+class BackupManager:
+    def __init__(self, batch_size: int = 1000, backup_pages: int = 256, backup_sleep: float = 0.05):
+        self.logger = Logger()
+        self.database = DatabaseManager()
+        self.batch_size = batch_size
+        self.backup_pages = backup_pages
+        self.backup_sleep = backup_sleep
+
+    # Function to open a separate read only connection, long reads never hold one of the shared readers
+    def open_reader(self):
+        return sqlite3.connect(f"file:{self.database.path}?mode=ro", uri=True, timeout=30)
+
+    # Generator yielding the columns of a table and then every row, fetched batch_size rows at a time
+    def iter_rows(self, connection, table):
+        cursor = connection.execute(f"SELECT * FROM {table}")
+        yield [column[0] for column in cursor.description]
+        while rows := cursor.fetchmany(self.batch_size):
+            yield from rows
+
+    # Generator yielding a table as JSON lines, one object per row
+    def iter_jsonl(self, connection, table):
+        rows = self.iter_rows(connection, table)
+        columns = next(rows)
+        for row in rows:
+            yield json.dumps(dict(zip(columns, row))) + "\n"
+
+    # Generator yielding a table as CSV lines, the first one is the header
+    def iter_csv(self, connection, table):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in self.iter_rows(connection, table):
+            writer.writerow(row)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    # Function to write every exported table to <directory>/<table>.<format>, returns the rows written per table
+    def export_tables(self, directory, format="jsonl"):
+        os.makedirs(directory, exist_ok=True)
+        lines = self.iter_jsonl if format == "jsonl" else self.iter_csv
+        written = {}
+
+        connection = self.open_reader()
+        try:
+            # A single read transaction, every table comes from the same snapshot
+            connection.execute("BEGIN")
+            for table in EXPORT_TABLES:
+                with open(os.path.join(directory, f"{table}.{format}"), "w", newline="") as file:
+                    count = 0
+                    for line in lines(connection, table):
+                        file.write(line)
+                        count += 1
+                written[table] = count - 1 if format == "csv" else count
+        finally:
+            connection.close()
+        return written
+
+    # Generator reading the rows of an exported table back, yields the columns first
+    @staticmethod
+    def iter_file(path, format="jsonl"):
+        with open(path, "r", newline="") as file:
+            if format == "csv":
+                yield from csv.reader(file)
+                return
+
+            columns = None
+            for line in file:
+                if not line.strip():
+                    continue
+                row = json.loads(line)
+                if columns is None:
+                    columns = list(row)
+                    yield columns
+                yield [row.get(column) for column in columns]
+
+    # Function to load the files of an export in a single transaction, everything or nothing gets imported
+    def import_tables(self, connection, directory, format="jsonl", replace=False):
+        imported = {}
+        with connection:
+            for table in EXPORT_TABLES:
+                path = os.path.join(directory, f"{table}.{format}")
+                if not os.path.isfile(path):
+                    continue
+
+                rows = self.iter_file(path, format)
+                columns = next(rows, None)
+                if columns is None:
+                    imported[table] = 0
+                    continue
+
+                # The column names come from the file, only accept the ones the table has
+                known = {row[1] for row in connection.execute(f"PRAGMA table_info({table})")}
+                if not set(columns) <= known:
+                    raise ValueError(f"Unknown columns for {table}: {', '.join(sorted(set(columns) - known))}")
+
+                if replace:
+                    connection.execute(f"DELETE FROM {table}")
+
+                query = f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+                count = 0
+                while batch := list(islice(rows, self.batch_size)):
+                    connection.executemany(query, batch)
+                    count += len(batch)
+                imported[table] = count
+        return imported
+
+    # Function to copy the live database with the online backup API, backup_pages pages per step so writers get in between
+    def backup_database(self, destination):
+        os.makedirs(os.path.dirname(destination) or ".", exist_ok=True)
+        source = self.open_reader()
+        target = sqlite3.connect(destination)
+        try:
+            source.backup(target, pages=self.backup_pages, sleep=self.backup_sleep)
+        finally:
+            target.close()
+            source.close()
+        return destination
+
+    # Async wrappers for the bot, the export and the backup run on their own thread and connection
+    async def export_files(self, directory, format="jsonl"):
+        return await asyncio.to_thread(self.export_tables, directory, format)
+
+    async def backup(self, destination=None):
+        destination = destination or f"src/database/backups/tracker-{time.strftime('%Y%m%d-%H%M%S')}.sqlite"
+        return await asyncio.to_thread(self.backup_database, destination)
+
+    # The import runs on the writer so it is serialized with every other write
+    async def import_files(self, directory, format="jsonl", replace=False):
+        return await self.database.with_connection(lambda connection: self.import_tables(connection, directory, format, replace))
@@ -0,0 +1,38 @@
+import time
+from src.manager.database_manager import DatabaseManager
+
+class CheckpointManager:
+    # Position of the tracking cycle of each tracker process and when each user was last polled.
+    # The tracker saves them every few users, after a restart it resumes the cycle instead of starting over
+    def __init__(self):
+        self.database = DatabaseManager()
+
+    # Function to get the (cycle_id, steam_id) a process saved last, steam_id is None if that cycle was completed
+    async def load(self, worker_id):
+        row = await self.database.fetchone("SELECT cycle_id, steam_id FROM tracker_checkpoints WHERE worker_id = ?", (worker_id,))
+        return (row[0], row[1]) if row else (0, None)
+
+    # Function to save the position of a process and the (steam_id, polled_at) of the users polled since the last save, in a single transaction
+    async def save(self, worker_id, cycle_id, steam_id, polled):
+        def save(connection):
+            connection.executemany("INSERT OR REPLACE INTO tracker_polls (steam_id, polled_at) VALUES (?, ?)", polled)
+            connection.execute("INSERT OR REPLACE INTO tracker_checkpoints (worker_id, cycle_id, steam_id, updated_at) VALUES (?, ?, ?, ?)", (worker_id, cycle_id, steam_id, int(time.time())))
+
+        await self.database.transaction(save)
+
+    # Function to get when every user was last polled, steam_id -> timestamp
+    async def get_polled_at(self):
+        return dict(await self.database.fetchall("SELECT steam_id, polled_at FROM tracker_polls"))
+
+    # Function to get the saved position of every process, a list of (worker_id, cycle_id, steam_id, updated_at)
+    async def get_checkpoints(self):
+        return await self.database.fetchall("SELECT worker_id, cycle_id, steam_id, updated_at FROM tracker_checkpoints ORDER BY worker_id")
+
+    # Function to count the tracked users nobody polled since before the given timestamp, returns
+    # (tracked users, never polled, polled before, oldest poll)
+    async def get_starvation(self, before):
+        row = await self.database.fetchone('''
+            SELECT COUNT(*), COUNT(*) - COUNT(tracker_polls.polled_at), COUNT(CASE WHEN tracker_polls.polled_at < ? THEN 1 END), MIN(tracker_polls.polled_at)
+            FROM tracking LEFT JOIN tracker_polls ON tracker_polls.steam_id = tracking.steam_id
+        ''', (before,))
+        return tuple(row)
@@ -0,0 +1,137 @@
+import asyncio, sqlite3, threading
+from src.util.logger import Logger
+from concurrent.futures import ThreadPoolExecutor
+
+class DatabaseManager:
+    # Shared instances, one per database file
+    instances = {}
+
+    def __new__(cls, path: str = "src/database/tracker.sqlite", readers: int = 4):
+        instance = cls.instances.get(path)
+        if instance is None:
+            instance = super().__new__(cls)
+            instance.path = path
+            instance.logger = Logger()
+            instance.local = threading.local()
+            instance.connections = []
+            instance.connections_lock = threading.Lock()
+
+            # A single writer thread serializes every write, readers run in parallel thanks to WAL
+            instance.writer_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+            instance.reader_pool = ThreadPoolExecutor(max_workers=readers, thread_name_prefix="db-reader")
+            cls.instances[path] = instance
+        return instance
+
+    # Function to get (or open) the connection owned by the current worker thread
+    def connect(self):
+        connection = getattr(self.local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self.local.connection = connection
+            with self.connections_lock:
+                self.connections.append(connection)
+        return connection
+
+    # Function to run a blocking function on the given pool without blocking the event loop
+    async def run(self, pool, function, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(pool, function, *args)
+
+    def write(self, query, params):
+        connection = self.connect()
+        with connection:
+            return connection.execute(query, params).rowcount
+
+    def write_many(self, query, rows):
+        connection = self.connect()
+        with connection:
+            return connection.executemany(query, rows).rowcount
+
+    def write_script(self, script):
+        connection = self.connect()
+        with connection:
+            connection.executescript(script)
+
+    def write_transaction(self, function):
+        connection = self.connect()
+        with connection:
+            return function(connection)
+
+    def call(self, function):
+        return function(self.connect())
+
+    def write_migrations(self, migrations):
+        connection = self.connect()
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        applied = []
+        for target, script in migrations:
+            if target <= version:
+                continue
+            try:
+                connection.executescript(f"BEGIN; {script}; PRAGMA user_version = {int(target)}; COMMIT;")
+            except sqlite3.Error:
+                if connection.in_transaction:
+                    connection.execute("ROLLBACK")
+                raise
+            applied.append(target)
+        return applied
+
+    def read_one(self, query, params):
+        return self.connect().execute(query, params).fetchone()
+
+    def read_all(self, query, params):
+        return self.connect().execute(query, params).fetchall()
+
+    # Function to run a write query, returns the affected row count
+    async def execute(self, query: str, params: tuple = ()):
+        return await self.run(self.writer_pool, self.write, query, params)
+
+    # Function to run a write query for every row in a single transaction
+    async def executemany(self, query: str, rows: list):
+        return await self.run(self.writer_pool, self.write_many, query, rows)
+
+    # Function to run a sql script (used for schema creation)
+    async def executescript(self, script: str):
+        return await self.run(self.writer_pool, self.write_script, script)
+
+    # Function to run a function that receives the write connection inside a single transaction
+    async def transaction(self, function):
+        return await self.run(self.writer_pool, self.write_transaction, function)
+
+    # Function to run a function that receives the write connection without opening a transaction (ATTACH, backups...)
+    async def with_connection(self, function):
+        return await self.run(self.writer_pool, self.call, function)
+
+    # Function to apply every (version, script) migration newer than the database user_version, returns the applied versions
+    async def migrate(self, migrations: list):
+        return await self.run(self.writer_pool, self.write_migrations, migrations)
+
+    # Function to fetch a single row
+    async def fetchone(self, query: str, params: tuple = ()):
+        return await self.run(self.reader_pool, self.read_one, query, params)
+
+    # Function to fetch every row
+    async def fetchall(self, query: str, params: tuple = ()):
+        return await self.run(self.reader_pool, self.read_all, query, params)
+
+    def shutdown(self):
+        self.writer_pool.shutdown(wait=True)
+        self.reader_pool.shutdown(wait=True)
+        with self.connections_lock:
+            for connection in self.connections:
+                connection.close()
+            self.connections.clear()
+
+    # Function to wait for pending queries and close every connection
+    async def close(self):
+        DatabaseManager.instances.pop(self.path, None)
+        await asyncio.get_running_loop().run_in_executor(None, self.shutdown)
+        self.logger.log("INFO", f"Closed database {self.path}.")
+
+    # Function to close every shared database
+    @classmethod
+    async def close_all(cls):
+        for database in list(cls.instances.values()):
+            await database.close()
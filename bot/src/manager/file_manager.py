@@ -28,6 +28,8 @@ leaderboard_embed_channel_id:
 leaderboard_embed_message_id: 
 # Discord user timeout after order (in seconds)
 user_timeout: 300
+# Keep the command cooldowns across restarts (true/false)
+rate_limit_snapshot: true
 # Discord update embeds delay (in seconds)
 update_embeds_delay: 
 # Medals output image directory (Ex: /root/cs-tracker-api/src/data/medals/output)
@@ -71,9 +73,46 @@ faceit_emoji_id:
 # Faceit api key
 faceit_api_key: 
 
+# Checker API
+# Checker API base url (Ex: http://127.0.0.1:8085 to test against standin_api.py)
+checker_api_url: https://checker.kwayservices.top
+# Failed requests in a row before the bot stops calling the checker API, and longest wait (in seconds) between the retries
+checker_breaker_threshold: 5
+checker_breaker_max_delay: 300
+# How many /check orders are checked at the same time
+check_workers: 2
+# Seconds /check waits for its order before giving up on it
+check_timeout: 300
+
+# HTTP client
+# Most open connections, in total and to the same host
+http_pool_limit: 100
+http_pool_limit_per_host: 20
+# Seconds before an upstream request is given up
+http_timeout: 30
+
+# Persona cache
+# Minutes before a cached steam nickname and avatar are refreshed (they are still shown while it refreshes)
+persona_ttl: 1440
+
+# Id resolution cache
+# Minutes a steamid64 / a vanity name typed on a command is trusted to resolve to the same steamid64
+resolve_steamid64_ttl: 43200
+resolve_vanity_ttl: 1440
+
 # XP Tracker
 # XP Tracker interval (in minutes) (recommended: 6-7)
 checker_interval: 452
+# How many users the tracker checks at the same time
+tracker_concurrency: 8
+# Longest time (in minutes) between checks of a user whose xp hasn't changed
+tracker_max_interval: 720
+# Split the tracked users between the bot and the tracker workers (python worker.py), they share the database
+tracker_sharding: false
+# Seconds without a heartbeat before a tracker worker is considered gone and its users move to the others
+tracker_heartbeat_timeout: 90
+# Users checked between the saves of the tracking cycle position, a restart resumes the cycle from the last save
+tracker_checkpoint_batch: 50
 # Discord channel id where the bot will send the xp tracker messages
 discord_tracker_channel_id: 
 # Steam credentials
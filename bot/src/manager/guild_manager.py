@@ -1,93 +1,102 @@
 import sqlite3
 from src.helper.config import Config
+from src.manager.database_manager import DatabaseManager
+from src.manager.guild_settings_manager import GuildSettingsManager
 
 class GuildManager:
     def __init__(self):
         self.config = Config()
-        self.connection = sqlite3.connect('src/database/tracker_channels.sqlite')
+        self.database = DatabaseManager()
+        self.settings = GuildSettingsManager()
 
-        # Create table if it doesn't exist
-        self.create_table()
+    # Function to create the table if it doesn't exist
+    async def create_table(self):
+        await self.database.executescript('''
+            CREATE TABLE IF NOT EXISTS guilds (
+                guild_id BIGINT PRIMARY KEY NOT NULL,
+                channel_id BIGINT NOT NULL
+            );
+        ''')
 
-    def __del__(self):
-        if self.connection:
-            self.connection.close()
+    async def get_guild(self, guild_id):
+        if self.settings.loaded:
+            channel_id = self.settings.get_channel(guild_id)
+            return (guild_id, channel_id) if channel_id is not None else None
+        return await self.database.fetchone('''
+            SELECT guild_id, channel_id FROM guilds WHERE guild_id = ?
+        ''', (guild_id,))
 
-    def create_table(self):
-        with self.connection:
-            self.connection.execute('''
-                CREATE TABLE IF NOT EXISTS tracking (
-                    guild_id BIGINT PRIMARY KEY NOT NULL,
-                    channel_id BIGINT NOT NULL
-                );
-            ''')
-
-    def get_guild(self, guild_id):
-        with self.connection:
-            cursor = self.connection.cursor()
-            cursor.execute('''
-                SELECT * FROM tracking WHERE guild_id = ?
-            ''', (guild_id,))
-            return cursor.fetchone()
-    
-    def add_guild(self, guild_id, channel_id):
+    async def add_guild(self, guild_id, channel_id):
         try:
-            with self.connection:
-                self.connection.execute('''
-                    INSERT INTO tracking VALUES (?, ?)
-                ''', (guild_id, channel_id))
-                self.connection.commit()
+            await self.database.execute('''
+                INSERT INTO guilds (guild_id, channel_id) VALUES (?, ?)
+            ''', (guild_id, channel_id))
+            self.settings.update(guild_id, channel_id=channel_id, digest=False)
             return True
         except sqlite3.Error:
             return False
 
-    def remove_guild(self, guild_id):
+    async def remove_guild(self, guild_id):
         try:
-            with self.connection:
-                self.connection.execute('''
-                    DELETE FROM tracking WHERE guild_id = ?
-                ''', (guild_id,))
-                self.connection.commit()
+            await self.database.execute('''
+                DELETE FROM guilds WHERE guild_id = ?
+            ''', (guild_id,))
+            self.settings.update(guild_id, channel_id=None, digest=False)
             return True
         except sqlite3.Error:
             return False
 
-    def update_guild(self, guild_id, channel_id):
+    async def update_guild(self, guild_id, channel_id):
         try:
-            with self.connection:
-                self.connection.execute('''
-                    UPDATE tracking SET channel_id = ? WHERE guild_id = ?
-                ''', (channel_id, guild_id))
-                self.connection.commit()
+            await self.database.execute('''
+                UPDATE guilds SET channel_id = ? WHERE guild_id = ?
+            ''', (channel_id, guild_id))
+            self.settings.update(guild_id, channel_id=channel_id)
             return True
         except sqlite3.Error:
             return False
 
-    def guild_exists(self, guild_id):
-        with self.connection:
-            cursor = self.connection.cursor()
-            cursor.execute('''
-                SELECT * FROM tracking WHERE guild_id = ?
-            ''', (guild_id,))
-            return cursor.fetchone() is not None
+    async def set_digest(self, guild_id, enabled):
+        try:
+            updated = await self.database.execute('''
+                UPDATE guilds SET digest = ? WHERE guild_id = ?
+            ''', (int(enabled), guild_id))
+            if updated:
+                self.settings.update(guild_id, digest=bool(enabled))
+            return updated > 0
+        except sqlite3.Error:
+            return False
+
+    async def get_digest(self, guild_id):
+        if self.settings.loaded:
+            return self.settings.get_digest(guild_id)
+        result = await self.database.fetchone('''
+            SELECT digest FROM guilds WHERE guild_id = ?
+        ''', (guild_id,))
+        return bool(result[0]) if result else False
+
+    async def guild_exists(self, guild_id):
+        if self.settings.loaded:
+            return self.settings.get_channel(guild_id) is not None
+        row = await self.database.fetchone('''
+            SELECT * FROM guilds WHERE guild_id = ?
+        ''', (guild_id,))
+        return row is not None
 
     async def get_channel_by_guild(self, guild_id):
-        with self.connection:
-            cursor = self.connection.cursor()
-            cursor.execute('''
-                SELECT channel_id FROM tracking WHERE guild_id = ?
-            ''', (guild_id,))
-            result = cursor.fetchone()
-            return int(result[0])
-        
-    def clean_guilds(self, bot):
+        if self.settings.loaded:
+            return int(self.settings.get_channel(guild_id))
+        result = await self.database.fetchone('''
+            SELECT channel_id FROM guilds WHERE guild_id = ?
+        ''', (guild_id,))
+        return int(result[0])
+
+    async def clean_guilds(self, bot):
         bot_guild_ids = [guild.id for guild in bot.guilds]
-        with self.connection:
-            cursor = self.connection.cursor()
-            cursor.execute('''
-                SELECT guild_id FROM tracking
-            ''')
-            db_guild_ids = [row[0] for row in cursor.fetchall()]
-            for db_guild_id in db_guild_ids:
-                if db_guild_id not in bot_guild_ids:
-                    self.remove_guild(db_guild_id)
+        rows = await self.database.fetchall('''
+            SELECT guild_id FROM guilds
+        ''')
+        db_guild_ids = [row[0] for row in rows]
+        for db_guild_id in db_guild_ids:
+            if db_guild_id not in bot_guild_ids:
+                await self.remove_guild(db_guild_id)
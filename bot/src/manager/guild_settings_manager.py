@@ -0,0 +1,54 @@
+from src.helper.guildsettings_class import GuildSettings
+from src.manager.database_manager import DatabaseManager
+
+class GuildSettingsManager:
+    # Shared instance, the guild and admin mode managers keep it in sync with the database
+    instance = None
+
+    def __new__(cls):
+        if cls.instance is None:
+            instance = super().__new__(cls)
+            instance.database = DatabaseManager()
+            instance.guilds = {}
+            instance.loaded = False
+            cls.instance = instance
+        return cls.instance
+
+    # Function to load the settings of every guild into memory, called once at startup
+    async def load(self):
+        guilds = {}
+        for guild_id, channel_id, digest in await self.database.fetchall("SELECT guild_id, channel_id, digest FROM guilds"):
+            guilds[int(guild_id)] = GuildSettings(int(guild_id), channel_id=int(channel_id), digest=bool(digest))
+        for guild_id, status in await self.database.fetchall("SELECT guild_id, status FROM admin_mode"):
+            guilds.setdefault(int(guild_id), GuildSettings(int(guild_id))).admin_mode = bool(status)
+
+        self.guilds = guilds
+        self.loaded = True
+        return len(self.guilds)
+
+    def get(self, guild_id):
+        return self.guilds.get(int(guild_id))
+
+    def get_channel(self, guild_id):
+        settings = self.get(guild_id)
+        return settings.channel_id if settings is not None else None
+
+    def get_admin_mode(self, guild_id):
+        settings = self.get(guild_id)
+        return settings.admin_mode if settings is not None else None
+
+    def get_digest(self, guild_id):
+        settings = self.get(guild_id)
+        return settings.digest if settings is not None else False
+
+    # Function to get the tracker channel of every guild that has one
+    def get_channels(self):
+        return {guild_id: settings.channel_id for guild_id, settings in self.guilds.items() if settings.channel_id is not None}
+
+    # Function to change some settings of a guild, e.g. update(guild_id, channel_id=123). Guilds left without settings are dropped
+    def update(self, guild_id, **fields):
+        settings = self.guilds.setdefault(int(guild_id), GuildSettings(int(guild_id)))
+        for name, value in fields.items():
+            setattr(settings, name, value)
+        if settings.is_empty():
+            del self.guilds[int(guild_id)]
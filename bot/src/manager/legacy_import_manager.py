@@ -0,0 +1,66 @@
+import os, sqlite3
+from src.util.logger import Logger
+from src.manager.xp_manager import XpManager
+from src.manager.database_manager import DatabaseManager
+
+# Old per-manager database files and the (legacy table, new table) pairs they hold
+legacy_databases = {
+    "src/database/tracked_users.sqlite": [
+        ("tracking", "tracking"),
+        ("xp_history", "xp_history"),
+        ("xp_hourly", "xp_hourly"),
+        ("xp_daily", "xp_daily"),
+        ("xp_rollup_state", "xp_rollup_state"),
+    ],
+    "src/database/tracker_channels.sqlite": [("tracking", "guilds")],
+    "src/database/admin_mode.sqlite": [("admin_mode", "admin_mode")],
+}
+
+class LegacyImportManager:
+    def __init__(self):
+        self.logger = Logger()
+        self.database = DatabaseManager()
+
+    # Function to copy a legacy table, columns the legacy table lacks take the given defaults
+    @staticmethod
+    def copy_table(connection, source, target, defaults):
+        if connection.execute("SELECT 1 FROM legacy.sqlite_master WHERE type = 'table' AND name = ?", (source,)).fetchone() is None:
+            return 0
+
+        # Only copy the columns both tables share, the legacy rows win over freshly created defaults
+        target_columns = [row[1] for row in connection.execute(f"PRAGMA main.table_info({target})")]
+        source_columns = [row[1] for row in connection.execute(f"PRAGMA legacy.table_info({source})") if row[1] in target_columns]
+        missing = {column: value for column, value in defaults.items() if column in target_columns and column not in source_columns}
+
+        columns = ", ".join(f'"{column}"' for column in source_columns + list(missing))
+        values = ", ".join([f'"{column}"' for column in source_columns] + ["?"] * len(missing))
+        return connection.execute(f"INSERT OR REPLACE INTO main.{target} ({columns}) SELECT {values} FROM legacy.{source}", tuple(missing.values())).rowcount
+
+    def import_file(self, connection, path, tables):
+        # Monthly totals from before the epoch column belong to the running month
+        defaults = {"total_epoch": XpManager.get_current_epoch()}
+
+        connection.execute("ATTACH DATABASE ? AS legacy", (path,))
+        try:
+            with connection:
+                return sum(self.copy_table(connection, source, target, defaults) for source, target in tables)
+        finally:
+            connection.execute("DETACH DATABASE legacy")
+
+    # Function to import the old per-manager database files into the shared database, once
+    async def import_legacy_databases(self):
+        for path, tables in legacy_databases.items():
+            if not os.path.isfile(path):
+                continue
+
+            try:
+                rows = await self.database.with_connection(lambda connection: self.import_file(connection, path, tables))
+            except sqlite3.Error as e:
+                self.logger.log("ERROR", f"Error importing legacy database {path}: {e}")
+                continue
+
+            # Keep the old files around, renamed so they are never imported twice
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.isfile(path + suffix):
+                    os.replace(path + suffix, f"{path}.imported{suffix}")
+            self.logger.log("INFO", f"Imported {rows} rows from legacy database {path}.")
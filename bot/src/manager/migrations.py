@@ -0,0 +1,110 @@
+# Schema migrations, applied in order and tracked with PRAGMA user_version.
+# Never edit a released migration, append a new (version, script) entry instead.
+migrations = [
+    # Indexes for the per guild counts, the ownership checks and the leaderboard (covering, no table sort)
+    (1, '''
+        CREATE INDEX IF NOT EXISTS tracking_guild_id ON tracking (guild_id);
+        CREATE INDEX IF NOT EXISTS tracking_discord_id ON tracking (discord_id, steam_id);
+        CREATE INDEX IF NOT EXISTS tracking_total_earned ON tracking (total_earned DESC, steam_id, global_earned)
+    '''),
+    # Append-only xp history with hourly and daily rollups, the watermarks tell up to where each rollup is complete
+    (2, '''
+        CREATE TABLE IF NOT EXISTS xp_history (
+            steam_id BIGINT NOT NULL,
+            timestamp INTEGER NOT NULL,
+            level INTEGER NOT NULL,
+            xp INTEGER NOT NULL,
+            earned INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS xp_history_timestamp ON xp_history (timestamp);
+        CREATE INDEX IF NOT EXISTS xp_history_steam_id ON xp_history (steam_id, timestamp);
+        CREATE TABLE IF NOT EXISTS xp_hourly (
+            steam_id BIGINT NOT NULL,
+            hour INTEGER NOT NULL,
+            level INTEGER NOT NULL,
+            xp INTEGER NOT NULL,
+            earned INTEGER NOT NULL,
+            PRIMARY KEY (steam_id, hour)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS xp_hourly_hour ON xp_hourly (hour);
+        CREATE TABLE IF NOT EXISTS xp_daily (
+            steam_id BIGINT NOT NULL,
+            day INTEGER NOT NULL,
+            level INTEGER NOT NULL,
+            xp INTEGER NOT NULL,
+            earned INTEGER NOT NULL,
+            PRIMARY KEY (steam_id, day)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS xp_daily_day ON xp_daily (day);
+        CREATE TABLE IF NOT EXISTS xp_rollup_state (
+            name TEXT NOT NULL PRIMARY KEY,
+            watermark INTEGER NOT NULL
+        )
+    '''),
+    # Month epoch (year * 12 + month - 1) the total_earned of each row belongs to, a stale epoch reads as 0.
+    # Existing totals belong to the running month, the leaderboard index now filters by epoch first
+    (3, '''
+        ALTER TABLE tracking ADD COLUMN total_epoch INTEGER NOT NULL DEFAULT 0;
+        UPDATE tracking SET total_epoch = CAST(strftime('%Y', 'now', 'localtime') AS INTEGER) * 12 + CAST(strftime('%m', 'now', 'localtime') AS INTEGER) - 1;
+        DROP INDEX IF EXISTS tracking_total_earned;
+        CREATE INDEX IF NOT EXISTS tracking_total_epoch ON tracking (total_epoch, total_earned DESC, steam_id, global_earned);
+        DROP TABLE IF EXISTS reset_month_table
+    '''),
+    # The command cooldowns moved to the in-memory rate limiter
+    (4, '''
+        DROP TABLE IF EXISTS timeout_db
+    '''),
+    # Nicknames and avatars of the resolved steamid64s, backs the in-memory persona cache
+    (5, '''
+        CREATE TABLE IF NOT EXISTS personas (
+            steam_id BIGINT NOT NULL PRIMARY KEY,
+            nickname TEXT,
+            avatar TEXT,
+            updated_at INTEGER NOT NULL
+        ) WITHOUT ROWID
+    '''),
+    # What the ids typed on the commands (normalized steamid64 or vanity name) resolved to
+    (6, '''
+        CREATE TABLE IF NOT EXISTS resolved_ids (
+            input TEXT NOT NULL PRIMARY KEY,
+            steam_id BIGINT NOT NULL,
+            resolved_at INTEGER NOT NULL
+        ) WITHOUT ROWID
+    '''),
+    # Tracker processes that are alive (sharding), and the notifications the workers leave for the bot to deliver
+    (7, '''
+        CREATE TABLE IF NOT EXISTS tracker_workers (
+            worker_id TEXT NOT NULL PRIMARY KEY,
+            heartbeat INTEGER NOT NULL
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS tracker_outbox (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            payload TEXT NOT NULL,
+            created_at INTEGER NOT NULL
+        )
+    '''),
+    # Guilds that get one summary per tracking cycle instead of one card per xp change.
+    # The migrations run before the guild manager creates its table, a fresh database doesn't have it yet
+    (8, '''
+        CREATE TABLE IF NOT EXISTS guilds (
+            guild_id BIGINT PRIMARY KEY NOT NULL,
+            channel_id BIGINT NOT NULL
+        );
+        ALTER TABLE guilds ADD COLUMN digest INTEGER NOT NULL DEFAULT 0
+    '''),
+    # Where the tracking cycle of each tracker process is (the steam_id every user up to has been polled, NULL once the
+    # cycle is complete) and when each user was last polled. Kept off the tracking table, its rows are read with SELECT *
+    (9, '''
+        CREATE TABLE IF NOT EXISTS tracker_checkpoints (
+            worker_id TEXT NOT NULL PRIMARY KEY,
+            cycle_id INTEGER NOT NULL,
+            steam_id BIGINT,
+            updated_at INTEGER NOT NULL
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS tracker_polls (
+            steam_id BIGINT NOT NULL PRIMARY KEY,
+            polled_at INTEGER NOT NULL
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS tracker_polls_polled_at ON tracker_polls (polled_at)
+    '''),
+]
@@ -0,0 +1,25 @@
+import json, time
+from src.manager.database_manager import DatabaseManager
+
+class OutboxManager:
+    # Notifications the tracker workers can't send themselves (no Discord connection), the bot delivers them
+    def __init__(self):
+        self.database = DatabaseManager()
+
+    # Function to queue a notification
+    async def push(self, payload: dict):
+        await self.database.execute("INSERT INTO tracker_outbox (payload, created_at) VALUES (?, ?)", (json.dumps(payload), int(time.time())))
+
+    # Function to queue several notifications in a single transaction
+    async def push_many(self, payloads):
+        now = int(time.time())
+        await self.database.executemany("INSERT INTO tracker_outbox (payload, created_at) VALUES (?, ?)", [(json.dumps(payload), now) for payload in payloads])
+
+    # Function to get the oldest queued notifications, returns a list of (id, payload)
+    async def fetch(self, limit: int = 100):
+        rows = await self.database.fetchall("SELECT id, payload FROM tracker_outbox ORDER BY id LIMIT ?", (limit,))
+        return [(id, json.loads(payload)) for id, payload in rows]
+
+    # Function to remove the delivered notifications
+    async def delete(self, ids):
+        await self.database.executemany("DELETE FROM tracker_outbox WHERE id = ?", [(id,) for id in ids])
@@ -0,0 +1,63 @@
+import time, asyncio
+from src.util.logger import Logger
+from src.helper.config import Config
+from src.util.ttl_cache import TTLCache
+from src.manager.database_manager import DatabaseManager
+
+class PersonaManager:
+    # Shared instance, nicknames and avatars by steamid64.
+    # Hot entries stay in memory (LRU), every entry is also kept on the personas table so the cache survives a restart.
+    # An entry older than persona_ttl is still served, it's refreshed in the background (stale-while-revalidate)
+    instance = None
+
+    def __new__(cls, maxsize: int = 5000):
+        if cls.instance is None:
+            instance = super().__new__(cls)
+            instance.config = Config()
+            instance.logger = Logger()
+            instance.database = DatabaseManager()
+            instance.cache = TTLCache(maxsize, instance.config.persona_ttl * 60)
+            instance.refreshing = set()
+            cls.instance = instance
+        return cls.instance
+
+    # Function to get the persona of a steamid64, returns (nickname, avatar, stale) or None if it isn't cached
+    async def get(self, steamid64):
+        steamid64 = int(steamid64)
+        entry = self.cache.peek(steamid64)
+        if entry is None:
+            row = await self.database.fetchone("SELECT nickname, avatar, updated_at FROM personas WHERE steam_id = ?", (steamid64,))
+            if row is None:
+                return None
+            self.cache.set(steamid64, (row[0], row[1]), stored_at=row[2])
+            entry = self.cache.peek(steamid64)
+
+        (nickname, avatar), age = entry
+        return nickname, avatar, age > self.cache.ttl
+
+    # Function to store a freshly fetched persona
+    async def store(self, steamid64, nickname, avatar):
+        steamid64 = int(steamid64)
+        now = int(time.time())
+        self.cache.set(steamid64, (nickname, avatar), stored_at=now)
+        await self.database.execute(
+            "INSERT OR REPLACE INTO personas (steam_id, nickname, avatar, updated_at) VALUES (?, ?, ?, ?)",
+            (steamid64, nickname, avatar, now),
+        )
+
+    # Function to refresh a stale persona in the background, fetch is awaited with the steamid64 and stores the result itself
+    def revalidate(self, steamid64, fetch):
+        steamid64 = int(steamid64)
+        if steamid64 in self.refreshing:
+            return
+        self.refreshing.add(steamid64)
+
+        async def refresh():
+            try:
+                await fetch(str(steamid64))
+            except Exception as e:
+                self.logger.log("WARNING", f"Couldn't refresh persona of {steamid64}: {e}")
+            finally:
+                self.refreshing.discard(steamid64)
+
+        asyncio.create_task(refresh())
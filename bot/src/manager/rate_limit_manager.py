@@ -0,0 +1,122 @@
+import os, json, time
+from collections import deque
+from discord import app_commands, Interaction
+from src.util.logger import Logger
+
+# Raised by the rate_limit check, retry_after is how many seconds the user has to wait
+class RateLimited(app_commands.CheckFailure):
+    def __init__(self, command, retry_after):
+        self.command = command
+        self.retry_after = retry_after
+        minutes, seconds = divmod(retry_after, 60)
+        super().__init__(f"You are being rate limited on {command}, try again in {int(minutes)} minutes and {int(seconds)} seconds.")
+
+class RateLimitManager:
+    # Shared instance, every command checks against the same windows
+    instance = None
+
+    def __new__(cls, path: str = "src/database/rate_limits.json"):
+        if cls.instance is None:
+            instance = super().__new__(cls)
+            instance.logger = Logger()
+            instance.path = path
+            instance.windows = {}  # (command, user_id) -> (per, deque of hit timestamps)
+            cls.instance = instance
+        return cls.instance
+
+    # Function to get the seconds a user has to wait on a sliding window of rate hits every per seconds, 0 if allowed
+    def get_retry_after(self, command, user_id, rate, per):
+        now = time.time()
+        _, hits = self.windows.setdefault((command, user_id), (per, deque()))
+        while hits and hits[0] <= now - per:
+            hits.popleft()
+
+        if len(hits) >= rate:
+            return hits[0] + per - now
+        return 0
+
+    # Function to register a hit on the window, returns 0 if allowed or the seconds to wait (the hit isn't registered then)
+    def hit(self, command, user_id, rate, per):
+        retry_after = self.get_retry_after(command, user_id, rate, per)
+        if not retry_after:
+            self.windows[(command, user_id)][1].append(time.time())
+        return retry_after
+
+    # Function to take back the last hit of a user, e.g. when the use it counted failed
+    def undo(self, command, user_id):
+        window = self.windows.get((command, user_id))
+        if window is not None and window[1]:
+            window[1].pop()
+
+    # Function to clear the windows of a user, every command unless one is given. Returns if anything was cleared
+    def reset(self, user_id, command=None):
+        keys = [key for key in self.windows if key[1] == user_id and command in (None, key[0])]
+        for key in keys:
+            del self.windows[key]
+        return len(keys) > 0
+
+    # Function to drop the windows whose hits have all expired, returns how many were dropped
+    def sweep(self):
+        now = time.time()
+        expired = [key for key, (per, hits) in self.windows.items() if not hits or hits[-1] <= now - per]
+        for key in expired:
+            del self.windows[key]
+        return len(expired)
+
+    # Function to write the live windows to disk so the cooldowns survive a restart
+    def save(self):
+        self.sweep()
+        data = [[command, user_id, per, list(hits)] for (command, user_id), (per, hits) in self.windows.items()]
+        try:
+            with open(f"{self.path}.tmp", "w") as file:
+                json.dump(data, file)
+            os.replace(f"{self.path}.tmp", self.path)
+        except OSError as e:
+            self.logger.log("ERROR", f"Error saving rate limits snapshot: {e}")
+
+    # Function to load the windows saved by the last run
+    def load(self):
+        if not os.path.isfile(self.path):
+            return 0
+        try:
+            with open(self.path, "r") as file:
+                data = json.load(file)
+        except (OSError, ValueError) as e:
+            self.logger.log("ERROR", f"Error loading rate limits snapshot: {e}")
+            return 0
+
+        for command, user_id, per, hits in data:
+            self.windows[(command, user_id)] = (per, deque(hits))
+        self.sweep()
+        return len(self.windows)
+
+def bypasses(interaction: Interaction, bypass_admins: bool = True):
+    return bypass_admins and interaction.guild is not None and interaction.user.guild_permissions.administrator
+
+# Check decorator to allow a user rate uses of the command every per seconds, e.g. @rate_limit(1, 300).
+# With record=False it only checks the window, the command calls record_hit once it did what counts as a use
+def rate_limit(rate: int, per: float, key: str = None, bypass_admins: bool = True, record: bool = True):
+    def predicate(interaction: Interaction):
+        if bypasses(interaction, bypass_admins):
+            return True
+
+        command = key or interaction.command.qualified_name
+        manager = RateLimitManager()
+        retry_after = manager.hit(command, interaction.user.id, rate, per) if record else manager.get_retry_after(command, interaction.user.id, rate, per)
+        if retry_after:
+            raise RateLimited(command, retry_after)
+        return True
+
+    return app_commands.check(predicate)
+
+# Function to register the use of a command declared with record=False, returns 0 or the seconds to wait if another
+# use got in since the check
+def record_hit(interaction: Interaction, rate: int, per: float, key: str = None, bypass_admins: bool = True):
+    if bypasses(interaction, bypass_admins):
+        return 0
+    return RateLimitManager().hit(key or interaction.command.qualified_name, interaction.user.id, rate, per)
+
+# Function to take back a use registered with record_hit
+def undo_hit(interaction: Interaction, key: str = None, bypass_admins: bool = True):
+    if not bypasses(interaction, bypass_admins):
+        RateLimitManager().undo(key or interaction.command.qualified_name, interaction.user.id)
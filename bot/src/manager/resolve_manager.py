@@ -0,0 +1,64 @@
+import re, time
+from src.helper.config import Config
+from src.util.ttl_cache import TTLCache
+from src.manager.database_manager import DatabaseManager
+
+profiles_pattern = re.compile(r"steamcommunity\.com/profiles/(\d{17})", re.IGNORECASE)
+vanity_pattern = re.compile(r"steamcommunity\.com/id/([^/?#]+)", re.IGNORECASE)
+
+class ResolveManager:
+    # Shared instance, what steamid64 the ids typed on the commands resolved to.
+    # Kept in memory and on the resolved_ids table, keyed by the normalized id. A steamid64 always resolves to itself
+    # so it's trusted for resolve_steamid64_ttl, a vanity name can be changed or taken by someone else so only for resolve_vanity_ttl
+    instance = None
+
+    def __new__(cls, maxsize: int = 5000):
+        if cls.instance is None:
+            instance = super().__new__(cls)
+            instance.config = Config()
+            instance.database = DatabaseManager()
+            instance.steamid64s = TTLCache(maxsize, instance.config.resolve_steamid64_ttl * 60)
+            instance.vanities = TTLCache(maxsize, instance.config.resolve_vanity_ttl * 60)
+            cls.instance = instance
+        return cls.instance
+
+    # Function to normalize an id, returns a steamid64 or the lowercase vanity name. Both are also valid inputs for the api
+    @staticmethod
+    def normalize(id):
+        text = str(id).strip()
+        match = profiles_pattern.search(text)
+        if match:
+            return match.group(1)
+        match = vanity_pattern.search(text)
+        if match:
+            return match.group(1).lower()
+        return text.rstrip("/").lower()
+
+    @staticmethod
+    def is_steamid64(key):
+        return key.isdigit() and len(key) == 17
+
+    def get_cache(self, key):
+        return self.steamid64s if self.is_steamid64(key) else self.vanities
+
+    # Function to get the steamid64 a normalized id resolved to, None if it's unknown or expired
+    async def get(self, key):
+        cache = self.get_cache(key)
+        steamid64 = cache.get(key)
+        if steamid64 is not None:
+            return steamid64
+
+        row = await self.database.fetchone("SELECT steam_id, resolved_at FROM resolved_ids WHERE input = ?", (key,))
+        if row is None or time.time() - row[1] > cache.ttl:
+            return None
+        cache.set(key, str(row[0]), stored_at=row[1])
+        return str(row[0])
+
+    # Function to remember what a normalized id resolved to
+    async def store(self, key, steamid64):
+        now = int(time.time())
+        self.get_cache(key).set(key, str(steamid64), stored_at=now)
+        await self.database.execute(
+            "INSERT OR REPLACE INTO resolved_ids (input, steam_id, resolved_at) VALUES (?, ?, ?)",
+            (key, int(steamid64), now),
+        )
@@ -0,0 +1,86 @@
+from src.util.logger import Logger
+from src.helper.trackeduser_class import TrackedUser
+from src.manager.database_manager import DatabaseManager
+
+class UserRegistryManager:
+    # Shared instance, every manager reads and updates the same registry
+    instance = None
+
+    def __new__(cls):
+        if cls.instance is None:
+            instance = super().__new__(cls)
+            instance.logger = Logger()
+            instance.database = DatabaseManager()
+            instance.users = {}
+            instance.loaded = False
+            instance.version = 0
+            cls.instance = instance
+        return cls.instance
+
+    # Function to build the TrackedUser objects of every row in the tracking table
+    async def read_users(self):
+        rows = await self.database.fetchall("SELECT * FROM tracking")
+        return {row[0]: TrackedUser(*row) for row in rows}
+
+    # Function to load every tracked user into memory, called once at startup
+    async def load(self):
+        self.users = await self.read_users()
+        self.loaded = True
+        self.version += 1
+        return len(self.users)
+
+    # Function to compare the registry against the database and fix any drift, returns how many users differed
+    async def reconcile(self):
+        version = self.version
+        users = await self.read_users()
+
+        # A mutation landed while reading, the snapshot may be older than the registry so try again next time
+        if version != self.version:
+            return None
+
+        drift = len(self.users.keys() ^ users.keys())
+        drift += sum(1 for steam_id, user in users.items() if steam_id in self.users and vars(self.users[steam_id]) != vars(user))
+        if drift:
+            self.users = users
+            self.version += 1
+        return drift
+
+    def get_users(self):
+        return list(self.users.values())
+
+    # Steam ids come as strings from the api and as integers from the database, the registry always keys by integer
+    @staticmethod
+    def get_key(steam_id):
+        return int(steam_id)
+
+    def get_user(self, steam_id):
+        return self.users.get(self.get_key(steam_id))
+
+    def get_users_count(self):
+        return len(self.users)
+
+    def get_users_count_by_guild_id(self, guild_id):
+        return sum(1 for user in self.users.values() if user.guild_id == guild_id)
+
+    def add_user(self, user: TrackedUser):
+        user = TrackedUser(*vars(user).values())
+        user.steam_id = self.get_key(user.steam_id)
+        self.users[user.steam_id] = user
+        self.version += 1
+
+    def remove_user(self, steam_id):
+        self.users.pop(self.get_key(steam_id), None)
+        self.version += 1
+
+    # Function to change some attributes of a user, e.g. update_user(steam_id, guild_id=123)
+    def update_user(self, steam_id, **fields):
+        user = self.users.get(self.get_key(steam_id))
+        if user is not None:
+            for name, value in fields.items():
+                setattr(user, name, value)
+        self.version += 1
+
+    # Function to apply a written batch, rows are (level, xp, total_earned, global_earned, total_epoch, steam_id)
+    def update_levels(self, rows):
+        for level, xp, total_earned, global_earned, total_epoch, steam_id in rows:
+            self.update_user(steam_id, current_level=level, current_xp=xp, total_earned=total_earned, global_earned=global_earned, total_epoch=total_epoch)
@@ -0,0 +1,75 @@
+import time, asyncio
+from src.util.logger import Logger
+from src.manager.xp_manager import XpManager
+
+class XpBufferManager:
+    # Shared instance, every handler writes to the same buffer
+    instance = None
+
+    def __new__(cls, batch_size: int = 100, max_delay: int = 30):
+        if cls.instance is None:
+            instance = super().__new__(cls)
+            instance.logger = Logger()
+            instance.xp_manager = XpManager()
+            instance.batch_size = batch_size
+            instance.max_delay = max_delay
+            instance.pending = {}
+            instance.pending_history = []
+            instance.oldest_pending = None
+            instance.timer = None
+            instance.lock = asyncio.Lock()
+            cls.instance = instance
+        return cls.instance
+
+    # Function to get how many rows are waiting to be written
+    def get_pending_count(self):
+        return len(self.pending)
+
+    # Function to queue a user update and its history row, flushes when the batch is full or the oldest row is too old.
+    # A timer flushes the rows max_delay seconds after the first one too, in case no other update comes
+    async def add(self, steam_id, new_level, new_xp, total_earned, global_earned, total_epoch, earned_xp):
+        if not self.pending:
+            self.oldest_pending = time.monotonic()
+            self.schedule_flush()
+        self.pending[steam_id] = (new_level, new_xp, total_earned, global_earned, total_epoch, steam_id)
+        self.pending_history.append((steam_id, new_level, new_xp, earned_xp))
+
+        if len(self.pending) >= self.batch_size or time.monotonic() - self.oldest_pending >= self.max_delay:
+            await self.flush()
+
+    def schedule_flush(self):
+        if self.timer is None:
+            self.timer = asyncio.get_running_loop().call_later(self.max_delay, lambda: asyncio.create_task(self.flush()))
+
+    # Function to zero the totals of a pending row when they are reset, or the next flush would write the old ones back
+    def reset_earned(self, steam_id, monthly=False, global_=False):
+        row = self.pending.get(int(steam_id))
+        if row is None:
+            return
+        new_level, new_xp, total_earned, global_earned, total_epoch, steam_id = row
+        self.pending[steam_id] = (new_level, new_xp, 0 if monthly else total_earned, 0 if global_ else global_earned, total_epoch, steam_id)
+
+    # Function to write every pending row in a single transaction
+    async def flush(self):
+        async with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            if not self.pending:
+                return True
+
+            rows, self.pending = self.pending, {}
+            history, self.pending_history = self.pending_history, []
+            self.oldest_pending = None
+
+            if await self.xp_manager.update_users_level_and_xp(list(rows.values()), history):
+                return True
+
+            # Keep the failed rows for the next flush unless a newer value was queued meanwhile
+            for steam_id, row in rows.items():
+                self.pending.setdefault(steam_id, row)
+            self.pending_history = history + self.pending_history
+            self.oldest_pending = time.monotonic()
+            self.schedule_flush()
+            self.logger.log("WARNING", f"Couldn't flush {len(rows)} xp updates, retrying on the next flush.")
+            return False
@@ -0,0 +1,122 @@
+import time, sqlite3
+from src.util.logger import Logger
+from src.manager.database_manager import DatabaseManager
+
+HOUR = 3600
+DAY = 86400
+
+class XpHistoryManager:
+    def __init__(self, raw_retention_days: int = 7, hourly_retention_days: int = 35, daily_retention_days: int = 400, grace_seconds: int = 300):
+        self.logger = Logger()
+        self.database = DatabaseManager()
+        self.raw_retention = raw_retention_days * DAY
+        self.hourly_retention = hourly_retention_days * DAY
+        self.daily_retention = daily_retention_days * DAY
+        # The history rows are stamped when they are written, the grace covers the clock skew between the processes
+        # writing them (bot and tracker workers) and the transactions that started right before the rollup
+        self.grace_seconds = grace_seconds
+
+    @staticmethod
+    def get_watermark(connection, name):
+        row = connection.execute("SELECT watermark FROM xp_rollup_state WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else 0
+
+    @staticmethod
+    def set_watermark(connection, name, watermark):
+        connection.execute("INSERT OR REPLACE INTO xp_rollup_state (name, watermark) VALUES (?, ?)", (name, watermark))
+
+    # Function to roll the raw history into the hourly and daily tables and drop what is past its retention
+    async def rollup(self):
+        now = int(time.time())
+
+        def rollup(connection):
+            # Raw rows -> complete hours (the bare level/xp columns come from the MAX(timestamp) row)
+            hourly_from = self.get_watermark(connection, "hourly")
+            hourly_to = (now - self.grace_seconds) // HOUR * HOUR
+            if hourly_to > hourly_from:
+                connection.execute('''
+                    INSERT OR REPLACE INTO xp_hourly (steam_id, hour, level, xp, earned)
+                    SELECT steam_id, hour, level, xp, earned FROM (
+                        SELECT steam_id, timestamp / 3600 * 3600 AS hour, level, xp, SUM(earned) AS earned, MAX(timestamp)
+                        FROM xp_history WHERE timestamp >= ? AND timestamp < ? GROUP BY steam_id, hour
+                    )
+                ''', (hourly_from, hourly_to))
+                self.set_watermark(connection, "hourly", hourly_to)
+            else:
+                hourly_to = hourly_from
+
+            # Complete hours -> complete days
+            daily_from = self.get_watermark(connection, "daily")
+            daily_to = hourly_to // DAY * DAY
+            if daily_to > daily_from:
+                connection.execute('''
+                    INSERT OR REPLACE INTO xp_daily (steam_id, day, level, xp, earned)
+                    SELECT steam_id, day, level, xp, earned FROM (
+                        SELECT steam_id, hour / 86400 * 86400 AS day, level, xp, SUM(earned) AS earned, MAX(hour)
+                        FROM xp_hourly WHERE hour >= ? AND hour < ? GROUP BY steam_id, day
+                    )
+                ''', (daily_from, daily_to))
+                self.set_watermark(connection, "daily", daily_to)
+            else:
+                daily_to = daily_from
+
+            # Retention, never dropping rows a coarser table doesn't cover yet
+            pruned = connection.execute("DELETE FROM xp_history WHERE timestamp < ?", (min(now - self.raw_retention, hourly_to),)).rowcount
+            pruned += connection.execute("DELETE FROM xp_hourly WHERE hour < ?", (min(now - self.hourly_retention, daily_to),)).rowcount
+            pruned += connection.execute("DELETE FROM xp_daily WHERE day < ?", (now - self.daily_retention,)).rowcount
+            return hourly_to, daily_to, pruned
+
+        try:
+            return await self.database.transaction(rollup)
+        except sqlite3.Error as e:
+            self.logger.log("ERROR", f"Error rolling up xp history: {e}")
+            return None
+
+    # Function to get the (hourly, daily) rollup watermarks
+    async def get_watermarks(self):
+        rows = dict(await self.database.fetchall("SELECT name, watermark FROM xp_rollup_state"))
+        return rows.get("hourly", 0), rows.get("daily", 0)
+
+    # Function to build the tiered query bounds of the range starting at since (a unix timestamp, not rounded):
+    # the days that are complete after since come from the daily rows, the rest of the complete hours after since from the
+    # hourly rows and what's left (the first partial hour and what isn't rolled up yet) from the raw rows
+    async def get_range_bounds(self, since):
+        hourly_watermark, daily_watermark = await self.get_watermarks()
+        since_day = -(-since // DAY) * DAY
+        since_hour = -(-since // HOUR) * HOUR
+        return (
+            since_day, daily_watermark,  # daily: day >= ? AND day < ?
+            since_hour, hourly_watermark, since_day, daily_watermark,  # hourly: hour >= ? AND hour < ? AND NOT (hour >= ? AND hour < ?)
+            since, min(since_hour, hourly_watermark), max(since, hourly_watermark),  # raw: timestamp >= ? AND (timestamp < ? OR timestamp >= ?)
+        )
+
+    # Function to get how much xp a user earned since the given unix timestamp
+    async def get_earned_since(self, steam_id, since):
+        bounds = await self.get_range_bounds(since)
+        row = await self.database.fetchone('''
+            SELECT
+                (SELECT COALESCE(SUM(earned), 0) FROM xp_daily WHERE steam_id = ? AND day >= ? AND day < ?) +
+                (SELECT COALESCE(SUM(earned), 0) FROM xp_hourly WHERE steam_id = ? AND hour >= ? AND hour < ? AND NOT (hour >= ? AND hour < ?)) +
+                (SELECT COALESCE(SUM(earned), 0) FROM xp_history WHERE steam_id = ? AND timestamp >= ? AND (timestamp < ? OR timestamp >= ?))
+        ''', (steam_id, *bounds[:2], steam_id, *bounds[2:6], steam_id, *bounds[6:]))
+        return row[0]
+
+    # Function to get the users that earned the most xp since the given unix timestamp, a list of (steam_id, earned)
+    async def get_top_earned_since(self, since, limit=10):
+        bounds = await self.get_range_bounds(since)
+        return await self.database.fetchall('''
+            SELECT steam_id, SUM(earned) AS earned FROM (
+                SELECT steam_id, earned FROM xp_daily WHERE day >= ? AND day < ?
+                UNION ALL
+                SELECT steam_id, earned FROM xp_hourly WHERE hour >= ? AND hour < ? AND NOT (hour >= ? AND hour < ?)
+                UNION ALL
+                SELECT steam_id, earned FROM xp_history WHERE timestamp >= ? AND (timestamp < ? OR timestamp >= ?)
+            ) GROUP BY steam_id HAVING earned > 0 ORDER BY earned DESC LIMIT ?
+        ''', (*bounds, limit))
+
+    # Function to get a user's progress on each of the last complete days, a list of (day, level, xp, earned)
+    async def get_user_history(self, steam_id, days=30):
+        today = int(time.time()) // DAY * DAY
+        return await self.database.fetchall('''
+            SELECT day, level, xp, earned FROM xp_daily WHERE steam_id = ? AND day >= ? ORDER BY day
+        ''', (steam_id, today - days * DAY))
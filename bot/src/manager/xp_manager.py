@@ -1,223 +1,208 @@
-import sqlite3
+import time, sqlite3
 from datetime import datetime
 from src.util.logger import Logger
+from src.manager.migrations import migrations
 from src.helper.trackeduser_class import TrackedUser
+from src.manager.database_manager import DatabaseManager
+from src.manager.user_registry_manager import UserRegistryManager
+from src.manager.guild_settings_manager import GuildSettingsManager
 
 class XpManager:
     def __init__(self):
         self.logger = Logger()
-        self.connection = sqlite3.connect('src/database/tracked_users.sqlite')
-
-        # Create table if it doesn't exist
-        self.create_table()
-
-        # Check if reset_month has been set, otherwise set it to the current month
-        self.check_reset_month()
-
-    def __del__(self):
-        if self.connection:
-            self.connection.close()
+        self.database = DatabaseManager()
+        self.registry = UserRegistryManager()
+        self.guild_settings = GuildSettingsManager()
 
     # Function to create the table if it doesn't exist
-    def create_table(self):
-        with self.connection:
-            self.connection.execute('''
-                CREATE TABLE IF NOT EXISTS "tracking" (
-                    "steam_id"	BIGINT NOT NULL,
-                    "discord_id"	BIGINT NOT NULL,
-                    "guild_id"	BIGINT NOT NULL,
-                    "current_level"	BIGINT NOT NULL,
-                    "current_xp"	BIGINT NOT NULL,
-                    "total_earned"	BIGINT NOT NULL DEFAULT 0,
-                    "global_earned"	BIGINT NOT NULL DEFAULT 0,
-                    PRIMARY KEY("steam_id")
-                );
-            ''')
-            # Create a new table to store the reset month
-            self.connection.execute('''
-                CREATE TABLE IF NOT EXISTS reset_month_table (
-                    id INTEGER PRIMARY KEY,
-                    reset_month INT DEFAULT NULL
-                );
-            ''')
-            self.connection.commit()
+    async def create_table(self):
+        await self.database.executescript('''
+            CREATE TABLE IF NOT EXISTS "tracking" (
+                "steam_id"	BIGINT NOT NULL,
+                "discord_id"	BIGINT NOT NULL,
+                "guild_id"	BIGINT NOT NULL,
+                "current_level"	BIGINT NOT NULL,
+                "current_xp"	BIGINT NOT NULL,
+                "total_earned"	BIGINT NOT NULL DEFAULT 0,
+                "global_earned"	BIGINT NOT NULL DEFAULT 0,
+                PRIMARY KEY("steam_id")
+            );
+        ''')
+
+        # Upgrade the schema to the latest version
+        applied = await self.database.migrate(migrations)
+        if applied:
+            self.logger.log("INFO", f"Applied database migrations: {', '.join(str(version) for version in applied)}.")
+
+    # Function to get the month epoch (year * 12 + month - 1) the monthly xp is counted in
+    @staticmethod
+    def get_current_epoch():
+        today = datetime.today()
+        return today.year * 12 + today.month - 1
 
     # Function to add a user to the database
-    def add_user(self, user: TrackedUser):
+    async def add_user(self, user: TrackedUser):
         try:
-            with self.connection:
-                self.connection.execute("INSERT INTO tracking VALUES (?, ?, ?, ?, ?, ?, ?)", (user.steam_id, user.discord_id, user.guild_id, user.current_level, user.current_xp, user.total_earned, user.global_earned))
-                self.connection.commit()
+            await self.database.execute("INSERT INTO tracking VALUES (?, ?, ?, ?, ?, ?, ?, ?)", (int(user.steam_id), user.discord_id, user.guild_id, user.current_level, user.current_xp, user.total_earned, user.global_earned, user.total_epoch))
+            self.registry.add_user(user)
             return True
         except sqlite3.Error as e:
             self.logger.log("ERROR", f"Error adding user to tracker database: {e}")
             return False
 
-    # Function to remove a user from the database
-    def remove_user(self, user: TrackedUser):
+    # Function to remove a user from the database, returns False if no row was removed (another owner or already gone)
+    async def remove_user(self, user: TrackedUser):
         try:
-            with self.connection:
-                self.connection.execute("DELETE FROM tracking WHERE steam_id = ? AND discord_id = ?", (user.steam_id, user.discord_id))
-                self.connection.commit()
-            return True
+            deleted = await self.database.execute("DELETE FROM tracking WHERE steam_id = ? AND discord_id = ?", (user.steam_id, user.discord_id))
+            # Only a removed row leaves the registry, the user stays tracked if it belongs to someone else
+            if deleted:
+                self.registry.remove_user(user.steam_id)
+            return deleted > 0
         except sqlite3.Error as e:
             self.logger.log("ERROR", f"Error deleting user: {e}")
             return False
 
     # Function to get a user from the database by steam id
-    def get_user_by_steam_id(self, steam_id):
-        with self.connection:
-            cursor = self.connection.cursor()
-            cursor.execute("SELECT * FROM tracking WHERE steam_id = ?", (steam_id,))
-            row = cursor.fetchone()
+    async def get_user_by_steam_id(self, steam_id):
+        if self.registry.loaded:
+            return self.registry.get_user(steam_id)
+        row = await self.database.fetchone("SELECT * FROM tracking WHERE steam_id = ?", (steam_id,))
         if row is not None:
             return TrackedUser(*row)
         return None
 
-    # Function to get all users from the database
-    def get_users(self):
-        with self.connection:
-            cursor = self.connection.cursor()
-            cursor.execute("SELECT * FROM tracking")
-            rows = cursor.fetchall()
+    # Function to read some users again from the database into the registry, e.g. the ones another process polled until now
+    async def reload_users(self, steam_ids):
+        steam_ids = [int(steam_id) for steam_id in steam_ids]
+        found = set()
+        for start in range(0, len(steam_ids), 500):
+            chunk = steam_ids[start:start + 500]
+            rows = await self.database.fetchall(f"SELECT * FROM tracking WHERE steam_id IN ({', '.join('?' * len(chunk))})", chunk)
+            for row in rows:
+                self.registry.add_user(TrackedUser(*row))
+                found.add(row[0])
+        # Removed meanwhile
+        for steam_id in set(steam_ids) - found:
+            self.registry.remove_user(steam_id)
+
+    # Function to get all users, served from the registry once it has been loaded
+    async def get_users(self):
+        if self.registry.loaded:
+            return self.registry.get_users()
+        rows = await self.database.fetchall("SELECT * FROM tracking")
         return [TrackedUser(*row) for row in rows]
 
+    # Function to get all users with their guild tracker channel in one query, the channel is None if the guild is gone
+    async def get_users_with_channels(self):
+        if self.registry.loaded and self.guild_settings.loaded:
+            return [(user, self.guild_settings.get_channel(user.guild_id)) for user in self.registry.get_users()]
+
+        rows = await self.database.fetchall('''
+            SELECT tracking.*, guilds.channel_id FROM tracking
+            LEFT JOIN guilds ON guilds.guild_id = tracking.guild_id
+        ''')
+        return [(TrackedUser(*row[:-1]), row[-1]) for row in rows]
+
     # Function to get how many users are in the database
-    def get_users_count(self):
-        with self.connection:
-            cursor = self.connection.cursor()
-            cursor.execute("SELECT COUNT(*) FROM tracking")
-            row = cursor.fetchone()
+    async def get_users_count(self):
+        if self.registry.loaded:
+            return self.registry.get_users_count()
+        row = await self.database.fetchone("SELECT COUNT(*) FROM tracking")
         return row[0]
 
-    def get_users_count_by_guild_id(self, guild_id):
+    async def get_users_count_by_guild_id(self, guild_id):
+        if self.registry.loaded:
+            return self.registry.get_users_count_by_guild_id(guild_id)
         try:
-            with self.connection:
-                cursor = self.connection.cursor()
-                cursor.execute("SELECT COUNT(*) FROM tracking WHERE guild_id = ?", (guild_id,))
-                row = cursor.fetchone()
+            row = await self.database.fetchone("SELECT COUNT(*) FROM tracking WHERE guild_id = ?", (guild_id,))
         except sqlite3.Error as e:
             self.logger.log("ERROR", f"Error getting user count by guild id: {e}")
             return None
         return row[0] if row else 0
 
-    # Function to update the data of a user
-    def update_user_level_and_xp(self, steam_id, new_level, new_xp, total_earned, global_earned):
+    # Function to update the data of a user, total_earned belongs to the current month epoch
+    async def update_user_level_and_xp(self, steam_id, new_level, new_xp, total_earned, global_earned):
+        total_epoch = self.get_current_epoch()
         try:
-            with self.connection:
-                self.connection.execute("UPDATE tracking SET current_level = ?, current_xp = ?, total_earned = ?, global_earned = ? WHERE steam_id = ?", (new_level, new_xp, total_earned, global_earned, steam_id))
-                self.connection.commit()
+            await self.database.execute("UPDATE tracking SET current_level = ?, current_xp = ?, total_earned = ?, global_earned = ?, total_epoch = ? WHERE steam_id = ?", (new_level, new_xp, total_earned, global_earned, total_epoch, steam_id))
+            self.registry.update_user(steam_id, current_level=new_level, current_xp=new_xp, total_earned=total_earned, global_earned=global_earned, total_epoch=total_epoch)
             return True
         except sqlite3.Error as e:
             self.logger.log("ERROR", f"Error updating user level & xp: {e}")
             return False
 
+    # Function to update the data of many users in a single transaction, rows are (level, xp, total_earned, global_earned, total_epoch, steam_id)
+    # history rows are (steam_id, level, xp, earned) and get appended in the same transaction. They are stamped with the time
+    # of the write, not of the check, so a row held back in the buffer can't land behind the history rollup watermark
+    async def update_users_level_and_xp(self, rows, history=()):
+        def update(connection):
+            timestamp = int(time.time())
+            connection.executemany("UPDATE tracking SET current_level = ?, current_xp = ?, total_earned = ?, global_earned = ?, total_epoch = ? WHERE steam_id = ?", rows)
+            connection.executemany("INSERT INTO xp_history (steam_id, timestamp, level, xp, earned) VALUES (?, ?, ?, ?, ?)", [(steam_id, timestamp, level, xp, earned) for steam_id, level, xp, earned in history])
+
+        try:
+            await self.database.transaction(update)
+            self.registry.update_levels(rows)
+            return True
+        except sqlite3.Error as e:
+            self.logger.log("ERROR", f"Error updating {len(rows)} users level & xp: {e}")
+            return False
+
     # Function to check if the given user id it's the same who added the user to the database
-    def check_adding_ownership(self, steam_id, discord_id):
-        with self.connection:
-            cursor = self.connection.cursor()
-            cursor.execute("SELECT * FROM tracking WHERE steam_id = ? AND discord_id = ?", (steam_id, discord_id))
-            row = cursor.fetchone()
+    async def check_adding_ownership(self, steam_id, discord_id):
+        row = await self.database.fetchone("SELECT 1 FROM tracking WHERE steam_id = ? AND discord_id = ?", (steam_id, discord_id))
         if row is not None:
             return True
         return False
 
-    # Function to change users guild    
-    def change_guild(self, steam_id, guild_id):
+    # Function to change users guild
+    async def change_guild(self, steam_id, guild_id):
         try:
-            with self.connection:
-                self.connection.execute("UPDATE tracking SET guild_id = ? WHERE steam_id = ?", (guild_id, steam_id))
-                self.connection.commit()
+            await self.database.execute("UPDATE tracking SET guild_id = ? WHERE steam_id = ?", (guild_id, steam_id))
+            self.registry.update_user(steam_id, guild_id=guild_id)
             return True
         except sqlite3.Error as e:
             self.logger.log("ERROR", f"Error changing user guild: {e}")
             return False
 
     # Function to change users discord id
-    def change_discord_id(self, steam_id, discord_id):
+    async def change_discord_id(self, steam_id, discord_id):
         try:
-            with self.connection:
-                self.connection.execute("UPDATE tracking SET discord_id = ? WHERE steam_id = ?", (discord_id, steam_id))
-                self.connection.commit()
+            await self.database.execute("UPDATE tracking SET discord_id = ? WHERE steam_id = ?", (discord_id, steam_id))
+            self.registry.update_user(steam_id, discord_id=discord_id)
             return True
         except sqlite3.Error as e:
             self.logger.log("ERROR", f"Error changing user discord id: {e}")
             return False
 
-    # Function to get all users from the database sorted by total earned
-    def get_users_sorted_by_total_earned(self):
-        with self.connection:
-            cursor = self.connection.cursor()
-            cursor.execute("SELECT steam_id, total_earned, global_earned FROM tracking ORDER BY total_earned DESC")
-            rows = cursor.fetchall()
+    # Function to get the top users of the current month sorted by total earned (limit -1 returns every user)
+    async def get_users_sorted_by_total_earned(self, limit=-1):
+        rows = await self.database.fetchall("SELECT steam_id, total_earned, global_earned FROM tracking WHERE total_epoch = ? ORDER BY total_earned DESC LIMIT ?", (self.get_current_epoch(), limit))
         return rows  # this will be a list of tuples, where each tuple is (discord_id, total_earned, global_earned)
 
-    # Function to check if reset_month has been set, otherwise set it to the current month
-    def check_reset_month(self):
-        with self.connection:
-            reset_month = self.connection.execute("SELECT reset_month FROM reset_month_table WHERE id = 1").fetchone()
-            reset_month = reset_month[0] if reset_month is not None else None
-        if reset_month is None:
-            actual_month = datetime.today().month
-            try:
-                with self.connection:
-                    self.connection.execute("INSERT OR REPLACE INTO reset_month_table(id, reset_month) VALUES (1, ?)", (actual_month,))
-                    self.connection.commit()
-                return True
-            except sqlite3.Error as e:
-                self.logger.log("ERROR", f"Error setting reset month: {e}")
-                return False
-        return True
-
-    # Function to check if we need to reset total_earned
-    def should_reset(self):
-        with self.connection:
-            today = datetime.today()
-            reset_month = self.connection.execute("SELECT reset_month FROM reset_month_table WHERE id = 1").fetchone()
-            reset_month = reset_month[0] if reset_month is not None else None
-        return today.day == 1 and today.month != reset_month
-
-    # Function to set every user's total earned to 0
-    def reset_total_earned(self):
-        actual_month = datetime.today().month
-        try:
-            with self.connection:
-                self.connection.execute("UPDATE tracking SET total_earned = 0")
-                self.connection.execute("INSERT OR REPLACE INTO reset_month_table(id, reset_month) VALUES (1, ?)", (actual_month,))
-                self.connection.commit()
-            return True
-        except sqlite3.Error as e:
-            self.logger.log("ERROR", f"Error resetting total earned: {e}")
-            return False
-
     # Function to get user total_earned and global_earned by steamid64
-    def get_earned_by_steamid64(self, steamid64):
-        with self.connection:
-            cursor = self.connection.cursor()
-            cursor.execute("SELECT total_earned, global_earned FROM tracking WHERE steam_id = ?", (steamid64,))
-            row = cursor.fetchone()
+    async def get_earned_by_steamid64(self, steamid64):
+        row = await self.database.fetchone("SELECT CASE WHEN total_epoch = ? THEN total_earned ELSE 0 END, global_earned FROM tracking WHERE steam_id = ?", (self.get_current_epoch(), steamid64))
         if row is not None:
             return row
         return None
 
     # Function to reset user's total_earned
-    def reset_monthly_xp(self, steamid64):
+    async def reset_monthly_xp(self, steamid64):
         try:
-            with self.connection:
-                self.connection.execute("UPDATE tracking SET total_earned = 0 WHERE steam_id = ?", (steamid64,))
-                self.connection.commit()
+            await self.database.execute("UPDATE tracking SET total_earned = 0 WHERE steam_id = ?", (steamid64,))
+            self.registry.update_user(steamid64, total_earned=0)
             return True
         except sqlite3.Error as e:
             self.logger.log("ERROR", f"Error resetting user's total earned: {e}")
             return False
 
     # Function to reset user's global_earned
-    def reset_global_xp(self, steamid64):
+    async def reset_global_xp(self, steamid64):
         try:
-            with self.connection:
-                self.connection.execute("UPDATE tracking SET global_earned = 0 WHERE steam_id = ?", (steamid64,))
-                self.connection.commit()
+            await self.database.execute("UPDATE tracking SET global_earned = 0 WHERE steam_id = ?", (steamid64,))
+            self.registry.update_user(steamid64, global_earned=0)
             return True
         except sqlite3.Error as e:
             self.logger.log("ERROR", f"Error resetting user's global earned: {e}")
-            return False
\ No newline at end of file
+            return False
@@ -1,26 +1,28 @@
-import requests, struct
+import struct
 from Cryptodome.Hash import MD5
 from src.util.logger import Logger
 from src.helper.config import Config
-from concurrent.futures import ThreadPoolExecutor
+from src.steam.http_client import HttpClient
+from src.util.single_flight import SingleFlight
+from src.util.circuit_breaker import CircuitBreaker
+from src.manager.resolve_manager import ResolveManager
+from src.manager.persona_manager import PersonaManager
 
 class Checker():
 
     def __init__(self):
         self.logger = Logger()
         self.config = Config()
-        self.session = requests.Session()
-        self.session.headers.update({"User-Agent": "kWS-Auth"})
-
+        self.http_client = HttpClient()
+        self.personas = PersonaManager()
+        self.resolver = ResolveManager()
+        self.flights = SingleFlight()
+        self.breaker = CircuitBreaker("checker API", self.config.checker_breaker_threshold, max_delay=self.config.checker_breaker_max_delay)
+
+    # Function to know if the api is taking requests, answered from the circuit breaker without a request.
+    # Once the backoff passed it's online again so the next check can be the probe
     def is_api_online(self):
-        try:
-            response = self.session.get("https://checker.kwayservices.top")
-            if response.status_code == 200:
-                return True
-            else:
-                return False
-        except:
-            return False
+        return self.breaker.is_available()
 
     def friend_code_to_steam64(self, friend_code):
         alphabet = "ABCDEFGHJKLMNPQRSTUVWXYZ23456789"
@@ -71,13 +73,31 @@ class Checker():
 
         return code[5:]
 
-    # Function to get player steamid64, name and avatar
-    def get_persona(self, id: str):
+    # Function to get player steamid64, name and avatar, ids resolved before are answered from the caches when possible
+    async def get_persona(self, id: str):
+        key = self.resolver.normalize(id)
+        steamid64 = await self.resolver.get(key)
+        if steamid64 is None:
+            return await self.fetch_persona(key)
+
+        persona = await self.personas.get(steamid64)
+        if persona is None:
+            return await self.fetch_persona(steamid64)
+
+        nickname, avatar, stale = persona
+        if stale:
+            self.personas.revalidate(steamid64, self.fetch_persona)
+        return True, steamid64, nickname, avatar
+
+    # Function to ask the api for the player steamid64, name and avatar and cache them, concurrent calls for the same id share one request
+    async def fetch_persona(self, id: str):
+        return await self.flights.do("persona", str(id), self.request_persona, id)
+
+    async def request_persona(self, id: str):
 
-        sid_url = f"https://checker.kwayservices.top/steam/get/steamid?id={id}"
+        sid_url = f"{self.config.checker_api_url}/steam/get/steamid"
 
-        sid_response = self.session.get(sid_url)
-        sid_response_json = sid_response.json()
+        _, sid_response_json = await self.http_client.get_json(sid_url, params={"id": str(id)}, breaker=self.breaker)
 
         if not sid_response_json["success"]:
             return False, sid_response_json, None, None
@@ -86,19 +106,27 @@ class Checker():
         nickname = sid_response_json["data"].get("nickname", None)
         avatar = sid_response_json["data"].get("avatar", None)
 
+        if steamid64 is not None:
+            await self.personas.store(steamid64, nickname, avatar)
+            await self.resolver.store(self.resolver.normalize(id), steamid64)
+            await self.resolver.store(str(steamid64), steamid64)
+
         return True, steamid64, nickname, avatar
 
-    # Function to get player info
-    def get_player_info(self, id: int, queue_id: str):
+    # Function to get player info, concurrent checks of the same id share one request.
+    # The medals image is named after the queue_id of the request that made it, it's returned with the info
+    async def get_player_info(self, id: int, queue_id: str):
+        return await self.flights.do("player_info", str(id), self.request_player_info, id, queue_id)
+
+    async def request_player_info(self, id: int, queue_id: str):
 
         try:
 
-            success, steamid64, nickname, avatar = self.get_persona(id)
+            success, steamid64, nickname, avatar = await self.get_persona(id)
 
-            info_url = f"https://checker.kwayservices.top/steam/get/medals?id={steamid64}&queueid={queue_id}"
+            info_url = f"{self.config.checker_api_url}/steam/get/medals"
 
-            info_response = self.session.get(info_url)
-            info_response_json = info_response.json()
+            _, info_response_json = await self.http_client.get_json(info_url, params={"id": str(steamid64), "queueid": str(queue_id)}, breaker=self.breaker)
 
             if not info_response_json["success"]:
                 return False, info_response_json
@@ -131,7 +159,8 @@ class Checker():
                 "friendly_commends": friendly_commends,
                 "leader_commends": leader_commends,
                 "teacher_commends": teacher_commends,
-                "medals": medals
+                "medals": medals,
+                "queue_id": queue_id
             }
 
             return True, json
@@ -139,10 +168,3 @@ class Checker():
         except Exception as e:
             self.logger.log("ERROR", "Error getting player info: " + str(e))
             return False, "Error getting player info: " + str(e)
-
-    # Function to request player info
-    def request_player_info(self, id: str, queue_id: str):
-        info = self.get_player_info(id, queue_id)
-        with ThreadPoolExecutor(max_workers=int(1)) as executor:
-                for _ in range(int(1)):
-                    executor.submit(lambda: self.get_player_info(id, queue_id))
\ No newline at end of file
@@ -1,21 +1,22 @@
-import requests, pyfaceit
+import asyncio, pyfaceit
 from src.util.logger import Logger
 from src.helper.config import Config
+from src.steam.http_client import HttpClient
 
 class Faceit:
     def __init__(self):
         self.logger = Logger()
         self.config = Config()
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.http_client = HttpClient()
+        self.headers = {
             'accept': 'application/json',
-            'Authorization': f'Bearer {self.config.faceit_api_key}',
-            'User-Agent': "kWS-Auth"
-        })
+            'Authorization': f'Bearer {self.config.faceit_api_key}'
+        }
 
     async def get_pyfaceit_stats(self, nickname: str):
-        faceit_instance = pyfaceit.Pyfaceit(nickname)
-        stats = faceit_instance.player_stats()
+        # pyfaceit only has blocking calls, run them on a worker thread
+        faceit_instance = await asyncio.to_thread(pyfaceit.Pyfaceit, nickname)
+        stats = await asyncio.to_thread(faceit_instance.player_stats)
 
         # If the player has no stats, return False
         if not stats.get('lifetime', None):
@@ -51,8 +52,7 @@ class Faceit:
                 'game': 'csgo',
                 'game_player_id': steamid64
             }
-            response = self.session.get(url, params=params)
-            stats = response.json()
+            _, stats = await self.http_client.get_json(url, params=params, headers=self.headers)
 
             stats_data = {
                 'nickname': stats['nickname'],
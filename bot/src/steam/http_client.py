@@ -0,0 +1,52 @@
+import aiohttp
+from src.util.logger import Logger
+from src.helper.config import Config
+
+class HttpClient:
+    # Shared instance, every upstream request goes through the same pooled session.
+    # Connections are kept alive and reused, at most http_pool_limit open (http_pool_limit_per_host to the same host)
+    instance = None
+
+    def __new__(cls):
+        if cls.instance is None:
+            instance = super().__new__(cls)
+            instance.config = Config()
+            instance.logger = Logger()
+            instance.session = None
+            cls.instance = instance
+        return cls.instance
+
+    # Function to get the session, it's created on first use so it belongs to the running event loop
+    def get_session(self):
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self.config.http_pool_limit, limit_per_host=self.config.http_pool_limit_per_host, ttl_dns_cache=300)
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.config.http_timeout),
+                headers={"User-Agent": "kWS-Auth"},
+            )
+        return self.session
+
+    # Function to send a GET request, returns the status code and the decoded json body.
+    # With a circuit breaker the request goes through it, and server errors count as failures of the upstream
+    async def get_json(self, url, params=None, headers=None, breaker=None):
+        if breaker is not None:
+            return await breaker.call(self.request_json, url, params, headers, True)
+        return await self.request_json(url, params, headers)
+
+    async def request_json(self, url, params=None, headers=None, raise_for_server_error=False):
+        async with self.get_session().get(url, params=params, headers=headers) as response:
+            if raise_for_server_error and response.status >= 500:
+                raise aiohttp.ClientResponseError(response.request_info, response.history, status=response.status, message=response.reason)
+            return response.status, await response.json(content_type=None)
+
+    # Function to send a GET request, returns only the status code
+    async def get_status(self, url):
+        async with self.get_session().get(url) as response:
+            return response.status
+
+    # Function to close the session and its connections on shutdown
+    async def close(self):
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
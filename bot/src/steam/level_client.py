@@ -0,0 +1,135 @@
+import time, asyncio
+from src.util.logger import Logger
+from src.helper.config import Config
+from src.steam.http_client import HttpClient
+from src.util.single_flight import SingleFlight
+from src.util.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+class LevelClient:
+    # Shared instance, concurrent callers are grouped into the same batch.
+    # Callers asking for a level within batch_delay seconds of each other share one /steam/get/levels/batch
+    # request (up to the batch size the api advertises), each caller gets back only their own result.
+    # If the api doesn't advertise batch support, every id is requested on its own as before
+    instance = None
+
+    def __new__(cls, batch_delay: float = 0.05, capabilities_ttl: int = 600):
+        if cls.instance is None:
+            instance = super().__new__(cls)
+            instance.config = Config()
+            instance.logger = Logger()
+            instance.http_client = HttpClient()
+            instance.flights = SingleFlight()
+            instance.breaker = CircuitBreaker("checker API", instance.config.checker_breaker_threshold, max_delay=instance.config.checker_breaker_max_delay)
+            instance.batch_delay = batch_delay
+            instance.capabilities_ttl = capabilities_ttl
+            instance.batch_max = None
+            instance.capabilities_checked = 0
+            instance.pending = {}  # steamid64 -> list of futures waiting for it
+            instance.timer = None
+            cls.instance = instance
+        return cls.instance
+
+    # Function to ask the api if it supports batched level requests, returns the batch size (0 if it doesn't)
+    async def fetch_capabilities(self):
+        try:
+            status, json = await self.http_client.get_json(f"{self.config.checker_api_url}/steam/capabilities", breaker=self.breaker)
+            if status != 200:
+                return 0
+            data = json.get("data", {})
+            return int(data.get("levels_batch_max", 0)) if data.get("levels_batch") else 0
+        except Exception:
+            return 0
+
+    async def get_batch_max(self):
+        # While the api is down keep what it said last, it would answer that it doesn't batch
+        if self.breaker.is_open():
+            return self.batch_max or 0
+        if self.batch_max is None or time.monotonic() - self.capabilities_checked > self.capabilities_ttl:
+            # On a cold start every fetcher gets here at once, they share a single capabilities request
+            self.batch_max = await self.flights.do("capabilities", None, self.fetch_capabilities)
+            self.capabilities_checked = time.monotonic()
+        return self.batch_max
+
+    # Function to turn the level data of one id into (level, xp, remaining_xp, percentage), None if the api failed
+    @staticmethod
+    def parse_level(level_data):
+        if not level_data or not level_data.get("success"):
+            return None
+        data = level_data["data"]
+        return data["current_level"], data["current_xp"], data["remaining_xp"], data["level_percentage"]
+
+    async def request_single(self, steamid64):
+        _, json = await self.http_client.get_json(f"{self.config.checker_api_url}/steam/get/levels", params={"id": steamid64}, breaker=self.breaker)
+        return self.parse_level(json.get("data")) if json.get("success") else None
+
+    async def request_batch(self, steamids):
+        _, json = await self.http_client.get_json(f"{self.config.checker_api_url}/steam/get/levels/batch", params={"ids": ",".join(steamids)}, breaker=self.breaker)
+        if not json.get("success"):
+            raise RuntimeError(json.get("message", "Batch level request failed"))
+        return {steamid64: self.parse_level(json["data"].get(steamid64)) for steamid64 in steamids}
+
+    # Function to get the level of a steamid64, returns (level, xp, remaining_xp, percentage) or None.
+    # Callers asking for an id that's already on its way share that request
+    async def get_level(self, steamid64):
+        steamid64 = str(steamid64)
+        return await self.flights.do("levels", steamid64, self.request_level, steamid64)
+
+    async def request_level(self, steamid64):
+        future = asyncio.get_running_loop().create_future()
+        self.pending.setdefault(steamid64, []).append(future)
+
+        batch_max = await self.get_batch_max()
+        if batch_max and len(self.pending) >= batch_max:
+            self.dispatch()
+        elif self.timer is None:
+            self.timer = asyncio.get_running_loop().call_later(self.batch_delay, self.dispatch)
+        return await future
+
+    # Function to send everything waiting right now, in batches if the api supports it
+    def dispatch(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        if not self.pending:
+            return
+
+        pending, self.pending = self.pending, {}
+        batch_max = self.batch_max or 0
+        steamids = list(pending)
+        if batch_max:
+            for index in range(0, len(steamids), batch_max):
+                asyncio.create_task(self.resolve_batch({steamid64: pending[steamid64] for steamid64 in steamids[index:index + batch_max]}))
+        else:
+            for steamid64 in steamids:
+                asyncio.create_task(self.resolve_single(steamid64, pending[steamid64]))
+
+    @staticmethod
+    def resolve(futures, result=None, error=None):
+        for future in futures:
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    async def resolve_single(self, steamid64, futures):
+        try:
+            self.resolve(futures, await self.request_single(steamid64))
+        except Exception as e:
+            self.resolve(futures, error=e)
+
+    async def resolve_batch(self, batch):
+        try:
+            results = await self.request_batch(list(batch))
+        except Exception as e:
+            # The api may have dropped batch support, check again on the next request (unless it's just offline)
+            if not isinstance(e, CircuitOpenError):
+                self.logger.log("WARNING", f"Batch level request for {len(batch)} ids failed: {e}")
+                self.batch_max = None
+            for steamid64, futures in batch.items():
+                self.resolve(futures, error=e)
+            return
+
+        for steamid64, futures in batch.items():
+            self.resolve(futures, results.get(steamid64))
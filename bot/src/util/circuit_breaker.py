@@ -0,0 +1,114 @@
+import time, random, asyncio
+from src.util.logger import Logger
+
+class CircuitOpenError(Exception):
+    # Raised instead of calling an upstream the breaker considers down
+    def __init__(self, name, retry_in):
+        super().__init__(f"The {name} is offline, retrying in {retry_in:.0f} seconds.")
+        self.retry_in = retry_in
+
+class CircuitBreaker:
+    # Shared instances by name, one per upstream.
+    # closed: calls go through, threshold failures in a row open it.
+    # open: calls fail right away (CircuitOpenError) until the backoff passes, then the next call is let through as a probe (half open).
+    # half open: a probe is running, it closes the breaker if it works or opens it again with a longer backoff if it fails.
+    # The backoff doubles on every failed probe from base_delay up to max_delay, with jitter so the processes don't probe in step
+    instances = {}
+
+    def __new__(cls, name: str, threshold: int = 5, base_delay: float = 5, max_delay: float = 300):
+        if name not in cls.instances:
+            instance = super().__new__(cls)
+            instance.logger = Logger()
+            instance.name = name
+            instance.threshold = max(1, threshold)
+            instance.base_delay = base_delay
+            instance.max_delay = max(base_delay, max_delay)
+            instance.state = "closed"
+            instance.failures = 0
+            instance.opened = 0  # times it opened since it was last closed, sets the backoff
+            instance.retry_at = 0
+            instance.changed = None
+            instance.stats = {"opened": 0, "rejected": 0, "probes": 0}
+            cls.instances[name] = instance
+        return cls.instances[name]
+
+    def is_open(self):
+        return self.state != "closed"
+
+    # Function to know if the next call would go through, without counting it: the breaker is closed or its backoff passed
+    # and that call would be the probe
+    def is_available(self):
+        return self.state == "closed" or (self.state == "open" and time.monotonic() >= self.retry_at)
+
+    def is_probing(self):
+        return self.state == "half_open"
+
+    # Function to get the seconds until the next probe, 0 if calls go through
+    def get_retry_in(self):
+        if self.state == "closed":
+            return 0
+        return max(0, self.retry_at - time.monotonic())
+
+    def set_state(self, state):
+        self.state = state
+        # Wake up whoever is waiting for the breaker
+        if self.changed is not None:
+            self.changed.set()
+            self.changed = None
+
+    # Function to check if a call may go through now, the first call after the backoff becomes the probe
+    def allow(self):
+        if self.state == "closed":
+            return True
+        if self.state == "open" and time.monotonic() >= self.retry_at:
+            self.stats["probes"] += 1
+            self.set_state("half_open")
+            return True
+        self.stats["rejected"] += 1
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        if self.state != "closed":
+            self.logger.log("INFO", f"The {self.name} is back online, closing its circuit breaker.")
+            self.opened = 0
+            self.set_state("closed")
+
+    def record_failure(self, error):
+        self.failures += 1
+        if self.state == "half_open" or (self.state == "closed" and self.failures >= self.threshold):
+            delay = min(self.max_delay, self.base_delay * 2 ** self.opened) * random.uniform(0.5, 1.5)
+            self.opened += 1
+            self.stats["opened"] += 1
+            self.retry_at = time.monotonic() + delay
+            self.logger.log("WARNING", f"The {self.name} failed {self.failures} times in a row ({error}), pausing its calls for {delay:.0f} seconds.")
+            self.set_state("open")
+
+    # Function to run an upstream call through the breaker, its exceptions count as failures
+    async def call(self, function, *args, **kwargs):
+        if not self.allow():
+            raise CircuitOpenError(self.name, self.get_retry_in())
+        try:
+            result = await function(*args, **kwargs)
+        except asyncio.CancelledError:
+            # A cancelled probe says nothing about the upstream, let the next call probe again
+            if self.state == "half_open":
+                self.set_state("open")
+            raise
+        except Exception as e:
+            self.record_failure(e)
+            raise
+        self.record_success()
+        return result
+
+    # Function to wait until calls may go through, the breaker is closed or its backoff passed with no probe running
+    async def wait(self):
+        while self.state != "closed":
+            if self.state == "open" and time.monotonic() >= self.retry_at:
+                return
+            if self.changed is None:
+                self.changed = asyncio.Event()
+            try:
+                await asyncio.wait_for(self.changed.wait(), timeout=self.get_retry_in() if self.state == "open" else None)
+            except asyncio.TimeoutError:
+                pass
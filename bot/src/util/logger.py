@@ -7,6 +7,8 @@ from src.helper.config import Config
 from src.helper.datetime import DateTime
 
 class Logger:
+    # Set by the delivery handler, when there's one the discord logs and DMs are queued on it instead of sent inline
+    delivery = None
 
     def __init__(self, bot: commands.Bot = None):
         self.bot = bot
@@ -46,15 +48,25 @@ class Logger:
             embed.set_image(url=self.config.rainbow_line_gif)
             embed.set_footer(text=f"CSGO Tracker • kwayservices.top", icon_url=self.config.csgo_tracker_logo)
             embed.timestamp = self.datetime_helper.get_current_timestamp()
-            await channel.send(embed=embed)
+            if self.delivery is not None:
+                self.delivery.send(channel.id, embeds=[embed])
+            else:
+                await channel.send(embed=embed)
         else:
             self.log("ERROR", f"Could not find the logs channel with id {self.config.logs_channel}")
 
-    # Function to dm user by id
-    async def dm_user(self, userid: int, message: str):
+    # Function to dm user by id, on_failure(error) is awaited if the dm can't be delivered (it's only queued with the delivery handler)
+    async def dm_user(self, userid: int, message: str, on_failure=None):
+        if self.delivery is not None:
+            return self.delivery.send_dm(userid, message, on_failure=on_failure)
         dm_user = await self.bot.fetch_user(userid)
         if dm_user:
-            await dm_user.send(message)
+            try:
+                await dm_user.send(message)
+            except Exception as e:
+                if on_failure is None:
+                    raise
+                await on_failure(e)
         else:
             self.log("ERROR", f"Could not find the user with id {userid}")
             await self.discord_log(f"Could not find the user with id {userid}")
@@ -64,7 +76,9 @@ class Logger:
         guild = self.bot.get_guild(guildid)
         if guild:
             owner = guild.owner
-            if owner:
+            if owner and self.delivery is not None:
+                self.delivery.send_dm(owner.id, message)
+            elif owner:
                 await owner.send(message)
             else:
                 self.log("ERROR", f"Could not find the owner of the guild with id {guildid}")
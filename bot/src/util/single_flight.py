@@ -0,0 +1,39 @@
+import asyncio
+
+class SingleFlight:
+    # Shared instance, concurrent callers asking an endpoint for the same key share one upstream call.
+    # The first caller (miss) starts the call, the ones arriving while it runs (hits) wait for the same result or exception.
+    # A caller that's cancelled doesn't cancel the call for the others
+    instance = None
+
+    def __new__(cls):
+        if cls.instance is None:
+            instance = super().__new__(cls)
+            instance.flights = {}  # (endpoint, key) -> task of the running call
+            instance.stats = {}  # endpoint -> {"hits", "misses"}
+            cls.instance = instance
+        return cls.instance
+
+    # Function to run function(*args) unless the same (endpoint, key) is already running, returns its result
+    async def do(self, endpoint, key, function, *args):
+        stats = self.stats.setdefault(endpoint, {"hits": 0, "misses": 0})
+        flight = self.flights.get((endpoint, key))
+        if flight is not None:
+            stats["hits"] += 1
+        else:
+            stats["misses"] += 1
+            flight = asyncio.create_task(function(*args))
+            self.flights[(endpoint, key)] = flight
+            flight.add_done_callback(lambda flight: self.land(endpoint, key, flight))
+        return await asyncio.shield(flight)
+
+    def land(self, endpoint, key, flight):
+        if self.flights.get((endpoint, key)) is flight:
+            del self.flights[(endpoint, key)]
+        # Mark the exception as retrieved, every caller may have been cancelled
+        if not flight.cancelled():
+            flight.exception()
+
+    # Function to get the hits and misses of every endpoint
+    def get_stats(self):
+        return {endpoint: dict(stats) for endpoint, stats in self.stats.items()}
@@ -0,0 +1,50 @@
+import time
+from collections import OrderedDict
+
+class TTLCache:
+    # Least recently used cache of at most maxsize entries, an entry is fresh for ttl seconds after it was stored.
+    # get() only returns fresh entries, peek() also returns expired ones with their age (for stale-while-revalidate)
+    def __init__(self, maxsize: int = 1024, ttl: float = 300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()  # key -> (value, stored_at)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    # Function to get a fresh value, expired entries are dropped
+    def get(self, key, default=None):
+        entry = self.peek(key)
+        if entry is None:
+            return default
+        value, age = entry
+        if age > self.ttl:
+            del self.entries[key]
+            return default
+        return value
+
+    # Function to get a value and how many seconds ago it was stored, even if it expired
+    def peek(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        self.entries.move_to_end(key)
+        value, stored_at = entry
+        return value, time.time() - stored_at
+
+    # Function to store a value, stored_at is for values loaded from somewhere else that are already some time old
+    def set(self, key, value, stored_at: float = None):
+        self.entries[key] = (value, time.time() if stored_at is None else stored_at)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def pop(self, key, default=None):
+        entry = self.entries.pop(key, None)
+        return default if entry is None else entry[0]
+
+    def clear(self):
+        self.entries.clear()
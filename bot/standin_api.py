@@ -0,0 +1,81 @@
+# Local stand-in for the checker api, answers the routes the bot uses with fake but stable data
+# Point checker_api_url at it to run the tracker without a Steam account or GC session
+# Usage (from the bot folder):
+#   python standin_api.py [--port 8085] [--no-batch] [--delay 0.05]
+# --no-batch serves the api as it was before /steam/get/levels/batch, so the bot falls back to single requests
+import zlib, asyncio, argparse
+from aiohttp import web
+
+levels_batch_max = 100
+
+# Function to make up a level for an id, the same id always gets the same level
+def fake_level(steamid64: str):
+    seed = zlib.crc32(steamid64.encode())
+    current_xp = seed % 5000
+    return {
+        "success": True,
+        "data": {
+            "current_level": seed % 40 + 1,
+            "current_xp": current_xp,
+            "level_percentage": f"{current_xp / 5000 * 100:.2f}%",
+            "remaining_xp": 5000 - current_xp,
+        },
+    }
+
+def create_app(batch: bool = True, delay: float = 0.05) -> web.Application:
+    app = web.Application()
+    app["requests"] = {"steamid": 0, "levels": 0, "batch": 0}
+
+    async def index(request):
+        return web.json_response({"success": True, "message": "Checker api stand-in"})
+
+    async def steamid(request):
+        id = request.query.get("id", "").strip().rstrip("/").split("/")[-1]
+        if not id:
+            return web.json_response({"success": False, "message": "Missing parameters (id)"}, status=400)
+        app["requests"]["steamid"] += 1
+        # A vanity name always resolves to the same made up steamid64
+        if not (id.isdigit() and len(id) == 17):
+            id = str(76561197960265728 + zlib.crc32(id.lower().encode()))
+        return web.json_response({"success": True, "data": {"id": id, "nickname": f"Player {id[-4:]}", "avatar": None}})
+
+    async def levels(request):
+        id = request.query.get("id", "").strip()
+        if not id:
+            return web.json_response({"success": False, "message": "Missing parameters (id)"}, status=400)
+        app["requests"]["levels"] += 1
+        await asyncio.sleep(delay)
+        return web.json_response({"success": True, "steam64Id": id, "data": fake_level(id)})
+
+    async def levels_batch(request):
+        ids = [id.strip() for id in request.query.get("ids", "").split(",") if id.strip()]
+        if not ids:
+            return web.json_response({"success": False, "message": "Missing parameters (ids)"}, status=400)
+        if len(ids) > levels_batch_max:
+            return web.json_response({"success": False, "message": f"Too many ids (max {levels_batch_max})"}, status=400)
+        app["requests"]["batch"] += 1
+        await asyncio.sleep(delay)
+        return web.json_response({"success": True, "data": {id: fake_level(id) for id in ids}})
+
+    async def capabilities(request):
+        return web.json_response({"success": True, "data": {"levels_batch": True, "levels_batch_max": levels_batch_max}})
+
+    async def stats(request):
+        return web.json_response({"success": True, "data": app["requests"]})
+
+    app.router.add_get("/", index)
+    app.router.add_get("/steam/get/steamid", steamid)
+    app.router.add_get("/steam/get/levels", levels)
+    app.router.add_get("/standin/stats", stats)
+    if batch:
+        app.router.add_get("/steam/get/levels/batch", levels_batch)
+        app.router.add_get("/steam/capabilities", capabilities)
+    return app
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in for the checker api.")
+    parser.add_argument("--port", type=int, default=8085)
+    parser.add_argument("--no-batch", action="store_true", help="Don't serve the batch endpoint or the capabilities.")
+    parser.add_argument("--delay", type=float, default=0.05, help="Seconds every level request takes.")
+    args = parser.parse_args()
+    web.run_app(create_app(not args.no_batch, args.delay), port=args.port)
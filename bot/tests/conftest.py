@@ -0,0 +1,66 @@
+# Shared fixtures, run the tests from the bot folder: python -m pytest tests
+import sys, asyncio, pytest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.util.circuit_breaker import CircuitBreaker
+from src.util.single_flight import SingleFlight
+from src.steam.level_client import LevelClient
+from src.steam.http_client import HttpClient
+from src.handler.queue_handler import QueueHandler
+from src.handler.schedule_handler import ScheduleHandler
+from src.handler.delivery_handler import DeliveryHandler
+from src.handler.shard_handler import ShardHandler
+from src.manager.database_manager import DatabaseManager
+from src.manager.user_registry_manager import UserRegistryManager
+from src.manager.guild_settings_manager import GuildSettingsManager
+from src.manager.persona_manager import PersonaManager
+from src.manager.xp_buffer_manager import XpBufferManager
+from src.manager.resolve_manager import ResolveManager
+from src.manager.rate_limit_manager import RateLimitManager
+
+# The keys the Config reads without a default
+config = """
+bot_prefix: "."
+discord_token: "token"
+logs_channel: 1
+dev_guild_id: 1
+queue_embed_switch: false
+queue_embed_channel_id: 1
+queue_embed_message_id: 1
+leaderboard_embed_switch: false
+leaderboard_embed_channel_id: 1
+leaderboard_embed_message_id: 1
+user_timeout: 300
+update_embeds_delay: 30
+medals_output_dir: medals
+checker_interval: 7
+discord_tracker_channel_id: 1
+faceit_api_key: key
+steam_username: user
+steam_password: password
+steam_api_key: key
+"""
+emojis = ("green_tick", "red_cross", "loading_green", "loading_red", "panel_logo", "arrow_blue", "arrow_purple", "arrow_pink",
+          "arrow_yellow", "arrow_green", "arrow_red", "arrow_white", "spinbot", "shield", "discord", "faceit")
+
+singletons = (SingleFlight, LevelClient, HttpClient, QueueHandler, ScheduleHandler, DeliveryHandler, ShardHandler, UserRegistryManager,
+              GuildSettingsManager, PersonaManager, XpBufferManager, ResolveManager, RateLimitManager)
+
+def reset_singletons():
+    for cls in singletons:
+        cls.instance = None
+    CircuitBreaker.instances = {}
+
+# Every test runs in its own folder with a config and an empty database, and gets fresh shared instances
+@pytest.fixture(autouse=True)
+def bot_folder(tmp_path, monkeypatch):
+    (tmp_path / "config.yaml").write_text(config + "".join(f"{emoji}_emoji_id: ':{emoji}:'\n" for emoji in emojis))
+    (tmp_path / "src" / "database").mkdir(parents=True)
+    (tmp_path / "medals").mkdir()
+    monkeypatch.chdir(tmp_path)
+    reset_singletons()
+    yield tmp_path
+    asyncio.run(DatabaseManager.close_all())
+    reset_singletons()
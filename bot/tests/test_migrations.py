@@ -0,0 +1,82 @@
+import asyncio, sqlite3, pytest
+from src.manager.migrations import migrations
+from src.manager.database_manager import DatabaseManager
+from src.manager.xp_manager import XpManager
+
+path = "src/database/tracker.sqlite"
+
+def get_version():
+    with sqlite3.connect(path) as connection:
+        return connection.execute("PRAGMA user_version").fetchone()[0]
+
+def get_tables():
+    with sqlite3.connect(path) as connection:
+        return {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+def get_columns(table):
+    with sqlite3.connect(path) as connection:
+        return [row[1] for row in connection.execute(f"PRAGMA table_info({table})")]
+
+def test_versions_are_increasing():
+    versions = [version for version, _ in migrations]
+    assert versions == sorted(set(versions))
+    assert versions[0] == 1
+
+def test_fresh_database_gets_every_migration():
+    asyncio.run(XpManager().create_table())
+
+    assert get_version() == migrations[-1][0]
+    assert {"tracking", "xp_history", "xp_hourly", "xp_daily", "xp_rollup_state", "personas", "resolved_ids", "tracker_workers",
+            "tracker_outbox", "guilds", "tracker_checkpoints", "tracker_polls"} <= get_tables()
+    assert "timeout_db" not in get_tables()
+    assert "total_epoch" in get_columns("tracking")
+    assert "digest" in get_columns("guilds")
+
+def test_migrations_only_run_once():
+    async def run():
+        await XpManager().create_table()
+        return await DatabaseManager().migrate(migrations)
+
+    assert asyncio.run(run()) == []
+    assert get_version() == migrations[-1][0]
+
+def test_old_database_keeps_its_rows():
+    # The schema before the migrations, with the tables later migrations drop
+    with sqlite3.connect(path) as connection:
+        connection.executescript('''
+            CREATE TABLE tracking (steam_id BIGINT NOT NULL, discord_id BIGINT NOT NULL, guild_id BIGINT NOT NULL, current_level BIGINT NOT NULL,
+                current_xp BIGINT NOT NULL, total_earned BIGINT NOT NULL DEFAULT 0, global_earned BIGINT NOT NULL DEFAULT 0, PRIMARY KEY(steam_id));
+            CREATE TABLE guilds (guild_id BIGINT PRIMARY KEY NOT NULL, channel_id BIGINT NOT NULL);
+            CREATE TABLE reset_month_table (month INTEGER);
+            CREATE TABLE timeout_db (user_id BIGINT, command TEXT, timestamp INTEGER);
+            INSERT INTO tracking VALUES (76561198000000001, 1, 10, 20, 4000, 1500, 9000);
+            INSERT INTO guilds VALUES (10, 100);
+        ''')
+    connection.close()
+
+    asyncio.run(XpManager().create_table())
+
+    with sqlite3.connect(path) as connection:
+        row = connection.execute("SELECT steam_id, current_level, total_earned, global_earned, total_epoch FROM tracking").fetchone()
+        guild = connection.execute("SELECT guild_id, channel_id, digest FROM guilds").fetchone()
+    connection.close()
+
+    # The existing monthly totals belong to the month the migration ran in
+    assert row == (76561198000000001, 20, 1500, 9000, XpManager.get_current_epoch())
+    assert guild == (10, 100, 0)
+    assert not {"reset_month_table", "timeout_db"} & get_tables()
+    assert get_version() == migrations[-1][0]
+
+def test_failed_migration_is_rolled_back():
+    broken = migrations[:1] + [(2, "CREATE TABLE half_done (id INTEGER); SELECT * FROM missing_table")]
+
+    async def run():
+        await DatabaseManager().executescript("CREATE TABLE tracking (steam_id BIGINT, discord_id BIGINT, guild_id BIGINT, total_earned BIGINT, global_earned BIGINT)")
+        await DatabaseManager().migrate(broken)
+
+    with pytest.raises(sqlite3.Error):
+        asyncio.run(run())
+
+    # The failed script leaves nothing behind and the next start retries it
+    assert get_version() == 1
+    assert "half_done" not in get_tables()
@@ -0,0 +1,81 @@
+import asyncio
+from datetime import datetime
+import src.manager.xp_manager as xp_manager_module
+from src.manager.xp_manager import XpManager
+from src.helper.trackeduser_class import TrackedUser
+from src.manager.user_registry_manager import UserRegistryManager
+
+def create_user(steam_id, total_earned, total_epoch):
+    return TrackedUser(steam_id, 1, 10, 20, 4000, total_earned, total_earned * 3, total_epoch)
+
+def set_today(monkeypatch, year, month):
+    class FakeDatetime(datetime):
+        @classmethod
+        def today(cls):
+            return cls(year, month, 15)
+    monkeypatch.setattr(xp_manager_module, "datetime", FakeDatetime)
+
+def test_epoch_rolls_over_between_years(monkeypatch):
+    set_today(monkeypatch, 2025, 12)
+    december = XpManager.get_current_epoch()
+    set_today(monkeypatch, 2026, 1)
+    assert XpManager.get_current_epoch() == december + 1
+
+def test_month_change_resets_lazily(monkeypatch):
+    async def run():
+        xp_manager = XpManager()
+        await xp_manager.create_table()
+        set_today(monkeypatch, 2025, 12)
+        await xp_manager.add_user(create_user(76561198000000001, 0, 0))
+        await xp_manager.update_user_level_and_xp(76561198000000001, 21, 200, 1200, 28200)
+        december = await xp_manager.get_earned_by_steamid64(76561198000000001), await xp_manager.get_users_sorted_by_total_earned()
+        # No row is touched when the month changes, the stale epoch is enough
+        set_today(monkeypatch, 2026, 1)
+        january = await xp_manager.get_earned_by_steamid64(76561198000000001), await xp_manager.get_users_sorted_by_total_earned()
+        return december, january
+
+    december, january = asyncio.run(run())
+    assert december == ((1200, 28200), [(76561198000000001, 1200, 28200)])
+    assert january == ((0, 28200), [])
+
+def test_tracked_user_reads_stale_month_as_zero():
+    epoch = XpManager.get_current_epoch()
+    assert create_user(1, 1500, epoch).get_total_earned(epoch) == 1500
+    assert create_user(1, 1500, epoch - 1).get_total_earned(epoch) == 0
+
+def test_earned_and_leaderboard_skip_stale_months():
+    epoch = XpManager.get_current_epoch()
+
+    async def run():
+        xp_manager = XpManager()
+        await xp_manager.create_table()
+        await xp_manager.add_user(create_user(76561198000000001, 1500, epoch))
+        await xp_manager.add_user(create_user(76561198000000002, 9000, epoch - 1))
+        await xp_manager.add_user(create_user(76561198000000003, 500, epoch))
+        return (
+            await xp_manager.get_earned_by_steamid64(76561198000000001),
+            await xp_manager.get_earned_by_steamid64(76561198000000002),
+            await xp_manager.get_users_sorted_by_total_earned(),
+        )
+
+    current, stale, leaderboard = asyncio.run(run())
+    assert current == (1500, 4500)
+    # The global xp survives the month change, only the monthly total reads as 0
+    assert stale == (0, 27000)
+    assert [row[0] for row in leaderboard] == [76561198000000001, 76561198000000003]
+
+def test_update_moves_the_total_to_the_current_month():
+    epoch = XpManager.get_current_epoch()
+
+    async def run():
+        xp_manager = XpManager()
+        await xp_manager.create_table()
+        await UserRegistryManager().load()
+        await xp_manager.add_user(create_user(76561198000000002, 9000, epoch - 1))
+        # The tracker starts the month again from the earned xp of the first check
+        await xp_manager.update_user_level_and_xp(76561198000000002, 21, 200, 1200, 28200)
+        return await xp_manager.get_earned_by_steamid64(76561198000000002), UserRegistryManager().get_user(76561198000000002)
+
+    earned, user = asyncio.run(run())
+    assert earned == (1200, 28200)
+    assert user.total_epoch == epoch and user.get_total_earned(epoch) == 1200
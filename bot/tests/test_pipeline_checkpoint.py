@@ -0,0 +1,86 @@
+import asyncio, sqlite3
+from src.handler.xp_handler import XpHandler
+from src.manager.xp_manager import XpManager
+from src.manager.guild_manager import GuildManager
+from src.handler.shard_handler import ShardHandler
+from src.handler.pipeline_handler import PipelineHandler
+from src.handler.schedule_handler import ScheduleHandler
+from src.helper.trackeduser_class import TrackedUser
+from src.manager.database_manager import DatabaseManager
+from src.manager.xp_buffer_manager import XpBufferManager
+
+steam_ids = [76561198000000000 + index for index in range(1, 41)]
+stopped_after = 23
+
+async def create_users():
+    xp_manager = XpManager()
+    await xp_manager.create_table()
+    await GuildManager().create_table()
+    await GuildManager().add_guild(10, 100)
+    # Added out of order, the cycle goes through them by steam_id anyway
+    for steam_id in reversed(steam_ids):
+        await xp_manager.add_user(TrackedUser(steam_id, 1, 10, 20, 0, 0, 0, xp_manager.get_current_epoch()))
+
+# Function to start the tracker process again, nothing in memory survives but the worker id
+async def restart():
+    await DatabaseManager.close_all()
+    for cls in (ScheduleHandler, XpBufferManager, ShardHandler):
+        cls.instance = None
+    ShardHandler("worker-1")
+    return PipelineHandler()
+
+def test_interrupted_cycle_resumes_after_the_checkpoint(bot_folder, monkeypatch):
+    with open(bot_folder / "config.yaml", "a") as file:
+        file.write("tracker_concurrency: 2\ntracker_checkpoint_batch: 5\n")
+
+    calls, failed = [], set()
+    async def get_user_level_and_xp(self, steamid64):
+        calls.append(steamid64)
+        # The process stops while these are fetched, they never answer
+        if len(calls) > stopped_after:
+            await asyncio.Event().wait()
+        await asyncio.sleep(0)
+        # The first user fails once, it stays due without a poll time
+        if steamid64 == steam_ids[0] and steamid64 not in failed:
+            failed.add(steamid64)
+            return False, "The checker API didn't answer.", None, None
+        return 21, 500, 4500, "10%"
+    monkeypatch.setattr(XpHandler, "get_user_level_and_xp", get_user_level_and_xp)
+
+    async def run():
+        await create_users()
+        pipeline = await restart()
+        cycle = asyncio.create_task(pipeline.run())
+        while len(calls) < stopped_after + 2:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.1)
+        cycle.cancel()
+        await asyncio.gather(cycle, return_exceptions=True)
+        first_calls = list(calls)
+        saved = await pipeline.checkpoints.load("worker-1")
+
+        calls.clear()
+        pipeline = await restart()
+        await pipeline.run()
+        resumed = await pipeline.checkpoints.load("worker-1")
+        outbox = (await DatabaseManager().fetchone("SELECT COUNT(*) FROM tracker_outbox"))[0]
+        return first_calls, saved, list(calls), resumed, outbox
+
+    first_calls, (cycle_id, cursor), second_calls, resumed, outbox = asyncio.run(run())
+
+    # Both runs go in steam_id order, the first one saved the last user of the unbroken run of finished ones
+    assert first_calls == steam_ids[:stopped_after + 2]
+    assert cursor == steam_ids[stopped_after - 1]
+
+    # The restart picks the same cycle up after the saved user and skips the ones polled before it, the failed one
+    # is retried at the end
+    assert second_calls == steam_ids[stopped_after:] + steam_ids[:1]
+    assert resumed == (cycle_id, None)
+    with sqlite3.connect("src/database/tracker.sqlite") as connection:
+        levels = dict(connection.execute("SELECT steam_id, current_level FROM tracking"))
+        polls = {row[0] for row in connection.execute("SELECT steam_id FROM tracker_polls")}
+    connection.close()
+    assert all(levels[steam_id] == 21 for steam_id in steam_ids)
+    assert polls == set(steam_ids)
+    # Each change left one update on the outbox for the bot
+    assert outbox == len(steam_ids)
@@ -0,0 +1,65 @@
+import random
+from src.handler.xp_handler import XpHandler
+
+def check_limits(messages, overhead, description_limit=4096, message_limit=6000, embeds_per_message=10):
+    for embeds in messages:
+        assert 0 < len(embeds) <= embeds_per_message
+        assert sum(len(description) + overhead for description in embeds) <= message_limit
+        assert all(0 < len(description) <= description_limit for description in embeds)
+
+def test_short_digest_is_one_embed():
+    lines = ["first", "second", "third"]
+    assert XpHandler.split_digest(lines, 100) == [["first\nsecond\nthird"]]
+    assert XpHandler.split_digest([], 100) == []
+
+def test_every_line_is_kept_in_order():
+    random.seed(3)
+    for _ in range(200):
+        lines = [f"{index}:" + "x" * random.randint(0, 400) for index in range(random.randint(1, 300))]
+        overhead = random.randint(0, 200)
+        messages = XpHandler.split_digest(lines, overhead)
+        check_limits(messages, overhead)
+        descriptions = [description for embeds in messages for description in embeds]
+        assert "\n".join(descriptions).split("\n") == lines
+
+def test_embeds_are_packed():
+    random.seed(4)
+    for _ in range(200):
+        lines = ["x" * random.randint(1, 300) for _ in range(random.randint(1, 300))]
+        overhead = random.randint(0, 200)
+        messages = XpHandler.split_digest(lines, overhead)
+
+        # An embed is only closed when the next line doesn't fit in it, and a message when the next embed doesn't
+        for index, embeds in enumerate(messages):
+            size = 0
+            for position, description in enumerate(embeds):
+                size += len(description) + overhead
+                following = embeds[position + 1] if position + 1 < len(embeds) else messages[index + 1][0] if index + 1 < len(messages) else None
+                if following is None:
+                    continue
+                next_line = following.split("\n")[0]
+                budget = min(4096, 6000 - size + len(description))
+                assert len(description) + 1 + len(next_line) > budget
+            if index + 1 < len(messages):
+                first = messages[index + 1][0].split("\n")[0]
+                assert len(embeds) == 10 or size + len(first) + overhead > 6000
+
+def test_message_and_embed_limits():
+    # Two lines fit in an embed but the third embed of a message goes over the 6000 characters
+    messages = XpHandler.split_digest(["x" * 1900] * 7, 50)
+    assert [[description.count("\n") + 1 for description in embeds] for embeds in messages] == [[2, 1], [2, 1], [1]]
+    check_limits(messages, 50)
+
+    # Only one line fits in each embed and two embeds in each message
+    messages = XpHandler.split_digest(["x" * 2500] * 7, 0)
+    assert [len(embeds) for embeds in messages] == [2, 2, 2, 1]
+
+    # Tiny lines hit the embeds per message before the characters
+    messages = XpHandler.split_digest(["y"] * 30, 0, description_limit=1, embeds_per_message=10)
+    assert [len(embeds) for embeds in messages] == [10, 10, 10]
+
+def test_oversized_line_is_cut():
+    messages = XpHandler.split_digest(["short", "z" * 5000, "short"], 100)
+    check_limits(messages, 100)
+    descriptions = [description for embeds in messages for description in embeds]
+    assert descriptions == ["short", "z" * 4096, "short"]
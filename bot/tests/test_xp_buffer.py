@@ -0,0 +1,132 @@
+import asyncio
+from src.manager.xp_manager import XpManager
+from src.helper.trackeduser_class import TrackedUser
+from src.manager.database_manager import DatabaseManager
+from src.manager.xp_buffer_manager import XpBufferManager
+
+steam_ids = [76561198000000000 + index for index in range(1, 6)]
+
+async def create_users():
+    xp_manager = XpManager()
+    await xp_manager.create_table()
+    for steam_id in steam_ids:
+        await xp_manager.add_user(TrackedUser(steam_id, 1, 10, 20, 0, 0, 0, xp_manager.get_current_epoch()))
+    return xp_manager
+
+async def get_levels():
+    rows = await DatabaseManager().fetchall("SELECT steam_id, current_level, current_xp, total_earned, global_earned FROM tracking ORDER BY steam_id")
+    return {row[0]: row[1:] for row in rows}
+
+async def get_history_count():
+    return (await DatabaseManager().fetchone("SELECT COUNT(*) FROM xp_history"))[0]
+
+async def add(buffer, steam_id, level, xp=100):
+    await buffer.add(steam_id, level, xp, xp, xp * 2, XpManager.get_current_epoch(), xp)
+
+def test_flushes_when_the_batch_is_full():
+    async def run():
+        await create_users()
+        buffer = XpBufferManager(batch_size=3, max_delay=60)
+        for steam_id in steam_ids[:2]:
+            await add(buffer, steam_id, 21)
+        before = await get_levels(), buffer.get_pending_count()
+        await add(buffer, steam_ids[2], 21)
+        after = await get_levels(), buffer.get_pending_count(), await get_history_count(), buffer.timer
+        return before, after
+
+    (levels, pending), (flushed, left, history, timer) = asyncio.run(run())
+    assert pending == 2 and all(levels[steam_id][0] == 20 for steam_id in steam_ids)
+    assert left == 0 and history == 3 and timer is None
+    assert [flushed[steam_id][0] for steam_id in steam_ids] == [21, 21, 21, 20, 20]
+
+def test_keeps_the_last_update_of_each_user():
+    async def run():
+        await create_users()
+        buffer = XpBufferManager(batch_size=2, max_delay=60)
+        await add(buffer, steam_ids[0], 21, 100)
+        await add(buffer, steam_ids[0], 22, 300)
+        # The same user twice is still one row, the batch isn't full yet
+        pending = buffer.get_pending_count()
+        await buffer.flush()
+        return pending, await get_levels(), await get_history_count()
+
+    pending, levels, history = asyncio.run(run())
+    assert pending == 1
+    assert levels[steam_ids[0]] == (22, 300, 300, 600)
+    assert history == 2
+
+def test_flushes_after_the_delay_without_new_updates():
+    async def run():
+        await create_users()
+        buffer = XpBufferManager(batch_size=100, max_delay=0.05)
+        await add(buffer, steam_ids[0], 21)
+        before = await get_levels()
+        await asyncio.sleep(0.2)
+        return before, await get_levels(), buffer.get_pending_count(), buffer.timer
+
+    before, after, pending, timer = asyncio.run(run())
+    assert before[steam_ids[0]][0] == 20
+    assert after[steam_ids[0]][0] == 21
+    assert pending == 0 and timer is None
+
+def test_flushes_an_old_batch_on_the_next_update():
+    async def run():
+        await create_users()
+        buffer = XpBufferManager(batch_size=100, max_delay=60)
+        await add(buffer, steam_ids[0], 21)
+        buffer.oldest_pending -= 61
+        await add(buffer, steam_ids[1], 21)
+        return await get_levels(), buffer.get_pending_count()
+
+    levels, pending = asyncio.run(run())
+    assert levels[steam_ids[0]][0] == 21 and levels[steam_ids[1]][0] == 21
+    assert pending == 0
+
+def test_shutdown_flush_writes_everything():
+    async def run():
+        await create_users()
+        buffer = XpBufferManager(batch_size=100, max_delay=60)
+        for level, steam_id in enumerate(steam_ids, 30):
+            await add(buffer, steam_id, level)
+        # What the worker and the bot do on their way out
+        flushed = await buffer.flush()
+        return flushed, await get_levels(), buffer.get_pending_count(), buffer.timer
+
+    flushed, levels, pending, timer = asyncio.run(run())
+    assert flushed and pending == 0 and timer is None
+    assert [levels[steam_id][0] for steam_id in steam_ids] == [30, 31, 32, 33, 34]
+
+def test_failed_flush_keeps_the_rows():
+    async def run():
+        await create_users()
+        buffer = XpBufferManager(batch_size=100, max_delay=60)
+        await add(buffer, steam_ids[0], 21)
+
+        # The database write fails once
+        update = buffer.xp_manager.update_users_level_and_xp
+        async def fail(rows, history=()):
+            return False
+        buffer.xp_manager.update_users_level_and_xp = fail
+        failed = await buffer.flush()
+        kept, timer = buffer.get_pending_count(), buffer.timer
+        buffer.xp_manager.update_users_level_and_xp = update
+        return failed, kept, timer, await buffer.flush(), await get_levels()
+
+    failed, kept, timer, flushed, levels = asyncio.run(run())
+    assert not failed and kept == 1 and timer is not None
+    assert flushed and levels[steam_ids[0]][0] == 21
+
+def test_reset_zeroes_the_pending_totals():
+    async def run():
+        await create_users()
+        buffer = XpBufferManager(batch_size=100, max_delay=60)
+        await add(buffer, steam_ids[0], 21, 100)
+        await add(buffer, steam_ids[1], 21, 100)
+        buffer.reset_earned(steam_ids[0], monthly=True)
+        buffer.reset_earned(str(steam_ids[1]), global_=True)
+        await buffer.flush()
+        return await get_levels()
+
+    levels = asyncio.run(run())
+    assert levels[steam_ids[0]] == (21, 100, 0, 200)
+    assert levels[steam_ids[1]] == (21, 100, 100, 0)
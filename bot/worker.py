@@ -0,0 +1,71 @@
+# Tracker worker, polls its share of the tracked users without a Discord connection
+# Needs tracker_sharding enabled on the config and the bot started at least once (it creates the database).
+# The workers and the bot split the users between them through the database, the bot sends the notifications.
+# Usage (from the bot folder):
+#   python worker.py [--id worker-1]
+import time, asyncio, argparse
+from src.util.logger import Logger
+from src.helper.config import Config
+from src.steam.http_client import HttpClient
+from src.manager.migrations import migrations
+from src.handler.shard_handler import ShardHandler
+from src.handler.pipeline_handler import PipelineHandler
+from src.manager.database_manager import DatabaseManager
+from src.manager.xp_buffer_manager import XpBufferManager
+
+# Function to keep the worker on the live tracker processes
+async def heartbeat(shard: ShardHandler) -> None:
+    while True:
+        try:
+            await shard.heartbeat()
+        except Exception as e:
+            Logger().log("ERROR", f"Error sending the worker heartbeat: {e}")
+        await asyncio.sleep(30)
+
+async def main(args) -> None:
+    config = Config()
+    logger = Logger()
+    if not config.tracker_sharding:
+        logger.log("ERROR", "tracker_sharding is disabled on the config, the bot tracks every user by itself.")
+        return
+
+    # The bot applies the migrations, two processes migrating at the same time could clash
+    version = (await DatabaseManager().fetchone("PRAGMA user_version"))[0]
+    if version < migrations[-1][0]:
+        logger.log("ERROR", "The database isn't up to date, start the bot first.")
+        return
+
+    shard = ShardHandler(args.id)
+    pipeline_handler = PipelineHandler()
+    heartbeat_task = asyncio.create_task(heartbeat(shard))
+    logger.log("INFO", f"Tracker worker {shard.worker_id} started.")
+
+    try:
+        # Give the processes started at the same time a moment to see each other, or each would poll every user once
+        await asyncio.sleep(10)
+
+        while True:
+            started = time.monotonic()
+            try:
+                await pipeline_handler.run()
+            except Exception as e:
+                logger.log("ERROR", f"Error running the tracking cycle: {e}")
+            await asyncio.sleep(max(0, config.checker_interval * 60 - (time.monotonic() - started)))
+    finally:
+        heartbeat_task.cancel()
+        # The updates go to the outbox once they are written
+        if await XpBufferManager().flush():
+            await pipeline_handler.push_unsent()
+        await shard.leave()
+        await HttpClient().close()
+        await DatabaseManager.close_all()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a tracker worker.")
+    parser.add_argument("--id", help="Worker id, keep it the same across restarts so the worker gets the same users back.")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(main(args))
+    except KeyboardInterrupt:
+        pass